@@ -522,16 +522,20 @@ def create_nodes_from_proposals(
                 "is_new": True,
             })
 
-        # Créer les références de codage
-        for segment in proposal.segments:
-            ref = CodeReference(
-                node_id=node_id,
-                source_id=segment.source_id,
-                start_pos=segment.start_char,
-                end_pos=segment.end_char,
-                content=segment.text[:500],  # Limiter la taille du contenu
-            )
-            ref.save(db)
+        # Créer les références de codage (une seule transaction par nœud)
+        CodeReference.save_many(
+            db,
+            (
+                CodeReference(
+                    node_id=node_id,
+                    source_id=segment.source_id,
+                    start_pos=segment.start_char,
+                    end_pos=segment.end_char,
+                    content=segment.text[:500],  # Limiter la taille du contenu
+                )
+                for segment in proposal.segments
+            ),
+        )
 
     return created_nodes
 
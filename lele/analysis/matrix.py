@@ -1,5 +1,6 @@
 """Analyse matricielle pour l'application QDA."""
 
+import json
 from dataclasses import dataclass
 from typing import Optional
 
@@ -225,12 +226,14 @@ class MatrixAnalysis:
         if not classification:
             return {"error": "Classification non trouvée"}
 
-        # Récupérer les valeurs uniques de l'attribut
-        cursor = self.db.execute(
-            "SELECT DISTINCT value FROM case_attributes WHERE attribute_id = ?",
-            (attribute_id,),
-        )
-        attribute_values = [row["value"] for row in cursor.fetchall()]
+        # Regrouper les cas par valeur d'attribut, tous chargés avec leurs
+        # valeurs en une seule requête
+        cases_by_value: dict[str, list[Case]] = {}
+        for case in Case.get_all_with_attributes(self.db):
+            if attribute_id in case.attribute_values:
+                value = case.attribute_values[attribute_id]
+                label = value if isinstance(value, str) else json.dumps(value)
+                cases_by_value.setdefault(label, []).append(case)
 
         if node_ids:
             nodes = [Node.get(self.db, nid) for nid in node_ids]
@@ -239,24 +242,15 @@ class MatrixAnalysis:
             nodes = Node.get_all(self.db)
 
         matrix = []
-        row_labels = attribute_values
+        row_labels = list(cases_by_value)
         col_labels = [n.name for n in nodes]
 
-        for attr_value in attribute_values:
+        for cases in cases_by_value.values():
             row = []
-            # Trouver les cas avec cette valeur d'attribut
-            cursor = self.db.execute(
-                "SELECT case_id FROM case_attributes WHERE attribute_id = ? AND value = ?",
-                (attribute_id, attr_value),
-            )
-            case_ids = [r["case_id"] for r in cursor.fetchall()]
-
             # Récupérer toutes les sources liées à ces cas
             all_source_ids = set()
-            for case_id in case_ids:
-                case = Case.get(self.db, case_id)
-                if case:
-                    all_source_ids.update(case.get_linked_source_ids(self.db))
+            for case in cases:
+                all_source_ids.update(case.get_linked_source_ids(self.db))
 
             for node in nodes:
                 # Compter les codages pour ce nœud dans les sources des cas
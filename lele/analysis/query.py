@@ -270,8 +270,7 @@ class QueryBuilder:
         if node_ids:
             # Chercher dans les passages codés
             for node_id in node_ids:
-                refs = CodeReference.get_by_node(self.db, node_id)
-                for ref in refs:
+                for ref in CodeReference.iter_by_node(self.db, node_id):
                     if ref.content and pattern.search(ref.content):
                         source = Source.get(self.db, ref.source_id)
                         if source:
@@ -285,7 +284,7 @@ class QueryBuilder:
                             )
         else:
             # Chercher dans toutes les sources
-            for source in Source.get_all(self.db):
+            for source in Source.iter_all(self.db):
                 if source.content and pattern.search(source.content):
                     refs = CodeReference.get_by_source(self.db, source.id)
                     matches = pattern.findall(source.content)
@@ -5,6 +5,7 @@ import re
 from dataclasses import dataclass, field
 from typing import Optional
 
+from ..models.fts import fts_match
 from ..models.source import Source
 from ..models.memo import Memo
 
@@ -70,7 +71,8 @@ class SearchEngine:
 
         # Utiliser FTS5
         try:
-            cursor = self.db.execute(
+            rows = fts_match(
+                self.db,
                 """
                 SELECT id, name, content, rank
                 FROM sources_fts
@@ -78,10 +80,11 @@ class SearchEngine:
                 ORDER BY rank
                 LIMIT ?
                 """,
-                (query, limit),
+                query,
+                limit,
             )
 
-            for row in cursor.fetchall():
+            for row in rows:
                 # Filtrer par type si nécessaire
                 if source_types:
                     source = Source.get(self.db, row["id"])
@@ -117,8 +120,8 @@ class SearchEngine:
         pattern = re.compile(re.escape(query), re.IGNORECASE)
 
         cursor = self.db.execute("SELECT * FROM sources")
-        for row in cursor.fetchall():
-            source = Source.from_row(dict(row))
+        for row in cursor:
+            source = Source.from_row(row)
 
             if source_types and source.type not in source_types:
                 continue
@@ -153,7 +156,8 @@ class SearchEngine:
         results = []
 
         try:
-            cursor = self.db.execute(
+            rows = fts_match(
+                self.db,
                 """
                 SELECT id, title, content, rank
                 FROM memos_fts
@@ -161,10 +165,11 @@ class SearchEngine:
                 ORDER BY rank
                 LIMIT ?
                 """,
-                (query, limit),
+                query,
+                limit,
             )
 
-            for row in cursor.fetchall():
+            for row in rows:
                 snippet = self._create_snippet(row["content"], query)
                 matches = self._find_matches(row["content"], query)
 
@@ -183,7 +188,7 @@ class SearchEngine:
             # Fallback simple si FTS échoue
             logger.debug("FTS5 memo search failed, falling back to simple search: %s", e)
             pattern = re.compile(re.escape(query), re.IGNORECASE)
-            for memo in Memo.get_all(self.db):
+            for memo in Memo.iter_all(self.db):
                 content = memo.content or ""
                 matches = list(pattern.finditer(content))
                 title_matches = list(pattern.finditer(memo.title))
@@ -243,8 +248,8 @@ class SearchEngine:
             return []
 
         cursor = self.db.execute("SELECT * FROM sources")
-        for row in cursor.fetchall():
-            source = Source.from_row(dict(row))
+        for row in cursor:
+            source = Source.from_row(row)
             content = source.content or ""
 
             matches = list(regex.finditer(content))
@@ -1,6 +1,6 @@
 """Importers pour différents formats de données."""
 
-from .base import BaseImporter, ImportResult
+from .base import BaseImporter, ImportResult, prefetch_files
 from .text import TextImporter
 from .audio import AudioImporter
 from .video import VideoImporter
@@ -19,6 +19,7 @@ __all__ = [
     "SpreadsheetImporter",
     "BibliographyImporter",
     "RefiQdaImporter",
+    "prefetch_files",
 ]
 
 
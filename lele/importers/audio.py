@@ -4,11 +4,13 @@ from pathlib import Path
 from typing import Optional
 import traceback
 
-from .base import BaseImporter, ImportResult
+from .base import EXTRACT_CACHE_DIR, BaseImporter, ImportResult, transcription_cache_tag
 from ..models.source import Source, SourceType
+from ..models.transcript import TranscriptSegment
 from .. import get_logger
 from ..utils.ffmpeg import setup_ffmpeg, check_ffmpeg
 from ..utils.system import get_whisper_device, get_model_recommendations, get_system_info
+from ..utils.whisper_models import load_whisper_model, transcribe_faster_whisper
 
 # Logger pour ce module
 logger = get_logger("importers.audio")
@@ -18,6 +20,7 @@ class AudioImporter(BaseImporter):
     """Importe les fichiers audio avec transcription optionnelle."""
 
     source_type = SourceType.AUDIO
+    extract_cache_dir = EXTRACT_CACHE_DIR
 
     def import_file(
         self,
@@ -53,6 +56,7 @@ class AudioImporter(BaseImporter):
 
         warnings = []
         content = ""
+        transcript_segments = []
         extra_metadata = {}
 
         try:
@@ -82,16 +86,23 @@ class AudioImporter(BaseImporter):
                 self.report_progress(0.3, f"Chargement du modèle {whisper_model}...")
 
                 try:
-                    transcript_result = self._transcribe(
-                        file_path, whisper_model, language, audio_duration
+                    transcript_result = self._cached_extract(
+                        file_path,
+                        self._transcribe,
+                        whisper_model,
+                        language,
+                        audio_duration,
+                        cache_tag=transcription_cache_tag(whisper_model, language),
                     )
                     # Formater le contenu avec sauts de ligne entre segments
                     segments = transcript_result.get("segments", [])
                     content = self._format_transcript(segments, show_timestamps)
+                    # Segments stockés à part (table transcript_segments)
+                    transcript_segments = segments
                     extra_metadata["transcription"] = {
                         "model": whisper_model,
                         "language_detected": transcript_result.get("language"),
-                        "segments": segments,
+                        "segment_count": len(segments),
                         "show_timestamps": show_timestamps,
                     }
                     logger.info(f"Transcription réussie: {len(content)} caractères")
@@ -125,6 +136,7 @@ class AudioImporter(BaseImporter):
                 file_path=str(dest_path),
                 content=content,
                 metadata=metadata,
+                transcript_segments=transcript_segments,
             )
 
             logger.info(f"Source créée: name={source.name}, content_length={len(content)}")
@@ -233,15 +245,29 @@ class AudioImporter(BaseImporter):
 
         logger.info(f"Device sélectionné: {device.upper()}")
 
+        # faster-whisper (CTranslate2, int8) en priorité s'il est installé
+        try:
+            self.report_progress(
+                0.4, f"Transcription avec faster-whisper {model_name} ({device})..."
+            )
+            result = transcribe_faster_whisper(file_path, model_name, device, language)
+            logger.info(
+                f"Transcription faster-whisper terminée: "
+                f"{len(result['text'])} caractères, {len(result['segments'])} segments"
+            )
+            return result
+        except ImportError:
+            logger.info("faster-whisper non installé - utilisation d'openai-whisper")
+
         logger.info("Import du module whisper...")
-        import whisper
+        import whisper  # noqa: F401 - erreur explicite si Whisper est absent
 
         logger.info(f"Chargement du modèle '{model_name}' sur {device}...")
         logger.info("(Cela peut prendre du temps si le modèle doit être téléchargé)")
         self.report_progress(0.4, f"Chargement du modèle {model_name} ({device})...")
 
-        # Charger le modèle sur le device approprié
-        model = whisper.load_model(model_name, device=device)
+        # Charger le modèle sur le device approprié (gardé en mémoire ensuite)
+        model = load_whisper_model(model_name, device)
         logger.info(f"Modèle '{model_name}' chargé avec succès sur {device}")
 
         logger.info(f"Début de la transcription de: {file_path}")
@@ -316,32 +342,49 @@ class AudioImporter(BaseImporter):
         if not segments:
             return ""
 
-        lines = []
-        for seg in segments:
-            text = seg.get("text", "").strip()
-            if not text:
-                continue
+        if not show_timestamps:
+            return "\n\n".join(
+                text for seg in segments if (text := seg.get("text", "").strip())
+            )
 
-            if show_timestamps:
-                start = self._format_timestamp(seg["start"])
-                end = self._format_timestamp(seg["end"])
-                lines.append(f"[{start} -> {end}] {text}")
-            else:
-                lines.append(text)
+        # Choix du format et résolution de la méthode faits une seule fois
+        format_timestamp = self._format_timestamp
+        return "\n\n".join(
+            f"[{format_timestamp(seg['start'])} -> {format_timestamp(seg['end'])}] "
+            f"{text}"
+            for seg in segments
+            if (text := seg.get("text", "").strip())
+        )
 
-        return "\n\n".join(lines)
+    @staticmethod
+    def _source_segments(source: Source, db=None) -> list[dict]:
+        """Segments de transcription d'une source.
 
-    def get_transcript_with_timestamps(self, source: Source) -> str:
+        Lus dans la table transcript_segments si une connexion est fournie,
+        sinon ceux de la source pas encore enregistrée ; les projets anciens
+        les gardaient dans les métadonnées.
+        """
+        if db is not None:
+            segments = [
+                seg.to_dict() for seg in TranscriptSegment.get_by_source(db, source.id)
+            ]
+            if segments:
+                return segments
+        if source.transcript_segments:
+            return source.transcript_segments
+        return source.metadata.get("transcription", {}).get("segments", [])
+
+    def get_transcript_with_timestamps(self, source: Source, db=None) -> str:
         """Retourne la transcription avec timestamps."""
-        segments = source.metadata.get("transcription", {}).get("segments", [])
+        segments = self._source_segments(source, db)
         if not segments:
             return source.content or ""
 
         return self._format_transcript(segments, show_timestamps=True)
 
-    def get_transcript_without_timestamps(self, source: Source) -> str:
+    def get_transcript_without_timestamps(self, source: Source, db=None) -> str:
         """Retourne la transcription sans timestamps mais avec sauts de ligne."""
-        segments = source.metadata.get("transcription", {}).get("segments", [])
+        segments = self._source_segments(source, db)
         if not segments:
             return source.content or ""
 
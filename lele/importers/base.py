@@ -1,12 +1,85 @@
 """Interface de base pour les importers."""
 
+import hashlib
+import importlib.util
+import json
+import os
+import stat
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from ..models.source import Source, SourceType
 
+# Taille des blocs lus pour le calcul des empreintes et l'extraction des
+# membres d'une archive .qdpx (1 Mio)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Cache disque des textes extraits, indexé par empreinte SHA-256 du fichier
+EXTRACT_CACHE_DIR = Path.home() / ".lele" / "cache" / "extract"
+# Taille maximale du cache ; au-delà, les entrées les moins récentes sont supprimées
+EXTRACT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Version du format des entrées du cache, à incrémenter quand un extracteur
+# change de résultat : les anciennes entrées ne sont alors plus relues
+EXTRACT_CACHE_VERSION = 1
+
+# Taille maximale d'un fichier dont la lecture anticipée est demandée au noyau
+PREFETCH_MAX_BYTES = 64 * 1024 * 1024
+
+
+def prefetch_files(paths) -> int:
+    """
+    Demande au noyau de lire à l'avance un lot de fichiers (POSIX_FADV_WILLNEED).
+
+    Les lectures sont mises en file par le système et s'effectuent en
+    parallèle pendant que les fichiers précédents sont analysés. Sans
+    posix_fadvise (Windows, macOS), la fonction ne fait rien.
+
+    Returns:
+        Nombre de fichiers signalés au noyau
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return 0
+
+    count = 0
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            st = os.fstat(fd)
+            size = st.st_size
+            if stat.S_ISREG(st.st_mode) and 0 < size <= PREFETCH_MAX_BYTES:
+                os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+                count += 1
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return count
+
+
+def backend_name(*modules: str) -> str:
+    """
+    Nom du premier module installé parmi modules ("none" si aucun).
+
+    Sert à inclure la bibliothèque d'extraction dans la clé du cache : un
+    résultat obtenu par un repli n'est plus relu une fois la bibliothèque
+    principale installée.
+    """
+    for name in modules:
+        if importlib.util.find_spec(name) is not None:
+            return name
+    return "none"
+
+
+def transcription_cache_tag(model_name: str, language: Optional[str]) -> str:
+    """Clé de cache d'une transcription Whisper (bibliothèque, modèle, langue)."""
+    backend = backend_name("faster_whisper", "whisper")
+    return f"transcribe-{backend}-{model_name}-{language or 'auto'}"
+
 
 @dataclass
 class ImportResult:
@@ -24,6 +97,11 @@ class BaseImporter(ABC):
 
     source_type: SourceType = SourceType.OTHER
 
+    # Dossier du cache d'extraction (None pour le désactiver). Seuls les
+    # importers qui passent par _cached_extract l'activent : les autres ne
+    # calculent jamais l'empreinte des fichiers importés.
+    extract_cache_dir: Optional[Path] = None
+
     def __init__(self):
         self.progress_callback = None
 
@@ -63,12 +141,110 @@ class BaseImporter(ABC):
         Returns:
             Tuple (valide, message_erreur)
         """
-        if not file_path.exists():
+        # Un seul stat() au lieu de exists() puis is_file()
+        try:
+            mode = os.stat(file_path).st_mode
+        except (OSError, ValueError):
             return False, f"Le fichier n'existe pas: {file_path}"
-        if not file_path.is_file():
+        if not stat.S_ISREG(mode):
             return False, f"Ce n'est pas un fichier: {file_path}"
         return True, ""
 
+    def file_sha256(self, file_path: Path) -> str:
+        """
+        Calcule l'empreinte SHA-256 d'un fichier, lu par blocs.
+
+        Appelée uniquement par _cached_extract, quand le cache est actif.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(COPY_BUFFER_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _cached_extract(
+        self,
+        file_path: Path,
+        extractor: Callable,
+        *args,
+        cache_tag: Optional[str] = None,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ):
+        """
+        Appelle extractor(file_path, *args) en passant par le cache disque.
+
+        Le résultat est stocké en JSON sous <empreinte>-<cache_tag>-v<version>.json :
+        un fichier déjà extrait n'est plus analysé, quel que soit son chemin.
+        Les tuples sont restitués sous forme de listes.
+
+        Args:
+            file_path: Fichier à extraire
+            extractor: Fonction d'extraction (résultat sérialisable en JSON)
+            cache_tag: Distingue les extractions d'un même fichier (nom de
+                l'extracteur par défaut ; y inclure la bibliothèque utilisée,
+                voir backend_name, et les paramètres utiles)
+            cacheable: Reçoit le résultat et retourne False pour ne pas le
+                mettre en cache (résultat d'un repli qui ne correspond pas à
+                cache_tag, par exemple)
+        """
+        cache_dir = self.extract_cache_dir
+        if cache_dir is None:
+            return extractor(file_path, *args)
+
+        tag = cache_tag or extractor.__name__
+        cache_path = (
+            cache_dir
+            / f"{self.file_sha256(file_path)}-{tag}-v{EXTRACT_CACHE_VERSION}.json"
+        )
+
+        try:
+            result = json.loads(cache_path.read_text(encoding="utf-8"))
+            # Marquer l'entrée comme récemment utilisée
+            os.utime(cache_path)
+            return result
+        except (OSError, ValueError):
+            pass
+
+        result = extractor(file_path, *args)
+        if cacheable is not None and not cacheable(result):
+            return result
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            payload = json.dumps(result, ensure_ascii=False)
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+            self._prune_extract_cache(cache_dir)
+        except (OSError, TypeError, ValueError):
+            # Résultat non sérialisable ou cache inaccessible : pas de mise en cache
+            pass
+
+        return result
+
+    @staticmethod
+    def _prune_extract_cache(cache_dir: Path):
+        """Supprime les entrées les moins récentes au-delà de la taille maximale."""
+        entries = []
+        total = 0
+        for entry in os.scandir(cache_dir):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        if total <= EXTRACT_CACHE_MAX_BYTES:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= EXTRACT_CACHE_MAX_BYTES:
+                break
+
     def copy_to_project(
         self, source_path: Path, project_files_path: Path
     ) -> Path:
@@ -77,28 +253,39 @@ class BaseImporter(ABC):
 
         project_files_path.mkdir(parents=True, exist_ok=True)
 
-        # Gérer les noms de fichiers en double
+        # Gérer les noms de fichiers en double : le nom est réservé par une
+        # création exclusive (O_EXCL), qui vérifie l'absence du fichier et le
+        # crée en une seule opération
         dest_path = project_files_path / source_path.name
         counter = 1
-        while dest_path.exists():
-            stem = source_path.stem
-            suffix = source_path.suffix
-            dest_path = project_files_path / f"{stem}_{counter}{suffix}"
-            counter += 1
+        while True:
+            try:
+                os.close(os.open(dest_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                stem = source_path.stem
+                suffix = source_path.suffix
+                dest_path = project_files_path / f"{stem}_{counter}{suffix}"
+                counter += 1
 
-        shutil.copy2(source_path, dest_path)
+        # copy2 s'appuie déjà sur la copie native de l'OS (sendfile, fcopyfile,
+        # tampon de 1 Mio sous Windows) : pas de lecture en mémoire du fichier
+        try:
+            shutil.copy2(source_path, dest_path)
+        except BaseException:
+            dest_path.unlink(missing_ok=True)
+            raise
         return dest_path
 
     def get_file_metadata(self, file_path: Path) -> dict:
         """Extrait les métadonnées de base d'un fichier."""
-        import os
         from datetime import datetime
 
-        stat = file_path.stat()
+        st = file_path.stat()
         return {
             "original_path": str(file_path),
-            "file_size": stat.st_size,
-            "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "file_size": st.st_size,
+            "created": datetime.fromtimestamp(st.st_ctime).isoformat(),
+            "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
             "extension": file_path.suffix.lower(),
         }
@@ -1,11 +1,61 @@
 """Importer pour les fichiers image."""
 
+import mmap
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from .base import BaseImporter, ImportResult
 from ..models.source import Source, SourceType
 
+# Nombre maximal d'appels Tesseract simultanés
+OCR_MAX_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+# Pool OCR partagé par tous les imports, créé au premier besoin
+_ocr_executor: Optional[ThreadPoolExecutor] = None
+_ocr_executor_lock = threading.Lock()
+
+# Moteur LSTM uniquement : évite d'initialiser le moteur legacy à chaque appel
+OCR_CONFIG = "--oem 1"
+
+# Résolution maximale transmise à Tesseract
+OCR_TARGET_DPI = 300
+
+# Page considérée vide sous cette proportion de pixels « encre »
+OCR_BLANK_DENSITY = 0.005
+# Écart minimal de niveau de gris avec le fond pour compter un pixel comme encre
+OCR_BLANK_CONTRAST = 64
+
+# Balises EXIF conservées (identifiant -> nom), IFD principal puis IFD Exif
+EXIF_BASE_TAGS = {271: "Make", 272: "Model", 274: "Orientation", 306: "DateTime"}
+EXIF_IFD_TAGS = {
+    33434: "ExposureTime",
+    33437: "FNumber",
+    34855: "ISOSpeedRatings",
+    36867: "DateTimeOriginal",
+    37386: "FocalLength",
+}
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+
+# Marqueurs JPEG de début de trame (SOF), hors DHT (C4), JPG (C8) et DAC (CC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Nombre de composantes d'une trame JPEG -> mode PIL
+JPEG_COMPONENT_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+
+
+def _get_ocr_executor() -> ThreadPoolExecutor:
+    """Retourne le pool OCR partagé (ses threads survivent d'un lot à l'autre)."""
+    global _ocr_executor
+    with _ocr_executor_lock:
+        if _ocr_executor is None:
+            _ocr_executor = ThreadPoolExecutor(
+                max_workers=OCR_MAX_WORKERS, thread_name_prefix="lele-ocr"
+            )
+        return _ocr_executor
+
 
 class ImageImporter(BaseImporter):
     """Importe les fichiers image avec OCR optionnel."""
@@ -18,6 +68,7 @@ class ImageImporter(BaseImporter):
         project_files_path: Path,
         ocr: bool = False,
         ocr_language: str = "fra+eng",
+        extract_exif: bool = False,
         **options,
     ) -> ImportResult:
         """
@@ -28,10 +79,81 @@ class ImageImporter(BaseImporter):
             project_files_path: Dossier du projet
             ocr: Si True, extrait le texte par OCR
             ocr_language: Langues pour l'OCR (format tesseract)
+            extract_exif: Si True, ajoute les balises EXIF aux métadonnées
+        """
+        return self.import_files(
+            [file_path],
+            project_files_path,
+            ocr=ocr,
+            ocr_language=ocr_language,
+            extract_exif=extract_exif,
+            **options,
+        )[0]
+
+    def import_files(
+        self,
+        file_paths: list[Path],
+        project_files_path: Path,
+        ocr: bool = False,
+        ocr_language: str = "fra+eng",
+        extract_exif: bool = False,
+        **options,
+    ) -> list[ImportResult]:
         """
-        if isinstance(file_path, str):
-            file_path = Path(file_path)
+        Importe plusieurs images en une seule passe.
 
+        L'OCR est réparti sur un pool de threads borné, partagé entre les
+        lots : chaque appel à Tesseract s'exécute dans un processus externe,
+        les images sont donc reconnues en parallèle pendant que les copies
+        s'enchaînent.
+
+        Args:
+            file_paths: Chemins des fichiers image
+            project_files_path: Dossier du projet
+            ocr: Si True, extrait le texte par OCR
+            ocr_language: Langues pour l'OCR (format tesseract)
+            extract_exif: Si True, ajoute les balises EXIF aux métadonnées
+
+        Returns:
+            Liste d'ImportResult dans l'ordre des fichiers fournis
+        """
+        paths = [Path(p) for p in file_paths]
+        ocr_futures: list[Optional[Future]] = [None] * len(paths)
+
+        if ocr and paths:
+            executor = _get_ocr_executor()
+            for index, path in enumerate(paths):
+                if self.validate_file(path)[0]:
+                    ocr_futures[index] = executor.submit(
+                        self._extract_text_ocr, path, ocr_language
+                    )
+
+        try:
+            return [
+                self._import_single(
+                    path,
+                    project_files_path,
+                    ocr_futures[index],
+                    ocr_language,
+                    extract_exif,
+                )
+                for index, path in enumerate(paths)
+            ]
+        finally:
+            # Le pool est partagé : n'annuler que les OCR de ce lot restés en attente
+            for future in ocr_futures:
+                if future is not None:
+                    future.cancel()
+
+    def _import_single(
+        self,
+        file_path: Path,
+        project_files_path: Path,
+        ocr_future: Optional[Future],
+        ocr_language: str,
+        extract_exif: bool = False,
+    ) -> ImportResult:
+        """Importe une image dont l'OCR a éventuellement été soumis au pool."""
         valid, error = self.validate_file(file_path)
         if not valid:
             return ImportResult(success=False, error=error)
@@ -44,7 +166,7 @@ class ImageImporter(BaseImporter):
             self.report_progress(0.1, "Analyse de l'image...")
 
             # Extraire les métadonnées image
-            image_meta = self._get_image_metadata(file_path)
+            image_meta = self._get_image_metadata(file_path, extract_exif)
             extra_metadata.update(image_meta)
 
             self.report_progress(0.3, "Copie du fichier...")
@@ -52,16 +174,24 @@ class ImageImporter(BaseImporter):
             # Copier dans le projet
             dest_path = self.copy_to_project(file_path, project_files_path)
 
-            # OCR si demandé
-            if ocr:
+            # OCR si demandé (déjà lancé dans le pool)
+            if ocr_future is not None:
                 self.report_progress(0.5, "Extraction du texte (OCR)...")
 
                 try:
-                    content = self._extract_text_ocr(file_path, ocr_language)
-                    extra_metadata["ocr"] = {
-                        "language": ocr_language,
-                        "extracted": True,
-                    }
+                    text = ocr_future.result()
+                    if text is None:
+                        extra_metadata["ocr"] = {
+                            "language": ocr_language,
+                            "extracted": False,
+                            "skipped": "blank_page",
+                        }
+                    else:
+                        content = text
+                        extra_metadata["ocr"] = {
+                            "language": ocr_language,
+                            "extracted": True,
+                        }
                 except ImportError as e:
                     warnings.append(str(e))
                 except Exception as e:
@@ -93,13 +223,27 @@ class ImageImporter(BaseImporter):
         except Exception as e:
             return ImportResult(success=False, error=str(e))
 
-    def _get_image_metadata(self, file_path: Path) -> dict:
-        """Extrait les métadonnées d'une image."""
+    def _get_image_metadata(self, file_path: Path, extract_exif: bool = False) -> dict:
+        """Extrait les métadonnées d'une image.
+
+        Sans EXIF, les dimensions d'un JPEG sont lues directement dans son
+        en-tête (marqueur SOF), sans passer par PIL.
+        """
         metadata = {}
 
+        if not extract_exif and file_path.suffix.lower() in (".jpg", ".jpeg"):
+            probe = self._probe_jpeg(file_path)
+            if probe is not None:
+                width, height, mode = probe
+                metadata["width"] = width
+                metadata["height"] = height
+                metadata["format"] = "JPEG"
+                metadata["mode"] = mode
+                return metadata
+
         try:
             from PIL import Image
-            from PIL.ExifTags import TAGS
+            from PIL.ExifTags import GPSTAGS
 
             with Image.open(file_path) as img:
                 metadata["width"] = img.width
@@ -107,20 +251,30 @@ class ImageImporter(BaseImporter):
                 metadata["format"] = img.format
                 metadata["mode"] = img.mode
 
-                # Extraire les données EXIF
-                exif_data = img._getexif()
+                # Extraire uniquement les balises EXIF utiles
+                exif_data = img.getexif() if extract_exif else None
                 if exif_data:
                     exif = {}
-                    for tag_id, value in exif_data.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        # Convertir les valeurs non sérialisables
-                        if isinstance(value, bytes):
-                            try:
-                                value = value.decode("utf-8", errors="ignore")
-                            except Exception:
-                                value = str(value)
-                        exif[str(tag)] = str(value)
-                    metadata["exif"] = exif
+                    exif_ifd = exif_data.get_ifd(EXIF_IFD_POINTER)
+                    for ifd, wanted in (
+                        (exif_data, EXIF_BASE_TAGS),
+                        (exif_ifd, EXIF_IFD_TAGS),
+                    ):
+                        for tag_id, tag_name in wanted.items():
+                            if tag_id in ifd:
+                                value = self._exif_value(ifd[tag_id])
+                                if value is not None:
+                                    exif[tag_name] = value
+
+                    gps_ifd = exif_data.get_ifd(GPS_IFD_POINTER)
+                    if gps_ifd:
+                        exif["GPSInfo"] = {
+                            GPSTAGS.get(tag_id, str(tag_id)): self._exif_value(value)
+                            for tag_id, value in gps_ifd.items()
+                        }
+
+                    if exif:
+                        metadata["exif"] = exif
 
         except ImportError:
             # Fallback basique
@@ -130,19 +284,80 @@ class ImageImporter(BaseImporter):
 
         return metadata
 
-    def _extract_text_ocr(self, file_path: Path, language: str) -> str:
-        """Extrait le texte d'une image par OCR."""
+    @staticmethod
+    def _probe_jpeg(file_path: Path) -> Optional[tuple[int, int, str]]:
+        """Lit largeur, hauteur et mode d'un JPEG dans son marqueur SOF.
+
+        Les segments sont parcourus un à un depuis le début du fichier.
+        Retourne None si le fichier n'est pas un JPEG lisible de cette façon.
+        """
         try:
-            import pytesseract
-            from PIL import Image
+            with open(file_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                if data[:2] != b"\xff\xd8":
+                    return None
+
+                pos = 2
+                size = len(data)
+                while pos + 4 <= size:
+                    if data[pos] != 0xFF:
+                        return None
+                    marker = data[pos + 1]
+                    if marker == 0xFF:
+                        # Octet de bourrage
+                        pos += 1
+                        continue
+
+                    length = int.from_bytes(data[pos + 2:pos + 4], "big")
+                    if marker in JPEG_SOF_MARKERS:
+                        if pos + 10 > size:
+                            return None
+                        height = int.from_bytes(data[pos + 5:pos + 7], "big")
+                        width = int.from_bytes(data[pos + 7:pos + 9], "big")
+                        mode = JPEG_COMPONENT_MODES.get(data[pos + 9])
+                        if not width or not height or mode is None:
+                            return None
+                        return width, height, mode
+                    if marker == 0xDA or length < 2:
+                        # Début des données compressées sans SOF : abandon
+                        return None
+                    pos += 2 + length
+        except (OSError, ValueError):
+            return None
 
-            with Image.open(file_path) as img:
-                # Convertir en RGB si nécessaire
-                if img.mode not in ("RGB", "L"):
-                    img = img.convert("RGB")
+        return None
+
+    @staticmethod
+    def _exif_value(value):
+        """Convertit une valeur EXIF en type sérialisable en JSON (None si ignorée)."""
+        if isinstance(value, str):
+            return value.strip("\x00 ")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        if hasattr(value, "denominator"):
+            # IFDRational
+            return float(value) if value.denominator else None
+        if isinstance(value, tuple):
+            return [ImageImporter._exif_value(item) for item in value]
+        return None
+
+    def _extract_text_ocr(self, file_path: Path, language: str) -> Optional[str]:
+        """Extrait le texte d'une image par OCR.
+
+        Returns:
+            Le texte reconnu, ou None si la page est vide (Tesseract non appelé)
+        """
+        try:
+            import pytesseract
 
-                text = pytesseract.image_to_string(img, lang=language)
-                return text.strip()
+            image = self._preprocess_for_ocr(file_path)
+            if image is None:
+                return None
+            text = pytesseract.image_to_string(
+                image, lang=language, config=OCR_CONFIG
+            )
+            return text.strip()
 
         except ImportError:
             raise ImportError(
@@ -150,6 +365,67 @@ class ImageImporter(BaseImporter):
                 "pip install pytesseract && sudo apt-get install tesseract-ocr"
             )
 
+    def _preprocess_for_ocr(self, file_path: Path):
+        """
+        Prépare une image pour Tesseract.
+
+        L'image est passée en niveaux de gris, ramenée à 300 DPI au plus puis
+        binarisée (seuil d'Otsu) si OpenCV est disponible. Tesseract reçoit
+        ainsi un buffer 8 bits déjà seuillé au lieu d'une image RGB à
+        réencoder et à binariser lui-même.
+
+        Returns:
+            Tableau numpy uint8 binarisé, image PIL en niveaux de gris, ou
+            None si la page est vide
+        """
+        from PIL import Image
+
+        with Image.open(file_path) as img:
+            dpi = img.info.get("dpi", (0, 0))[0]
+            gray = img.convert("L")
+
+        # Réduire les scans haute résolution (gain de temps sans perte de qualité)
+        if dpi and float(dpi) > OCR_TARGET_DPI:
+            scale = OCR_TARGET_DPI / float(dpi)
+            gray = gray.resize(
+                (max(1, round(gray.width * scale)), max(1, round(gray.height * scale))),
+                Image.BOX,
+            )
+
+        if self._is_blank_page(gray):
+            return None
+
+        try:
+            import cv2
+            import numpy as np
+        except ImportError:
+            return gray
+
+        _, binary = cv2.threshold(
+            np.asarray(gray), 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU
+        )
+        return binary
+
+    @staticmethod
+    def _is_blank_page(gray) -> bool:
+        """Indique si une image en niveaux de gris ne contient quasiment rien.
+
+        La densité d'encre se calcule sur l'histogramme (un seul parcours en C) :
+        proportion des pixels qui s'écartent nettement du niveau du fond.
+        """
+        histogram = gray.histogram()
+        total = sum(histogram)
+        if not total:
+            return True
+
+        background = histogram.index(max(histogram))
+        ink = sum(
+            count
+            for level, count in enumerate(histogram)
+            if abs(level - background) > OCR_BLANK_CONTRAST
+        )
+        return ink / total < OCR_BLANK_DENSITY
+
     def create_thumbnail(
         self, source: Source, size: tuple[int, int] = (200, 200)
     ) -> Optional[str]:
@@ -157,13 +433,23 @@ class ImageImporter(BaseImporter):
         if not source.file_path:
             return None
 
+        file_path = Path(source.file_path)
+        thumb_path = file_path.parent / f"{file_path.stem}_thumb{file_path.suffix}"
+
         try:
-            from PIL import Image
+            self._thumbnail_vips(file_path, thumb_path, size)
+            return str(thumb_path)
+        except Exception:
+            # pyvips absent, ou format qu'il ne lit/n'écrit pas (GIF, palette…) :
+            # PIL prend le relais
+            pass
 
-            file_path = Path(source.file_path)
-            thumb_path = file_path.parent / f"{file_path.stem}_thumb{file_path.suffix}"
+        try:
+            from PIL import Image
 
             with Image.open(file_path) as img:
+                # Décodage JPEG à échelle réduite avant le redimensionnement
+                img.draft(img.mode, size)
                 img.thumbnail(size)
                 img.save(thumb_path)
 
@@ -171,3 +457,16 @@ class ImageImporter(BaseImporter):
 
         except Exception:
             return None
+
+    @staticmethod
+    def _thumbnail_vips(
+        file_path: Path, thumb_path: Path, size: tuple[int, int]
+    ) -> None:
+        """Crée la miniature avec libvips (réduction dès le décodage)."""
+        import pyvips
+
+        image = pyvips.Image.thumbnail(str(file_path), size[0], height=size[1])
+        if thumb_path.suffix.lower() in (".jpg", ".jpeg"):
+            image.write_to_file(str(thumb_path), Q=85, strip=True)
+        else:
+            image.write_to_file(str(thumb_path), strip=True)
@@ -1,20 +1,54 @@
 """Importer pour le standard REFI-QDA (Qualitative Data Analysis Exchange)."""
 
+import io
 import json
-import xml.etree.ElementTree as ET
+import os
+import threading
 import zipfile
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
+from xml.sax.saxutils import XMLGenerator
 
-from .base import BaseImporter, ImportResult
+from .base import COPY_BUFFER_SIZE, BaseImporter, ImportResult
 from ..models.source import Source, SourceType
 from ..models.node import Node
 from ..models.coding import CodeReference
 
+# Analyseur XML : lxml (libxml2) si disponible, sinon la bibliothèque standard
+try:
+    from lxml.etree import iterparse, parse as parse_xml
+
+    # lxml désigne l'espace de noms par défaut par None dans find()/findall()
+    DEFAULT_NS_PREFIX = None
+except ImportError:
+    from xml.etree.ElementTree import iterparse, parse as parse_xml
+
+    DEFAULT_NS_PREFIX = ""
+
+# Taille du tampon de lecture de project.qde
+QDE_READ_BUFFER_SIZE = 256 * 1024
+
+# Nombre maximal de fichiers extraits simultanément de l'archive
+EXTRACT_MAX_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+# Tampon d'extraction réutilisé d'un fichier à l'autre, un par thread
+_extract_local = threading.local()
+
 
 class RefiQdaImporter(BaseImporter):
     """Importe les projets au format REFI-QDA (.qdpx)."""
 
+    # Types de sources REFI-QDA -> types Lele
+    _TYPE_MAP = {
+        "TextSource": SourceType.TEXT,
+        "PDFSource": SourceType.PDF,
+        "AudioSource": SourceType.AUDIO,
+        "VideoSource": SourceType.VIDEO,
+        "ImageSource": SourceType.IMAGE,
+    }
+
     def import_file(
         self,
         file_path: Path,
@@ -74,26 +108,58 @@ class RefiQdaImporter(BaseImporter):
 
         try:
             with zipfile.ZipFile(file_path, "r") as zf:
-                # Lire le fichier project.qde
-                qde_content = zf.read("project.qde").decode("utf-8")
-                root = ET.fromstring(qde_content)
+                # Lire le fichier project.qde en flux
+                with self._open_qde(zf) as stream:
+                    root = parse_xml(stream).getroot()
 
                 ns = self._get_namespaces(root)
 
-                # Importer les sources
-                self._import_sources(zf, root, ns, project, stats)
-
-                # Importer les codes (nœuds)
-                self._import_codes(root, ns, project, stats)
+                # Préparer les sources, codes (nœuds) et codages
+                sources = self._import_sources(zf, root, ns, project, stats)
+                nodes = self._import_codes(root, ns, project, stats)
+                code_refs = self._import_codings(root, ns, project, stats)
 
-                # Importer les codages
-                self._import_codings(root, ns, project, stats)
+            # Écrire les lignes par lots (une transaction par table)
+            db = project.db
+            stats["sources_imported"] = self._save_batch(
+                db, Source, sources, lambda s: f"Source {s.name}", stats
+            )
+            stats["nodes_imported"] = self._save_batch(
+                db, Node, nodes, lambda n: f"Code {n.name}", stats
+            )
+            stats["codes_imported"] = self._save_batch(
+                db, CodeReference, code_refs, lambda r: "Coding", stats
+            )
 
         except Exception as e:
             stats["errors"].append(f"Erreur globale: {e}")
 
         return stats
 
+    @staticmethod
+    def _save_batch(db, model, items: list, label, stats) -> int:
+        """
+        Enregistre un lot d'éléments et retourne le nombre d'éléments écrits.
+
+        Si la transaction du lot échoue (elle est alors annulée), les éléments
+        sont repris un par un : seuls les fautifs sont écartés et comptés dans
+        les erreurs, comme lors d'un import élément par élément.
+        """
+        try:
+            model.save_many(db, items)
+            return len(items)
+        except Exception:
+            pass
+
+        saved = 0
+        for item in items:
+            try:
+                model.save_many(db, [item])
+                saved += 1
+            except Exception as e:
+                stats["errors"].append(f"{label(item)}: {e}")
+        return saved
+
     def _parse_qdpx(self, file_path: Path) -> dict:
         """Parse un fichier QDPX et retourne les informations du projet."""
         info = {
@@ -109,63 +175,96 @@ class RefiQdaImporter(BaseImporter):
             # Liste des fichiers dans l'archive
             info["files"] = zf.namelist()
 
-            # Lire le fichier project.qde
-            if "project.qde" in zf.namelist():
-                qde_content = zf.read("project.qde").decode("utf-8")
-                root = ET.fromstring(qde_content)
+            # Lire le fichier project.qde en flux
+            if "project.qde" in info["files"]:
+                with self._open_qde(zf) as stream:
+                    self._scan_qde(stream, info)
 
-                ns = self._get_namespaces(root)
+        return info
 
-                # Informations du projet
-                project_elem = root.find(".//Project", ns) or root
-                info["name"] = project_elem.get("name", "")
-                info["created"] = project_elem.get("creationDateTime", "")
-                info["modified"] = project_elem.get("modifiedDateTime", "")
+    @staticmethod
+    def _open_qde(zf) -> io.BufferedReader:
+        """
+        Ouvre project.qde en flux avec un tampon de lecture de 256 Kio.
 
-                # Sources
-                for source in root.findall(".//Source", ns) or root.findall(".//Sources/Source", ns):
+        Le membre est décompressé à la volée (zlib) par blocs plus grands que
+        le tampon par défaut de 8 Kio, ce qui réduit les appels de lecture.
+        """
+        return io.BufferedReader(
+            zf.open("project.qde"), buffer_size=QDE_READ_BUFFER_SIZE
+        )
+
+    def _scan_qde(self, stream, info: dict):
+        """
+        Parcourt project.qde en une seule passe et remplit info au fil de l'eau.
+
+        Les attributs sont lus à l'ouverture des éléments (ordre du document
+        conservé), puis chaque élément est vidé à sa fermeture pour garder
+        une empreinte mémoire constante.
+        """
+        root_seen = False
+        for event, elem in iterparse(stream, events=("start", "end")):
+            if event == "start":
+                local_name = elem.tag.rpartition("}")[2]
+
+                if not root_seen:
+                    # Informations du projet (élément racine)
+                    root_seen = True
+                    info["name"] = elem.get("name", "")
+                    info["created"] = elem.get("creationDateTime", "")
+                    info["modified"] = elem.get("modifiedDateTime", "")
+                elif local_name == "Source":
                     info["sources"].append({
-                        "guid": source.get("guid", ""),
-                        "name": source.get("name", ""),
-                        "type": source.get("type", ""),
+                        "guid": elem.get("guid", ""),
+                        "name": elem.get("name", ""),
+                        "type": elem.get("type", ""),
                     })
-
-                # Codes
-                for code in root.findall(".//Code", ns) or root.findall(".//Codes/Code", ns):
+                elif local_name == "Code":
                     info["codes"].append({
-                        "guid": code.get("guid", ""),
-                        "name": code.get("name", ""),
-                        "color": code.get("color", ""),
+                        "guid": elem.get("guid", ""),
+                        "name": elem.get("name", ""),
+                        "color": elem.get("color", ""),
                     })
-
-                # Utilisateurs
-                for user in root.findall(".//User", ns) or root.findall(".//Users/User", ns):
+                elif local_name == "User":
                     info["users"].append({
-                        "guid": user.get("guid", ""),
-                        "name": user.get("name", ""),
+                        "guid": elem.get("guid", ""),
+                        "name": elem.get("name", ""),
                     })
+                continue
 
-        return info
+            # Libérer l'élément consommé et, avec lxml, ses frères précédents
+            elem.clear()
+            if hasattr(elem, "getprevious"):
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
 
     def _get_namespaces(self, root) -> dict:
         """Extrait les namespaces du document XML."""
         ns = {}
         if root.tag.startswith("{"):
             ns_uri = root.tag[1:root.tag.index("}")]
-            ns[""] = ns_uri
+            ns[DEFAULT_NS_PREFIX] = ns_uri
         return ns
 
-    def _import_sources(self, zf, root, ns, project, stats):
-        """Importe les sources depuis le projet REFI-QDA."""
-        # Chercher d'abord le conteneur Sources
-        sources_container = root.find(".//Sources", ns)
-        if sources_container is not None:
-            source_elems = sources_container.findall("Source", ns)
-        else:
-            # Sinon, chercher directement les éléments Source
-            source_elems = root.findall(".//Source", ns)
-
-        for source_elem in source_elems:
+    @staticmethod
+    def _qualify(ns: dict, local_name: str) -> str:
+        """Retourne le nom qualifié (notation de Clark) d'un élément REFI-QDA."""
+        ns_uri = ns.get(DEFAULT_NS_PREFIX)
+        return f"{{{ns_uri}}}{local_name}" if ns_uri else local_name
+
+    def _import_sources(self, zf, root, ns, project, stats) -> list[Source]:
+        """Prépare les sources du projet REFI-QDA (fichiers extraits, lignes à écrire)."""
+        sources = []
+        # Membre de l'archive -> (destination, sources qui y renvoient) : un
+        # membre partagé n'est extrait qu'une fois, et deux membres de même
+        # nom de base reçoivent des destinations distinctes
+        extractions = {}
+        dest_names = set()
+        members = set(zf.namelist())
+
+        plain_text_tag = self._qualify(ns, "PlainTextContent")
+
+        for source_elem in root.iter(self._qualify(ns, "Source")):
             try:
                 guid = source_elem.get("guid", "")
                 name = source_elem.get("name", "Unnamed")
@@ -176,7 +275,7 @@ class RefiQdaImporter(BaseImporter):
 
                 # Chercher le contenu textuel
                 content = ""
-                text_elem = source_elem.find(".//PlainTextContent", ns)
+                text_elem = next(source_elem.iter(plain_text_tag), None)
                 if text_elem is not None and text_elem.text:
                     content = text_elem.text
 
@@ -184,11 +283,14 @@ class RefiQdaImporter(BaseImporter):
                 file_path_elem = source_elem.get("path", "")
                 internal_path = None
 
-                if file_path_elem and file_path_elem in zf.namelist():
-                    # Extraire le fichier
-                    internal_path = project.files_path / Path(file_path_elem).name
-                    with zf.open(file_path_elem) as src_file:
-                        internal_path.write_bytes(src_file.read())
+                if file_path_elem and file_path_elem in members:
+                    if file_path_elem in extractions:
+                        internal_path = extractions[file_path_elem][0]
+                    else:
+                        internal_path = self._unique_dest(
+                            project.files_path, Path(file_path_elem).name, dest_names
+                        )
+                        extractions[file_path_elem] = (internal_path, [])
 
                 # Créer la source
                 source = Source(
@@ -199,30 +301,95 @@ class RefiQdaImporter(BaseImporter):
                     content=content,
                     metadata={"refi_qda_guid": guid, "original_type": source_type},
                 )
-                source.save(project.db)
-                stats["sources_imported"] += 1
+                sources.append(source)
+
+                if internal_path is not None:
+                    extractions[file_path_elem][1].append(source)
 
             except Exception as e:
                 stats["errors"].append(f"Source {name}: {e}")
 
-    def _import_codes(self, root, ns, project, stats, parent_id=None, parent_elem=None):
-        """Importe les codes (nœuds) depuis le projet REFI-QDA."""
-        if parent_elem is None:
-            codes_elem = root.find(".//Codes", ns)
-            if codes_elem is None:
-                codes_elem = root
-            code_elems = codes_elem.findall("Code", ns) or codes_elem.findall(".//Code", ns)
-        else:
-            code_elems = parent_elem.findall("Code", ns)
-
-        for code_elem in code_elems:
+        if not extractions:
+            return sources
+
+        # Extraire les fichiers associés en parallèle (une archive ouverte par tâche)
+        failed = set()
+        with ThreadPoolExecutor(
+            max_workers=min(EXTRACT_MAX_WORKERS, len(extractions))
+        ) as executor:
+            futures = {
+                executor.submit(self._extract_member, zf.filename, member, dest): linked
+                for member, (dest, linked) in extractions.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    for source in futures[future]:
+                        stats["errors"].append(f"Source {source.name}: {e}")
+                        failed.add(id(source))
+
+        return [source for source in sources if id(source) not in failed]
+
+    @staticmethod
+    def _unique_dest(files_path: Path, name: str, taken: set) -> Path:
+        """Retourne une destination de nom de base inédit parmi ``taken`` (mis à jour)."""
+        stem, suffix = Path(name).stem, Path(name).suffix
+        candidate = name
+        counter = 1
+        while candidate in taken:
+            candidate = f"{stem}_{counter}{suffix}"
+            counter += 1
+        taken.add(candidate)
+        return files_path / candidate
+
+    @staticmethod
+    def _extract_member(archive_path, member: str, dest: Path):
+        """Extrait un membre de l'archive QDPX avec son propre descripteur.
+
+        La décompression se fait dans le tampon du thread courant (readinto),
+        sans allouer de nouvel objet bytes pour chaque bloc.
+        """
+        buffer = getattr(_extract_local, "buffer", None)
+        if buffer is None:
+            buffer = memoryview(bytearray(COPY_BUFFER_SIZE))
+            _extract_local.buffer = buffer
+
+        with zipfile.ZipFile(archive_path, "r") as zf:
+            with zf.open(member) as src_file, open(dest, "wb") as dst_file:
+                while size := src_file.readinto(buffer):
+                    dst_file.write(buffer[:size])
+
+    def _import_codes(self, root, ns, project, stats) -> list[Node]:
+        """
+        Prépare les codes (nœuds) du projet REFI-QDA.
+
+        L'arbre des codes est indexé en une seule passe (élément parent ->
+        codes enfants) puis parcouru en largeur, sans recherche descendante
+        à chaque niveau.
+        """
+        code_tag = self._qualify(ns, "Code")
+        description_tag = self._qualify(ns, "Description")
+
+        # Indexer les codes par parent (None pour les codes de premier niveau)
+        children = defaultdict(list)
+        for parent in root.iter():
+            parent_key = parent if parent.tag == code_tag else None
+            for child in parent:
+                if child.tag == code_tag:
+                    children[parent_key].append(child)
+
+        nodes = []
+        queue = deque((None, code_elem) for code_elem in children[None])
+        while queue:
+            parent_id, code_elem = queue.popleft()
             try:
                 guid = code_elem.get("guid", "")
                 name = code_elem.get("name", "Unnamed")
                 color = code_elem.get("color", "#3498db")
                 description = ""
 
-                desc_elem = code_elem.find("Description", ns)
+                desc_elem = code_elem.find(description_tag)
                 if desc_elem is not None and desc_elem.text:
                     description = desc_elem.text
 
@@ -238,31 +405,27 @@ class RefiQdaImporter(BaseImporter):
                     color=color,
                     parent_id=parent_id,
                 )
-                node.save(project.db)
-                stats["nodes_imported"] += 1
+                nodes.append(node)
 
-                # Importer les sous-codes récursivement
-                self._import_codes(root, ns, project, stats, parent_id=guid, parent_elem=code_elem)
+                # Planifier les sous-codes
+                queue.extend((guid, child) for child in children.get(code_elem, ()))
 
             except Exception as e:
                 stats["errors"].append(f"Code {name}: {e}")
 
-    def _import_codings(self, root, ns, project, stats):
-        """Importe les références de codage depuis le projet REFI-QDA."""
-        # Chercher d'abord le conteneur Coding
-        coding_container = root.find(".//Coding", ns)
-        if coding_container is not None:
-            code_refs = coding_container.findall("CodeRef", ns)
-        else:
-            # Sinon, chercher directement les éléments CodeRef
-            code_refs = root.findall(".//CodeRef", ns)
-
-        for coding_elem in code_refs:
+        return nodes
+
+    def _import_codings(self, root, ns, project, stats) -> list[CodeReference]:
+        """Prépare les références de codage du projet REFI-QDA."""
+        references = []
+        text_ref_tag = self._qualify(ns, "TextReference")
+
+        for coding_elem in root.iter(self._qualify(ns, "CodeRef")):
             try:
                 code_guid = coding_elem.get("targetGUID", "")
 
                 # Trouver les références de texte
-                for text_ref in coding_elem.findall(".//TextReference", ns):
+                for text_ref in coding_elem.iter(text_ref_tag):
                     source_guid = text_ref.get("sourceGUID", "")
                     start = int(text_ref.get("start", 0))
                     end = int(text_ref.get("end", 0))
@@ -273,27 +436,24 @@ class RefiQdaImporter(BaseImporter):
                         start_pos=start,
                         end_pos=end,
                     )
-                    code_ref.save(project.db)
-                    stats["codes_imported"] += 1
+                    references.append(code_ref)
 
             except Exception as e:
                 stats["errors"].append(f"Coding: {e}")
 
+        return references
+
     def _map_source_type(self, refi_type: str) -> SourceType:
         """Mappe un type REFI-QDA vers un type Lele."""
-        type_map = {
-            "TextSource": SourceType.TEXT,
-            "PDFSource": SourceType.PDF,
-            "AudioSource": SourceType.AUDIO,
-            "VideoSource": SourceType.VIDEO,
-            "ImageSource": SourceType.IMAGE,
-        }
-        return type_map.get(refi_type, SourceType.OTHER)
+        return self._TYPE_MAP.get(refi_type, SourceType.OTHER)
 
     def export_project(self, project, output_path: Path) -> bool:
         """
         Exporte un projet Lele au format REFI-QDA.
 
+        Le document project.qde est écrit en flux directement dans l'archive,
+        élément par élément, sans construire l'arbre XML complet en mémoire.
+
         Args:
             project: Instance de Project Lele
             output_path: Chemin du fichier .qdpx à créer
@@ -305,52 +465,65 @@ class RefiQdaImporter(BaseImporter):
 
         try:
             with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                # Créer le document XML principal
-                root = ET.Element("Project")
-                root.set("name", project.name)
-                root.set("creationDateTime", project.created_at.isoformat())
-                root.set("modifiedDateTime", datetime.now().isoformat())
-
-                # Ajouter les sources
-                sources_elem = ET.SubElement(root, "Sources")
-                for source in Source.get_all(project.db):
-                    source_elem = ET.SubElement(sources_elem, "Source")
-                    source_elem.set("guid", source.id)
-                    source_elem.set("name", source.name)
-                    source_elem.set("type", f"{source.type.value.title()}Source")
-
-                    if source.content:
-                        text_elem = ET.SubElement(source_elem, "PlainTextContent")
-                        text_elem.text = source.content
-
-                # Ajouter les codes
-                codes_elem = ET.SubElement(root, "Codes")
-                self._export_nodes_recursive(project.db, codes_elem, None)
-
-                # Ajouter les codages
-                # ... (implémentation similaire)
-
-                # Écrire le fichier project.qde
-                xml_str = ET.tostring(root, encoding="unicode")
-                zf.writestr("project.qde", xml_str)
+                with io.TextIOWrapper(
+                    zf.open("project.qde", "w", force_zip64=True), encoding="utf-8"
+                ) as stream:
+                    xml = XMLGenerator(stream, encoding="utf-8", short_empty_elements=True)
+                    xml.startDocument()
+
+                    # Document XML principal
+                    xml.startElement("Project", {
+                        "name": project.name,
+                        "creationDateTime": project.created_at.isoformat(),
+                        "modifiedDateTime": datetime.now().isoformat(),
+                    })
+
+                    # Ajouter les sources
+                    xml.startElement("Sources", {})
+                    for source in Source.iter_all(project.db):
+                        xml.startElement("Source", {
+                            "guid": source.id,
+                            "name": source.name,
+                            "type": f"{source.type.value.title()}Source",
+                        })
+                        if source.content:
+                            xml.startElement("PlainTextContent", {})
+                            xml.characters(source.content)
+                            xml.endElement("PlainTextContent")
+                        xml.endElement("Source")
+                    xml.endElement("Sources")
+
+                    # Ajouter les codes
+                    xml.startElement("Codes", {})
+                    self._export_nodes_recursive(project.db, xml, None)
+                    xml.endElement("Codes")
+
+                    # Ajouter les codages
+                    # ... (implémentation similaire)
+
+                    xml.endElement("Project")
+                    xml.endDocument()
 
             return True
 
         except Exception:
             return False
 
-    def _export_nodes_recursive(self, db, parent_elem, parent_id):
+    def _export_nodes_recursive(self, db, xml: XMLGenerator, parent_id):
         """Exporte les nœuds récursivement."""
         nodes = Node.get_all(db, parent_id=parent_id)
         for node in nodes:
-            code_elem = ET.SubElement(parent_elem, "Code")
-            code_elem.set("guid", node.id)
-            code_elem.set("name", node.name)
-            code_elem.set("color", node.color.lstrip("#"))
+            xml.startElement("Code", {
+                "guid": node.id,
+                "name": node.name,
+                "color": node.color.lstrip("#"),
+            })
 
             if node.description:
-                desc_elem = ET.SubElement(code_elem, "Description")
-                desc_elem.text = node.description
+                xml.startElement("Description", {})
+                xml.characters(node.description)
+                xml.endElement("Description")
 
             # Enfants récursivement
-            self._export_nodes_recursive(db, code_elem, node.id)
+            self._export_nodes_recursive(db, xml, node.id)
+            xml.endElement("Code")
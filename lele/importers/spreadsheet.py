@@ -1,7 +1,10 @@
 """Importer pour les fichiers tableur (Excel, CSV, etc.)."""
 
+import csv
+import io
+import itertools
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from .base import BaseImporter, ImportResult
 from ..models.source import Source, SourceType
@@ -86,11 +89,20 @@ class SpreadsheetImporter(BaseImporter):
 
     def _read_csv(self, file_path: Path, header_row: int) -> tuple[str, dict]:
         """Lit un fichier CSV."""
+        try:
+            return self._read_csv_arrow(file_path, header_row)
+        except Exception:
+            # pyarrow absent, ou fichier qu'il refuse (lignes de longueurs
+            # inégales, encodage autre qu'UTF-8, ArrowInvalid…) : lecture pandas
+            pass
+
         try:
             import pandas as pd
 
             df = pd.read_csv(file_path, header=header_row)
-            content = df.to_string()
+            buffer = io.StringIO()
+            df.to_csv(buffer, sep="\t", index=False, lineterminator="\n")
+            content = buffer.getvalue()
             metadata = {
                 "row_count": len(df),
                 "column_count": len(df.columns),
@@ -99,66 +111,195 @@ class SpreadsheetImporter(BaseImporter):
             return content, metadata
 
         except ImportError:
-            # Fallback sans pandas
-            import csv
+            # Fallback sans pandas : une seule passe, lignes écrites au fil
+            # de la lecture et comptées au passage
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, delimiter="\t", lineterminator="\n")
 
-            with open(file_path, "r", encoding="utf-8-sig") as f:
+            with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
                 reader = csv.reader(f)
-                rows = list(reader)
-
-            if header_row < len(rows):
-                headers = rows[header_row]
-                data_rows = rows[header_row + 1:]
-            else:
-                headers = []
-                data_rows = rows
-
-            # Convertir en texte
-            lines = []
-            if headers:
-                lines.append("\t".join(headers))
-                lines.append("-" * 40)
-            for row in data_rows:
-                lines.append("\t".join(row))
-
-            content = "\n".join(lines)
+                skipped = list(itertools.islice(reader, header_row))
+                headers = next(reader, None)
+
+                if headers is None:
+                    # Ligne d'en-tête absente : toutes les lignes sont des données
+                    headers = []
+                    data_rows = iter(skipped)
+                else:
+                    data_rows = reader
+
+                # Une ligne d'en-tête vide n'est pas recopiée en ligne blanche
+                if headers:
+                    writer.writerow(headers)
+
+                row_count = 0
+                column_count = len(headers)
+                for row in data_rows:
+                    if not row_count and not headers:
+                        column_count = len(row)
+                    row_count += 1
+                    writer.writerow(row)
+
+            content = buffer.getvalue()
             metadata = {
-                "row_count": len(data_rows),
-                "column_count": len(headers) if headers else (len(rows[0]) if rows else 0),
+                "row_count": row_count,
+                "column_count": column_count,
                 "columns": headers,
             }
             return content, metadata
 
+    def _read_csv_arrow(self, file_path: Path, header_row: int) -> tuple[str, dict]:
+        """Lit un fichier CSV avec le lecteur multithreadé de pyarrow."""
+        import pyarrow.csv as pac
+
+        table = pac.read_csv(
+            file_path,
+            read_options=pac.ReadOptions(skip_rows=header_row, block_size=1 << 20),
+        )
+        metadata = {
+            "row_count": table.num_rows,
+            "column_count": table.num_columns,
+            "columns": table.column_names,
+        }
+
+        buffer = io.StringIO()
+        table.to_pandas(self_destruct=True).to_csv(
+            buffer, sep="\t", index=False, lineterminator="\n"
+        )
+        return buffer.getvalue(), metadata
+
     def _read_excel(
         self, file_path: Path, sheet_name: Optional[str], header_row: int
     ) -> tuple[str, dict]:
-        """Lit un fichier Excel."""
+        """Lit un fichier Excel.
+
+        Les lignes sont écrites au fil de la lecture dans un tampon texte
+        (calamine, puis openpyxl en lecture seule) ; pandas n'est utilisé
+        qu'en dernier recours, pour les formats que openpyxl ne lit pas.
+        """
         try:
-            import pandas as pd
+            return self._read_excel_calamine(file_path, sheet_name, header_row)
+        except Exception:
+            # python-calamine absent, ou classeur qu'il refuse (fichier
+            # endommagé, protégé, format inattendu) : lecteurs suivants
+            pass
+
+        if file_path.suffix.lower() in (".xlsx", ".xlsm"):
+            try:
+                return self._read_excel_openpyxl(file_path, sheet_name, header_row)
+            except ImportError:
+                pass
+
+        return self._read_excel_pandas(file_path, sheet_name, header_row)
+
+    def _read_excel_calamine(
+        self, file_path: Path, sheet_name: Optional[str], header_row: int
+    ) -> tuple[str, dict]:
+        """Lit un classeur avec python-calamine (moteur Rust).
+
+        Les lignes sont parcourues une à une (iter_rows) : la feuille n'est
+        jamais convertie en une liste Python complète.
+        """
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(file_path))
+        names = [sheet_name] if sheet_name else workbook.sheet_names
+
+        buffer = io.StringIO()
+        sheets_info = {}
+        for name in names:
+            rows = workbook.get_sheet_by_name(name).iter_rows()
+            sheets_info[name] = self._write_sheet(buffer, name, rows, header_row)
+
+        metadata = {
+            "sheet_count": len(sheets_info),
+            "sheets": sheets_info,
+        }
+        return buffer.getvalue(), metadata
 
-            # Lire toutes les feuilles ou une seule
-            if sheet_name:
-                df = pd.read_excel(file_path, sheet_name=sheet_name, header=header_row)
-                sheets_data = {sheet_name: df}
+    def _read_excel_openpyxl(
+        self, file_path: Path, sheet_name: Optional[str], header_row: int
+    ) -> tuple[str, dict]:
+        """Lit un classeur .xlsx avec openpyxl en mode lecture seule."""
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            names = [sheet_name] if sheet_name else workbook.sheetnames
+
+            buffer = io.StringIO()
+            sheets_info = {}
+            for name in names:
+                rows = workbook[name].iter_rows(values_only=True)
+                sheets_info[name] = self._write_sheet(buffer, name, rows, header_row)
+        finally:
+            workbook.close()
+
+        metadata = {
+            "sheet_count": len(sheets_info),
+            "sheets": sheets_info,
+        }
+        return buffer.getvalue(), metadata
+
+    def _write_sheet(
+        self, buffer: io.StringIO, name: str, rows: Iterable, header_row: int
+    ) -> dict:
+        """Écrit une feuille en texte tabulé, ligne à ligne, et retourne ses infos."""
+        buffer.write(f"=== Feuille: {name} ===\n")
+        writer = csv.writer(buffer, delimiter="\t", lineterminator="\n")
+
+        columns = []
+        row_count = 0
+        for index, row in enumerate(rows):
+            if index < header_row:
+                continue
+            values = ["" if value is None else str(value) for value in row]
+            if index == header_row:
+                columns = values
             else:
-                sheets_data = pd.read_excel(
-                    file_path, sheet_name=None, header=header_row
-                )
+                row_count += 1
+            writer.writerow(values)
+
+        buffer.write("\n\n")
+        return {
+            "row_count": row_count,
+            "column_count": len(columns),
+            "columns": columns,
+        }
+
+    def _read_excel_pandas(
+        self, file_path: Path, sheet_name: Optional[str], header_row: int
+    ) -> tuple[str, dict]:
+        """Lit un fichier Excel avec pandas (formats .xls/.ods sans calamine).
+
+        Le classeur est ouvert une seule fois et chaque feuille en est extraite :
+        les moteurs xlrd et odf, en Python pur, ne gagnent rien à être répartis
+        sur plusieurs threads.
+        """
+        try:
+            import pandas as pd
+
+            with pd.ExcelFile(file_path) as workbook:
+                # Lire toutes les feuilles ou une seule
+                names = [sheet_name] if sheet_name else workbook.sheet_names
+                sheets_data = {
+                    name: workbook.parse(name, header=header_row) for name in names
+                }
 
-            content_parts = []
+            buffer = io.StringIO()
             sheets_info = {}
 
             for name, df in sheets_data.items():
-                content_parts.append(f"=== Feuille: {name} ===\n")
-                content_parts.append(df.to_string())
-                content_parts.append("\n\n")
+                buffer.write(f"=== Feuille: {name} ===\n")
+                df.to_csv(buffer, sep="\t", index=False, lineterminator="\n")
+                buffer.write("\n\n")
                 sheets_info[name] = {
                     "row_count": len(df),
                     "column_count": len(df.columns),
                     "columns": list(df.columns),
                 }
 
-            content = "".join(content_parts)
+            content = buffer.getvalue()
             metadata = {
                 "sheet_count": len(sheets_data),
                 "sheets": sheets_info,
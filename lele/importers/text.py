@@ -1,14 +1,78 @@
 """Importer pour les fichiers texte, PDF et Word."""
 
+import functools
+import io
+import mmap
+import multiprocessing
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Optional
 
-from .base import BaseImporter, ImportResult
+from .base import EXTRACT_CACHE_DIR, BaseImporter, ImportResult, backend_name
 from ..models.source import Source, SourceType
 
+# Au-delà de ce nombre de pages, le texte d'un PDF est extrait en parallèle
+PDF_PARALLEL_MIN_PAGES = 10
+
+# Nombre maximal de processus d'extraction PDF
+PDF_MAX_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+# Paliers de stratégie d'extraction PDF avec pypdf : (pages au plus, processus
+# au plus, pages au plus par tranche). Au-delà du dernier palier, des tranches
+# de taille fixe répartissent la charge entre les processus.
+PDF_STRATEGY_TIERS = (
+    (PDF_PARALLEL_MIN_PAGES, 1, None),
+    (50, 2, None),
+    (500, PDF_MAX_WORKERS, None),
+)
+PDF_LARGE_CHUNK_PAGES = 100
+
+# Espace de noms WordprocessingML (.docx)
+WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+# Éléments porteurs de texte d'un paragraphe : texte, tabulation, sauts de ligne
+WORD_TEXT_TAGS = tuple(f"{{{WORD_NS}}}{name}" for name in ("t", "tab", "br", "cr"))
+
+# Chaînes ASCII imprimables d'au moins 4 caractères (extraction .doc basique)
+DOC_STRING_RE = re.compile(rb"[\x20-\x7e]{4,}")
+
+
+def _write_block(buffer: io.StringIO, text: str, index: int) -> None:
+    """Écrit un bloc de texte, séparé du précédent par une ligne vide.
+
+    Équivaut à "\n\n".join() sans garder la liste des blocs en mémoire.
+    """
+    if index:
+        buffer.write("\n\n")
+    buffer.write(text)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_antiword() -> Optional[str]:
+    """Chemin d'antiword, cherché une seule fois dans le PATH (None si absent)."""
+    return shutil.which("antiword")
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> list[str]:
+    """Extrait avec pypdf le texte des pages [start, stop[ (processus de travail).
+
+    Chaque processus ouvre son propre lecteur, qui n'est pas partageable : la
+    table xref n'est analysée qu'une fois par tranche.
+    """
+    import pypdf
+
+    reader = pypdf.PdfReader(file_path)
+    return [page.extract_text() or "" for page in reader.pages[start:stop]]
+
 
 class TextImporter(BaseImporter):
     """Importe les fichiers texte, PDF et documents Word."""
 
+    extract_cache_dir = EXTRACT_CACHE_DIR
+
     def import_file(
         self,
         file_path: Path,
@@ -31,7 +95,16 @@ class TextImporter(BaseImporter):
         try:
             # Extraire le contenu selon le format
             if ext == ".pdf":
-                content, meta_extra = self._extract_pdf(file_path)
+                # Seul un résultat de la bibliothèque principale est mis en
+                # cache : celui d'un repli (PDF refusé par PyMuPDF) serait
+                # sinon relu sous le nom de cette bibliothèque
+                backend = backend_name("pymupdf", "pypdf", "pdfplumber")
+                content, meta_extra = self._cached_extract(
+                    file_path,
+                    self._extract_pdf,
+                    cache_tag=f"pdf-{backend}",
+                    cacheable=lambda result: result[1].get("method") == backend,
+                )
                 source_type = SourceType.PDF
             elif ext in (".doc", ".docx", ".odt"):
                 content, meta_extra = self._extract_word(file_path)
@@ -72,36 +145,82 @@ class TextImporter(BaseImporter):
             return ImportResult(success=False, error=str(e))
 
     def _extract_text(self, file_path: Path) -> tuple[str, dict]:
-        """Extrait le texte d'un fichier texte simple."""
-        encodings = ["utf-8", "latin-1", "cp1252", "iso-8859-1"]
+        """Extrait le texte d'un fichier texte simple.
+
+        Le fichier est lu une seule fois ; hors UTF-8, l'encodage est détecté
+        par charset-normalizer s'il est installé.
+        """
+        raw = file_path.read_bytes()
 
-        for encoding in encodings:
+        try:
+            return self._decode_text(raw, "utf-8"), {"encoding": "utf-8"}
+        except UnicodeDecodeError:
+            pass
+
+        try:
+            from charset_normalizer import from_bytes
+
+            best = from_bytes(raw).best()
+            if best is not None:
+                content = self._decode_text(raw, best.encoding)
+                return content, {"encoding": best.encoding}
+        except ImportError:
+            pass
+
+        for encoding in ("latin-1", "cp1252", "iso-8859-1"):
             try:
-                content = file_path.read_text(encoding=encoding)
-                return content, {"encoding": encoding}
+                return self._decode_text(raw, encoding), {"encoding": encoding}
             except UnicodeDecodeError:
                 continue
 
         # Fallback avec remplacement des erreurs
-        content = file_path.read_text(encoding="utf-8", errors="replace")
+        content = self._decode_text(raw, "utf-8", errors="replace")
         return content, {"encoding": "utf-8", "encoding_errors": True}
 
+    @staticmethod
+    def _decode_text(raw: bytes, encoding: str, errors: str = "strict") -> str:
+        """Décode comme read_text() (fins de ligne universelles)."""
+        text = raw.decode(encoding, errors)
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
     def _extract_pdf(self, file_path: Path) -> tuple[str, dict]:
-        """Extrait le texte d'un PDF."""
+        """Extrait le texte d'un PDF (PyMuPDF, puis pypdf, puis pdfplumber)."""
+        try:
+            return self._extract_pdf_pymupdf(file_path)
+        except ImportError:
+            pass
+        except Exception:
+            # PDF que MuPDF ne sait pas lire (fichier endommagé, structure
+            # inattendue) : nouvel essai avec pypdf
+            pass
+
         try:
             import pypdf
 
             reader = pypdf.PdfReader(str(file_path))
-            pages = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    pages.append(text)
+            page_count = len(reader.pages)
+
+            texts = None
+            workers, chunk_size = self._pdf_extraction_plan(page_count)
+            if workers > 1:
+                texts = self._extract_pdf_parallel(
+                    file_path, page_count, workers, chunk_size
+                )
+            if texts is None:
+                # Un seul parcours de l'arbre des pages, texte écrit page à page
+                texts = (page.extract_text() for page in reader.pages)
 
-            content = "\n\n".join(pages)
+            buffer = io.StringIO()
+            written = 0
+            for text in texts:
+                if text:
+                    _write_block(buffer, text, written)
+                    written += 1
+            content = buffer.getvalue()
             metadata = {
-                "page_count": len(reader.pages),
+                "page_count": page_count,
                 "pdf_metadata": dict(reader.metadata) if reader.metadata else {},
+                "method": "pypdf",
             }
             return content, metadata
 
@@ -110,15 +229,19 @@ class TextImporter(BaseImporter):
             try:
                 import pdfplumber
 
-                pages = []
+                buffer = io.StringIO()
+                written = 0
                 with pdfplumber.open(file_path) as pdf:
                     for page in pdf.pages:
                         text = page.extract_text()
                         if text:
-                            pages.append(text)
+                            _write_block(buffer, text, written)
+                            written += 1
 
-                content = "\n\n".join(pages)
-                return content, {"page_count": len(pdf.pages)}
+                return buffer.getvalue(), {
+                    "page_count": len(pdf.pages),
+                    "method": "pdfplumber",
+                }
 
             except ImportError:
                 raise ImportError(
@@ -126,27 +249,139 @@ class TextImporter(BaseImporter):
                     "pip install pypdf ou pip install pdfplumber"
                 )
 
+    def _extract_pdf_pymupdf(self, file_path: Path) -> tuple[str, dict]:
+        """
+        Extrait le texte d'un PDF avec PyMuPDF (extracteur C de MuPDF).
+
+        L'extraction reste séquentielle : l'extracteur C est plus rapide que
+        le lancement de processus de travail (interpréteur et import de MuPDF
+        dans chacun), et un document MuPDF n'est pas partageable entre threads.
+        """
+        import pymupdf
+
+        with pymupdf.open(str(file_path)) as doc:
+            page_count = doc.page_count
+            pdf_metadata = {
+                key: value for key, value in (doc.metadata or {}).items() if value
+            }
+
+            buffer = io.StringIO()
+            written = 0
+            for text in (page.get_text() for page in doc):
+                if text:
+                    _write_block(buffer, text, written)
+                    written += 1
+
+        metadata = {
+            "page_count": page_count,
+            "pdf_metadata": pdf_metadata,
+            "method": "pymupdf",
+        }
+        return buffer.getvalue(), metadata
+
+    @staticmethod
+    def _pdf_extraction_plan(page_count: int) -> tuple[int, int]:
+        """
+        Choisit la stratégie d'extraction selon le nombre de pages.
+
+        Petits PDF : séquentiel (lancer des processus coûterait plus que
+        l'extraction). Moyens : une tranche contiguë par processus. Très
+        grands : tranches de taille fixe, plus nombreuses que les processus,
+        pour équilibrer la charge.
+
+        Returns:
+            (nombre de processus, pages par tranche) ; 1 processus = séquentiel
+        """
+        for max_pages, max_workers, chunk_size in PDF_STRATEGY_TIERS:
+            if page_count <= max_pages:
+                break
+        else:
+            max_workers, chunk_size = PDF_MAX_WORKERS, PDF_LARGE_CHUNK_PAGES
+
+        workers = max(1, min(max_workers, PDF_MAX_WORKERS, page_count))
+        if chunk_size is None:
+            chunk_size = -(-page_count // workers)
+        return workers, chunk_size
+
+    def _extract_pdf_parallel(
+        self,
+        file_path: Path,
+        page_count: int,
+        workers: int,
+        chunk_size: int,
+    ) -> Optional[list[str]]:
+        """Extrait avec pypdf les pages d'un PDF par tranches contiguës, en parallèle.
+
+        Les tranches sont confiées à des processus : pypdf est en Python pur,
+        des threads resteraient bloqués par le GIL. L'ordre des pages est
+        conservé.
+
+        Returns:
+            Textes des pages dans l'ordre, ou None si le pool est indisponible
+        """
+        ranges = [
+            (start, min(start + chunk_size, page_count))
+            for start in range(0, page_count, chunk_size)
+        ]
+
+        try:
+            # « spawn » explicite : un fork hériterait des threads de l'interface
+            # et des connexions SQLite ouvertes du processus parent
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(ranges)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _extract_pdf_pages, str(file_path), start, stop
+                    )
+                    for start, stop in ranges
+                ]
+                texts = []
+                for future in futures:
+                    texts.extend(future.result())
+                return texts
+        except (BrokenProcessPool, OSError):
+            # Processus impossibles à lancer : extraction séquentielle
+            return None
+
     def _extract_word(self, file_path: Path) -> tuple[str, dict]:
         """Extrait le texte d'un document Word."""
         ext = file_path.suffix.lower()
 
         if ext == ".docx":
-            return self._extract_docx(file_path)
+            return self._cached_extract(
+                file_path,
+                self._extract_docx,
+                cache_tag=f"docx-{backend_name('lxml', 'docx')}",
+            )
         elif ext == ".doc":
             return self._extract_doc(file_path)
         elif ext == ".odt":
-            return self._extract_odt(file_path)
+            return self._cached_extract(
+                file_path, self._extract_odt, cache_tag=f"odt-{backend_name('odf')}"
+            )
         else:
             raise ValueError(f"Format Word non supporté: {ext}")
 
     def _extract_docx(self, file_path: Path) -> tuple[str, dict]:
         """Extrait le texte d'un fichier .docx."""
+        try:
+            return self._extract_docx_xml(file_path)
+        except (ImportError, KeyError):
+            # lxml absent ou document atypique : passer par python-docx
+            pass
+
         try:
             import docx
 
             doc = docx.Document(str(file_path))
-            paragraphs = [p.text for p in doc.paragraphs]
-            content = "\n\n".join(paragraphs)
+            buffer = io.StringIO()
+            paragraph_count = 0
+            for paragraph in doc.paragraphs:
+                _write_block(buffer, paragraph.text, paragraph_count)
+                paragraph_count += 1
+            content = buffer.getvalue()
 
             # Extraire aussi les tableaux
             tables_text = []
@@ -159,7 +394,7 @@ class TextImporter(BaseImporter):
                 content += "\n\n--- Tableaux ---\n" + "\n".join(tables_text)
 
             metadata = {
-                "paragraph_count": len(paragraphs),
+                "paragraph_count": paragraph_count,
                 "table_count": len(doc.tables),
             }
             return content, metadata
@@ -170,31 +405,114 @@ class TextImporter(BaseImporter):
                 "pip install python-docx"
             )
 
+    def _extract_docx_xml(self, file_path: Path) -> tuple[str, dict]:
+        """
+        Extrait le texte d'un .docx en lisant word/document.xml en flux.
+
+        Même résultat que le chemin python-docx (paragraphes du corps, puis
+        lignes des tableaux), sans construire son modèle objet : chaque
+        élément du corps est libéré dès qu'il a été lu.
+        """
+        import zipfile
+        from lxml import etree
+
+        body_tag = f"{{{WORD_NS}}}body"
+        paragraph_tag = f"{{{WORD_NS}}}p"
+        table_tag = f"{{{WORD_NS}}}tbl"
+
+        buffer = io.StringIO()
+        paragraph_count = 0
+        tables_text = []
+        table_count = 0
+
+        with zipfile.ZipFile(file_path, "r") as z:
+            with z.open("word/document.xml") as document_xml:
+                for _, elem in etree.iterparse(
+                    document_xml, events=("end",), tag=(paragraph_tag, table_tag)
+                ):
+                    parent = elem.getparent()
+                    if parent is None or parent.tag != body_tag:
+                        # Paragraphe de cellule : lu avec son tableau
+                        continue
+
+                    if elem.tag == paragraph_tag:
+                        _write_block(
+                            buffer, self._docx_paragraph_text(elem), paragraph_count
+                        )
+                        paragraph_count += 1
+                    else:
+                        table_count += 1
+                        for row in elem.iterchildren(f"{{{WORD_NS}}}tr"):
+                            cells = [
+                                "\n".join(
+                                    self._docx_paragraph_text(p)
+                                    for p in cell.iterchildren(paragraph_tag)
+                                )
+                                for cell in row.iterchildren(f"{{{WORD_NS}}}tc")
+                            ]
+                            tables_text.append("\t".join(cells))
+
+                    # Libérer l'élément et ses prédécesseurs déjà traités
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del parent[0]
+
+        if tables_text:
+            buffer.write("\n\n--- Tableaux ---\n")
+            buffer.write("\n".join(tables_text))
+        content = buffer.getvalue()
+
+        metadata = {
+            "paragraph_count": paragraph_count,
+            "table_count": table_count,
+        }
+        return content, metadata
+
+    @staticmethod
+    def _docx_paragraph_text(paragraph) -> str:
+        """Texte d'un paragraphe WordprocessingML (comme Paragraph.text)."""
+        parts = []
+        for node in paragraph.iter(*WORD_TEXT_TAGS):
+            if node.tag == WORD_TEXT_TAGS[0]:
+                parts.append(node.text or "")
+            elif node.tag == WORD_TEXT_TAGS[1]:
+                parts.append("\t")
+            else:
+                parts.append("\n")
+        return "".join(parts)
+
     def _extract_doc(self, file_path: Path) -> tuple[str, dict]:
         """Extrait le texte d'un fichier .doc (ancien format)."""
-        try:
-            import subprocess
+        antiword = _find_antiword()
+        if antiword is not None:
+            try:
+                import subprocess
 
-            # Essayer avec antiword
-            result = subprocess.run(
-                ["antiword", str(file_path)],
-                capture_output=True,
-                text=True,
-            )
-            if result.returncode == 0:
-                return result.stdout, {"method": "antiword"}
+                # Essayer avec antiword (chemin résolu une fois par session)
+                result = subprocess.run(
+                    [antiword, str(file_path)],
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode == 0:
+                    return result.stdout, {"method": "antiword"}
 
-        except FileNotFoundError:
-            pass
+            except FileNotFoundError:
+                _find_antiword.cache_clear()
 
         # Fallback: lire comme binaire et extraire le texte visible
         try:
-            content = file_path.read_bytes()
-            # Extraction basique des chaînes ASCII
-            import re
-
-            text_parts = re.findall(b"[\x20-\x7e]{4,}", content)
-            text = "\n".join(p.decode("ascii", errors="ignore") for p in text_parts)
+            with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    text_parts = []
+                else:
+                    # Fichier projeté en mémoire : pas de copie intégrale en
+                    # bytes, le module re parcourt directement la projection
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        text_parts = DOC_STRING_RE.findall(content)
+
+            # Chaînes purement ASCII : un seul décodage pour l'ensemble
+            text = b"\n".join(text_parts).decode("ascii")
             return text, {"method": "basic_extraction", "warning": "Extraction basique"}
 
         except Exception as e:
@@ -211,29 +529,29 @@ class TextImporter(BaseImporter):
 
             doc = load(str(file_path))
             paragraphs = doc.getElementsByType(odf_text.P)
-            content = "\n\n".join(
-                "".join(str(node) for node in p.childNodes)
-                for p in paragraphs
-            )
-            return content, {"paragraph_count": len(paragraphs)}
+            buffer = io.StringIO()
+            for index, p in enumerate(paragraphs):
+                _write_block(
+                    buffer, "".join(str(node) for node in p.childNodes), index
+                )
+            return buffer.getvalue(), {"paragraph_count": len(paragraphs)}
 
         except ImportError:
-            # Fallback: extraire directement du XML
+            # Fallback: extraire directement du XML, en flux depuis l'archive
             import zipfile
             import xml.etree.ElementTree as ET
 
+            buffer = io.StringIO()
+            written = 0
             with zipfile.ZipFile(file_path, "r") as z:
-                content_xml = z.read("content.xml")
-
-            root = ET.fromstring(content_xml)
-            # Namespace ODT
-            ns = {"text": "urn:oasis:names:tc:opendocument:xmlns:text:1.0"}
-
-            paragraphs = []
-            for p in root.iter():
-                if p.tag.endswith("}p") or p.tag.endswith("}h"):
-                    text = "".join(p.itertext())
-                    if text.strip():
-                        paragraphs.append(text)
-
-            return "\n\n".join(paragraphs), {"method": "xml_extraction"}
+                with z.open("content.xml") as content_xml:
+                    for _, elem in ET.iterparse(content_xml, events=("end",)):
+                        if elem.tag.endswith("}p") or elem.tag.endswith("}h"):
+                            text = "".join(elem.itertext())
+                            if text.strip():
+                                _write_block(buffer, text, written)
+                                written += 1
+                            # Libérer le paragraphe déjà lu
+                            elem.clear()
+
+            return buffer.getvalue(), {"method": "xml_extraction"}
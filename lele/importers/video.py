@@ -1,16 +1,50 @@
 """Importer pour les fichiers vidéo."""
 
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
-from .base import BaseImporter, ImportResult
+from .base import EXTRACT_CACHE_DIR, BaseImporter, ImportResult, transcription_cache_tag
 from ..models.source import Source, SourceType
 
+# Intervalle (en secondes) à partir duquel seules les images clés sont décodées
+FRAME_KEYFRAME_ONLY_INTERVAL = 10
+
+# Champs lus par ffprobe (premier flux vidéo et durée du conteneur)
+FFPROBE_ENTRIES = (
+    "stream=width,height,r_frame_rate,codec_name,nb_frames:format=duration"
+)
+
+# Tampon des tubes FFmpeg et taille des blocs lus sur la sortie PCM
+PIPE_BUFFER_SIZE = 1024 * 1024
+
+# Écart (en images) à partir duquel OpenCV se positionne sur chaque image
+# extraite plutôt que de lire la vidéo séquentiellement
+FRAME_SEEK_MIN_STRIDE = 300
+# Échecs de positionnement tolérés avant de revenir à la lecture séquentielle
+FRAME_SEEK_MAX_FAILURES = 3
+
+# Nombre de threads d'encodage JPEG (chemin OpenCV)
+FRAME_WRITE_WORKERS = max(1, min(8, os.cpu_count() or 1))
+
+# Nombre d'analyses de vidéos gardées en mémoire pour la session
+PROBE_MEMORY_CACHE_SIZE = 128
+# (chemin, mtime_ns, taille) -> métadonnées, en LRU ; seules les analyses
+# réussies y sont gardées
+_probe_memory: OrderedDict[tuple, dict] = OrderedDict()
+
 
 class VideoImporter(BaseImporter):
     """Importe les fichiers vidéo avec extraction audio et transcription."""
 
     source_type = SourceType.VIDEO
+    extract_cache_dir = EXTRACT_CACHE_DIR
 
     def import_file(
         self,
@@ -36,6 +70,7 @@ class VideoImporter(BaseImporter):
             show_timestamps: Si True, inclut les horodatages dans le texte
             extract_frames: Si True, extrait des images clés
             frame_interval: Intervalle en secondes entre les frames
+            force_probe: Si True, ignore le cache des métadonnées vidéo
         """
         if isinstance(file_path, str):
             file_path = Path(file_path)
@@ -46,66 +81,90 @@ class VideoImporter(BaseImporter):
 
         warnings = []
         content = ""
+        transcript_segments = []
         extra_metadata = {}
 
         try:
             self.report_progress(0.1, "Analyse de la vidéo...")
 
-            # Extraire les métadonnées vidéo
-            video_meta = self._get_video_metadata(file_path)
-            extra_metadata.update(video_meta)
-
-            self.report_progress(0.2, "Copie du fichier...")
-
-            # Copier dans le projet
-            dest_path = self.copy_to_project(file_path, project_files_path)
-
-            # Extraction et transcription audio si demandée
-            if transcribe:
-                self.report_progress(0.3, "Extraction de l'audio...")
+            # Analyse et copie en parallèle, puis extraction des images pendant
+            # la transcription (étape la plus longue)
+            with ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="lele-video"
+            ) as pool:
+                copy_future = pool.submit(
+                    self.copy_to_project, file_path, project_files_path
+                )
 
+                # Extraire les métadonnées vidéo
                 try:
-                    audio_path = self._extract_audio(file_path, project_files_path)
-
-                    # Récupérer la durée pour l'estimation
-                    video_duration = extra_metadata.get("duration")
-
-                    self.report_progress(0.4, f"Chargement du modèle {whisper_model}...")
-
-                    transcript_result = self._transcribe(
-                        audio_path, whisper_model, language, video_duration
+                    video_meta = self._get_video_metadata(
+                        file_path, force_probe=options.get("force_probe", False)
                     )
-                    # Formater le contenu avec sauts de ligne entre segments
-                    segments = transcript_result.get("segments", [])
-                    content = self._format_transcript(segments, show_timestamps)
-                    extra_metadata["transcription"] = {
-                        "model": whisper_model,
-                        "language_detected": transcript_result.get("language"),
-                        "segments": segments,
-                        "show_timestamps": show_timestamps,
-                    }
-
-                    # Nettoyer le fichier audio temporaire
-                    audio_path.unlink(missing_ok=True)
-
-                    self.report_progress(0.8, "Transcription terminée")
-
-                except ImportError as e:
-                    warnings.append(str(e))
-                except Exception as e:
-                    warnings.append(f"Erreur de transcription: {e}")
-
-            # Extraction des frames si demandée
-            if extract_frames:
-                self.report_progress(0.85, "Extraction des images...")
-
-                try:
-                    frames = self._extract_frames(
-                        file_path, project_files_path, frame_interval
+                except BaseException:
+                    # Analyse en échec : la copie déjà lancée ne doit pas
+                    # rester orpheline dans le dossier du projet
+                    if copy_future.exception() is None:
+                        copy_future.result().unlink(missing_ok=True)
+                    raise
+                extra_metadata.update(video_meta)
+
+                self.report_progress(0.2, "Copie du fichier...")
+
+                # Copier dans le projet
+                dest_path = copy_future.result()
+
+                frames_future = None
+                if extract_frames:
+                    frames_future = pool.submit(
+                        self._extract_frames,
+                        file_path,
+                        project_files_path,
+                        frame_interval,
+                        fps=extra_metadata.get("fps"),
                     )
-                    extra_metadata["extracted_frames"] = frames
-                except Exception as e:
-                    warnings.append(f"Erreur d'extraction des frames: {e}")
+
+                # Extraction et transcription audio si demandée
+                if transcribe:
+                    try:
+                        # Transcription mise en cache par empreinte de la vidéo :
+                        # une vidéo déjà transcrite n'est pas décodée à nouveau
+                        transcript_result = self._cached_extract(
+                            file_path,
+                            self._transcribe_video,
+                            project_files_path,
+                            whisper_model,
+                            language,
+                            extra_metadata.get("duration"),
+                            cache_tag=transcription_cache_tag(whisper_model, language),
+                        )
+                        # Formater le contenu avec sauts de ligne entre segments
+                        segments = transcript_result.get("segments", [])
+                        content = self._format_transcript(segments, show_timestamps)
+                        # Segments stockés à part (table transcript_segments)
+                        transcript_segments = segments
+                        extra_metadata["transcription"] = {
+                            "model": whisper_model,
+                            "language_detected": transcript_result.get("language"),
+                            "segment_count": len(segments),
+                            "show_timestamps": show_timestamps,
+                        }
+
+                        self.report_progress(0.8, "Transcription terminée")
+
+                    except ImportError as e:
+                        warnings.append(str(e))
+                    except Exception as e:
+                        warnings.append(f"Erreur de transcription: {e}")
+
+                # Extraction des frames si demandée
+                if frames_future is not None:
+                    self.report_progress(0.85, "Extraction des images...")
+
+                    try:
+                        extra_metadata["extracted_frames"] = frames_future.result()
+                    except Exception as e:
+                        warnings.append(f"Erreur d'extraction des frames: {e}")
 
             self.report_progress(0.95, "Création de la source...")
 
@@ -119,6 +178,7 @@ class VideoImporter(BaseImporter):
                 file_path=str(dest_path),
                 content=content,
                 metadata=metadata,
+                transcript_segments=transcript_segments,
             )
 
             self.report_progress(1.0, "Import terminé")
@@ -133,14 +193,136 @@ class VideoImporter(BaseImporter):
         except Exception as e:
             return ImportResult(success=False, error=str(e))
 
-    def _get_video_metadata(self, file_path: Path) -> dict:
-        """Extrait les métadonnées d'une vidéo."""
+    def _get_video_metadata(self, file_path: Path, force_probe: bool = False) -> dict:
+        """Extrait les métadonnées d'une vidéo.
+
+        Un seul appel à ffprobe ; OpenCV n'est ouvert qu'en son absence. Le
+        résultat est mémorisé, en mémoire et dans le cache disque, tant que le
+        fichier n'est pas modifié (clé : chemin, taille, date de modification).
+
+        Args:
+            file_path: Chemin du fichier vidéo
+            force_probe: Si True, ignore les caches et relance l'analyse
+        """
+        st = file_path.stat()
+        key = (str(file_path.resolve()), st.st_mtime_ns, st.st_size)
+
+        if not force_probe:
+            # Mémoire de la session d'abord, puis cache disque
+            metadata = _probe_memory.get(key)
+            if metadata is not None:
+                _probe_memory.move_to_end(key)
+                return dict(metadata)
+
+            cache_path = self._probe_cache_path(key)
+            if cache_path is not None:
+                try:
+                    metadata = json.loads(cache_path.read_text(encoding="utf-8"))
+                    os.utime(cache_path)
+                    return self._remember_probe(key, metadata)
+                except (OSError, ValueError):
+                    pass
+
+        return self._store_probe(key, _probe_video(key[0]))
+
+    def _probe_cache_path(self, key: tuple) -> Optional[Path]:
+        """Chemin de l'entrée du cache disque pour une analyse (None sans cache)."""
+        if self.extract_cache_dir is None:
+            return None
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return self.extract_cache_dir / f"probe-{digest}.json"
+
+    @staticmethod
+    def _remember_probe(key: tuple, metadata: dict) -> dict:
+        """Garde une analyse réussie en mémoire et en retourne une copie."""
+        if metadata:
+            _probe_memory[key] = dict(metadata)
+            _probe_memory.move_to_end(key)
+            if len(_probe_memory) > PROBE_MEMORY_CACHE_SIZE:
+                _probe_memory.popitem(last=False)
+        return dict(metadata)
+
+    def _store_probe(self, key: tuple, metadata: dict) -> dict:
+        """Enregistre le résultat d'une analyse en mémoire et dans le cache disque."""
+        # Ne pas mémoriser un échec : ffprobe peut être installé entre-temps
+        if not metadata:
+            return metadata
+
+        cache_path = self._probe_cache_path(key)
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(
+                    f"{cache_path.name}.{os.getpid()}.tmp"
+                )
+                tmp_path.write_text(json.dumps(metadata), encoding="utf-8")
+                os.replace(tmp_path, cache_path)
+            except (OSError, TypeError, ValueError):
+                pass
+
+        return self._remember_probe(key, metadata)
+
+    @classmethod
+    def _probe_ffprobe(cls, file_path: str) -> dict:
+        """Lit les métadonnées avec ffprobe (vide si ffprobe est absent).
+
+        Seuls le premier flux vidéo et les champs utiles sont demandés :
+        ffprobe ne sérialise pas les autres flux ni les balises.
+        """
+        from ..utils.ffmpeg import get_ffprobe_path
+
+        metadata = {}
+
+        ffprobe = get_ffprobe_path()
+        if ffprobe is None:
+            return metadata
+
+        try:
+            result = subprocess.run(
+                [
+                    ffprobe,
+                    "-v",
+                    "quiet",
+                    "-print_format",
+                    "json",
+                    "-select_streams",
+                    "v:0",
+                    "-show_entries",
+                    FFPROBE_ENTRIES,
+                    file_path,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode == 0:
+                data = json.loads(result.stdout)
+                for stream in data.get("streams", []):
+                    metadata["width"] = stream.get("width")
+                    metadata["height"] = stream.get("height")
+                    metadata["fps"] = cls._parse_frame_rate(
+                        stream.get("r_frame_rate", "0/1")
+                    )
+                    metadata["codec"] = stream.get("codec_name")
+                    if str(stream.get("nb_frames", "")).isdigit():
+                        metadata["frame_count"] = int(stream["nb_frames"])
+                    break
+                if "format" in data:
+                    metadata["duration"] = float(data["format"].get("duration", 0))
+
+        except Exception:
+            pass
+
+        return metadata
+
+    @staticmethod
+    def _probe_cv2(file_path: str) -> dict:
+        """Lit les métadonnées avec OpenCV (vide si OpenCV est absent)."""
         metadata = {}
 
         try:
             import cv2
 
-            cap = cv2.VideoCapture(str(file_path))
+            cap = cv2.VideoCapture(file_path)
             if cap.isOpened():
                 metadata["width"] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
                 metadata["height"] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -153,119 +335,197 @@ class VideoImporter(BaseImporter):
         except ImportError:
             pass
 
-        # Essayer avec ffprobe
-        if not metadata:
-            try:
-                import subprocess
-                import json
+        return metadata
+
+    @staticmethod
+    def _parse_frame_rate(value: str) -> float:
+        """Convertit une fraction ffprobe ("30000/1001") en images/seconde.
 
+        Analyse explicite, sans eval() ; 0 si la valeur est invalide.
+        """
+        num, _, den = str(value).partition("/")
+        try:
+            numerator = float(num)
+            denominator = float(den) if den else 1.0
+        except ValueError:
+            return 0.0
+        return numerator / denominator if denominator else 0.0
+
+    def _extract_audio_array(self, video_path: Path):
+        """
+        Décode la piste audio d'une vidéo directement en mémoire.
+
+        FFmpeg écrit le PCM float32 16 kHz mono sur sa sortie standard, au
+        format attendu par Whisper (comme whisper.load_audio) : ni fichier WAV
+        intermédiaire, ni second décodage par Whisper.
+
+        Returns:
+            Tableau numpy float32 normalisé entre -1 et 1
+        """
+        import numpy as np
+        from ..utils.ffmpeg import get_ffmpeg_path
+
+        ffmpeg = get_ffmpeg_path()
+        if ffmpeg is None:
+            raise ImportError(
+                "Installez ffmpeg pour extraire l'audio: pip install imageio-ffmpeg"
+            )
+
+        command = [
+            ffmpeg,
+            "-nostdin",
+            "-i",
+            str(video_path),
+            "-vn",
+            "-f",
+            "f32le",
+            "-acodec",
+            "pcm_f32le",
+            "-ar",
+            "16000",
+            "-ac",
+            "1",
+            "-",
+        ]
+        # stderr dans un fichier temporaire : un tube non lu pourrait se
+        # remplir et bloquer FFmpeg pendant la lecture de stdout
+        with tempfile.TemporaryFile() as stderr:
+            with subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                bufsize=PIPE_BUFFER_SIZE,
+            ) as process:
+                buffer = bytearray()
+                while True:
+                    chunk = process.stdout.read(PIPE_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                returncode = process.wait()
+
+            if returncode != 0:
+                stderr.seek(0)
+                error = stderr.read().decode("utf-8", errors="replace").strip()
+                raise RuntimeError(f"Échec de l'extraction audio: {error[-500:]}")
+
+        # Échantillons float32 déjà normalisés : aucune conversion, aucune copie
+        usable = len(buffer) - len(buffer) % 4
+        return np.frombuffer(buffer, np.float32, count=usable // 4)
+
+    def _extract_audio(self, video_path: Path, output_dir: Path) -> Path:
+        """Extrait la piste audio d'une vidéo dans un fichier WAV.
+
+        FFmpeg est appelé directement ; moviepy (qui repasse lui-même par
+        FFmpeg) ne sert qu'en son absence.
+        """
+        from ..utils.ffmpeg import get_ffmpeg_path
+
+        audio_path = output_dir / f"{video_path.stem}_audio.wav"
+
+        ffmpeg = get_ffmpeg_path()
+        if ffmpeg is not None:
+            try:
                 result = subprocess.run(
                     [
-                        "ffprobe",
-                        "-v",
-                        "quiet",
-                        "-print_format",
-                        "json",
-                        "-show_streams",
-                        "-show_format",
-                        str(file_path),
+                        ffmpeg,
+                        "-nostdin",
+                        "-hide_banner",
+                        "-loglevel",
+                        "error",
+                        "-threads",
+                        "0",
+                        "-i",
+                        str(video_path),
+                        "-map",
+                        "0:a:0",
+                        "-vn",
+                        "-acodec",
+                        "pcm_s16le",
+                        "-ar",
+                        "16000",
+                        "-ac",
+                        "1",
+                        str(audio_path),
+                        "-y",
                     ],
                     capture_output=True,
-                    text=True,
                 )
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    for stream in data.get("streams", []):
-                        if stream.get("codec_type") == "video":
-                            metadata["width"] = stream.get("width")
-                            metadata["height"] = stream.get("height")
-                            # Parsing sécurisé du frame rate (évite eval())
-                            fps_str = stream.get("r_frame_rate", "0/1")
-                            try:
-                                if "/" in fps_str:
-                                    num, den = fps_str.split("/", 1)
-                                    metadata["fps"] = int(num) / int(den) if int(den) != 0 else 0
-                                else:
-                                    metadata["fps"] = float(fps_str)
-                            except (ValueError, ZeroDivisionError):
-                                metadata["fps"] = 0
-                            metadata["codec"] = stream.get("codec_name")
-                            break
-                    if "format" in data:
-                        metadata["duration"] = float(
-                            data["format"].get("duration", 0)
-                        )
-
-            except Exception:
-                pass
-
-        return metadata
+            except FileNotFoundError:
+                result = None
 
-    def _extract_audio(self, video_path: Path, output_dir: Path) -> Path:
-        """Extrait la piste audio d'une vidéo."""
-        audio_path = output_dir / f"{video_path.stem}_audio.wav"
+            if result is not None:
+                if result.returncode != 0:
+                    error = result.stderr.decode("utf-8", errors="replace").strip()
+                    raise RuntimeError(f"Échec de l'extraction audio: {error[-500:]}")
+                return audio_path
 
         try:
-            # Essayer avec moviepy
             from moviepy.editor import VideoFileClip
+        except ImportError:
+            raise ImportError(
+                "Installez ffmpeg ou moviepy pour extraire l'audio: "
+                "pip install imageio-ffmpeg"
+            )
 
-            video = VideoFileClip(str(video_path))
+        video = VideoFileClip(str(video_path))
+        try:
             video.audio.write_audiofile(
                 str(audio_path),
                 verbose=False,
                 logger=None,
             )
+        finally:
             video.close()
-            return audio_path
+        return audio_path
 
-        except ImportError:
-            pass
+    def _transcribe_video(
+        self,
+        file_path: Path,
+        project_files_path: Path,
+        model_name: str,
+        language: Optional[str],
+        video_duration: Optional[float] = None,
+    ) -> dict:
+        """Extrait la piste audio d'une vidéo et la transcrit avec Whisper."""
+        self.report_progress(0.3, "Extraction de l'audio...")
 
-        # Fallback avec ffmpeg
+        audio_path = None
         try:
-            import subprocess
-
-            result = subprocess.run(
-                [
-                    "ffmpeg",
-                    "-i",
-                    str(video_path),
-                    "-vn",
-                    "-acodec",
-                    "pcm_s16le",
-                    "-ar",
-                    "16000",
-                    "-ac",
-                    "1",
-                    str(audio_path),
-                    "-y",
-                ],
-                capture_output=True,
-            )
-            if result.returncode == 0:
-                return audio_path
+            try:
+                # PCM décodé en mémoire, transmis tel quel à Whisper
+                audio = self._extract_audio_array(file_path)
+            except ImportError:
+                audio_path = self._extract_audio(file_path, project_files_path)
+                audio = audio_path
 
-        except FileNotFoundError:
-            pass
+            self.report_progress(0.4, f"Chargement du modèle {model_name}...")
 
-        raise ImportError(
-            "Installez moviepy ou ffmpeg pour extraire l'audio: "
-            "pip install moviepy"
-        )
+            return self._transcribe(audio, model_name, language, video_duration)
+        finally:
+            # Nettoyer le fichier audio temporaire
+            if audio_path is not None:
+                audio_path.unlink(missing_ok=True)
 
     def _transcribe(
         self,
-        audio_path: Path,
+        audio,
         model_name: str,
         language: Optional[str],
         video_duration: Optional[float] = None,
     ) -> dict:
-        """Transcrit un fichier audio avec Whisper."""
-        import whisper
+        """Transcrit avec Whisper un fichier audio ou un signal déjà décodé.
+
+        Args:
+            audio: Chemin du fichier audio, ou tableau float32 à 16 kHz
+        """
         from ..utils.system import get_whisper_device
+        from ..utils.whisper_models import (
+            load_whisper_model,
+            transcribe_faster_whisper,
+        )
 
         device = get_whisper_device()
-        model = whisper.load_model(model_name, device=device)
 
         # Afficher l'estimation du temps
         estimated_time = self._estimate_transcription_time(video_duration, model_name, device)
@@ -281,6 +541,14 @@ class VideoImporter(BaseImporter):
 
         self.report_progress(0.5, progress_msg)
 
+        # faster-whisper (int8) en priorité, openai-whisper sinon
+        try:
+            return transcribe_faster_whisper(audio, model_name, device, language)
+        except ImportError:
+            pass
+
+        model = load_whisper_model(model_name, device)
+
         options = {}
         if language:
             options["language"] = language
@@ -291,7 +559,9 @@ class VideoImporter(BaseImporter):
         else:
             options["fp16"] = False
 
-        result = model.transcribe(str(audio_path), **options)
+        if isinstance(audio, Path):
+            audio = str(audio)
+        result = model.transcribe(audio, **options)
 
         # Simplifier les segments
         simplified_segments = []
@@ -324,20 +594,19 @@ class VideoImporter(BaseImporter):
         if not segments:
             return ""
 
-        lines = []
-        for seg in segments:
-            text = seg.get("text", "").strip()
-            if not text:
-                continue
-
-            if show_timestamps:
-                start = self._format_timestamp(seg["start"])
-                end = self._format_timestamp(seg["end"])
-                lines.append(f"[{start} -> {end}] {text}")
-            else:
-                lines.append(text)
+        if not show_timestamps:
+            return "\n\n".join(
+                text for seg in segments if (text := seg.get("text", "").strip())
+            )
 
-        return "\n\n".join(lines)
+        # Choix du format et résolution de la méthode faits une seule fois
+        format_timestamp = self._format_timestamp
+        return "\n\n".join(
+            f"[{format_timestamp(seg['start'])} -> {format_timestamp(seg['end'])}] "
+            f"{text}"
+            for seg in segments
+            if (text := seg.get("text", "").strip())
+        )
 
     @staticmethod
     def _format_timestamp(seconds: float) -> str:
@@ -400,37 +669,49 @@ class VideoImporter(BaseImporter):
         return estimated
 
     def _extract_frames(
-        self, video_path: Path, output_dir: Path, interval: int
+        self,
+        video_path: Path,
+        output_dir: Path,
+        interval: int,
+        fps: Optional[float] = None,
     ) -> list[str]:
-        """Extrait des frames à intervalles réguliers."""
+        """Extrait des frames à intervalles réguliers.
+
+        FFmpeg sélectionne lui-même les images (filtre fps) ; OpenCV ne sert
+        qu'en l'absence de FFmpeg.
+
+        Args:
+            fps: Fréquence d'images déjà connue (métadonnées), pour éviter de
+                la relire avec OpenCV
+        """
         frames_dir = output_dir / f"{video_path.stem}_frames"
         frames_dir.mkdir(exist_ok=True)
+
+        frames = self._extract_frames_ffmpeg(video_path, frames_dir, interval)
+        if frames is not None:
+            return frames
+
         frames = []
 
         try:
             import cv2
 
-            cap = cv2.VideoCapture(str(video_path))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_interval = int(fps * interval)
-
-            frame_count = 0
-            saved_count = 0
-
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                if frame_count % frame_interval == 0:
+            # Encodage JPEG en parallèle du décodage (libjpeg libère le GIL)
+            with ThreadPoolExecutor(
+                max_workers=FRAME_WRITE_WORKERS, thread_name_prefix="lele-frames"
+            ) as executor:
+                writes = []
+                for saved_count, frame in enumerate(
+                    self._iter_frames_cv2(cv2, video_path, interval, fps)
+                ):
                     frame_path = frames_dir / f"frame_{saved_count:04d}.jpg"
-                    cv2.imwrite(str(frame_path), frame)
+                    # OpenCV alloue un nouveau tableau à chaque image :
+                    # pas de copie nécessaire avant de le confier au pool
+                    writes.append(executor.submit(cv2.imwrite, str(frame_path), frame))
                     frames.append(str(frame_path))
-                    saved_count += 1
 
-                frame_count += 1
-
-            cap.release()
+                for write in writes:
+                    write.result()
 
         except ImportError:
             raise ImportError(
@@ -439,3 +720,111 @@ class VideoImporter(BaseImporter):
             )
 
         return frames
+
+    @staticmethod
+    def _iter_frames_cv2(
+        cv2, video_path: Path, interval: int, fps: Optional[float] = None
+    ):
+        """
+        Génère une image toutes les `interval` secondes avec OpenCV.
+
+        Pour les grands intervalles, chaque image est atteinte par
+        positionnement (CAP_PROP_POS_FRAMES) sans décoder les précédentes.
+        Si le positionnement échoue ou est imprécis (débit d'images variable),
+        la vidéo est relue séquentiellement ; les images sautées sont alors
+        seulement décodées (grab), sans conversion en tableau.
+        """
+        cap = cv2.VideoCapture(str(video_path))
+        try:
+            frame_interval = max(1, int((fps or cap.get(cv2.CAP_PROP_FPS)) * interval))
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            target = 0
+
+            if total > 0 and frame_interval >= FRAME_SEEK_MIN_STRIDE:
+                failures = 0
+                while target < total and failures < FRAME_SEEK_MAX_FAILURES:
+                    ret = cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    if ret:
+                        ret, frame = cap.read()
+                        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+                        ret = ret and position == target + 1
+                    if ret:
+                        yield frame
+                        target += frame_interval
+                    else:
+                        failures += 1
+
+                if failures < FRAME_SEEK_MAX_FAILURES:
+                    return
+
+                # Reprendre depuis le début, sans repositionnement
+                cap.release()
+                cap = cv2.VideoCapture(str(video_path))
+
+            index = 0
+            while cap.grab():
+                if index >= target and index % frame_interval == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        yield frame
+                index += 1
+        finally:
+            cap.release()
+
+    def _extract_frames_ffmpeg(
+        self, video_path: Path, frames_dir: Path, interval: int
+    ) -> Optional[list[str]]:
+        """
+        Extrait une image toutes les `interval` secondes avec le filtre fps.
+
+        Pour les grands intervalles, seules les images clés sont décodées
+        (-skip_frame nokey) : l'image retenue est la plus proche image clé.
+        Le décodage utilise tous les cœurs et l'accélération matérielle.
+
+        Returns:
+            Chemins des images, ou None si FFmpeg est indisponible
+        """
+        from ..utils.ffmpeg import get_ffmpeg_path
+
+        ffmpeg = get_ffmpeg_path()
+        if ffmpeg is None:
+            return None
+
+        # Ne pas mélanger avec les images d'une extraction précédente
+        for old_frame in frames_dir.glob("frame_*.jpg"):
+            old_frame.unlink(missing_ok=True)
+
+        # Décodage multithread, et matériel (NVDEC, VAAPI...) si disponible :
+        # FFmpeg revient au décodage logiciel sinon
+        command = [ffmpeg, "-nostdin", "-threads", "0", "-hwaccel", "auto"]
+        if interval >= FRAME_KEYFRAME_ONLY_INTERVAL:
+            command += ["-skip_frame", "nokey"]
+        command += [
+            "-i",
+            str(video_path),
+            "-vf",
+            f"fps=1/{interval}",
+            "-qscale:v",
+            "2",
+            "-start_number",
+            "0",
+            str(frames_dir / "frame_%04d.jpg"),
+            "-y",
+        ]
+
+        try:
+            result = subprocess.run(command, capture_output=True)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            error = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"Échec de l'extraction des images: {error[-500:]}")
+
+        return [str(path) for path in sorted(frames_dir.glob("frame_*.jpg"))]
+
+
+def _probe_video(file_path: str) -> dict:
+    """Analyse une vidéo (vide en cas d'échec ; voir _get_video_metadata)."""
+    return VideoImporter._probe_ffprobe(file_path) or VideoImporter._probe_cv2(
+        file_path
+    )
@@ -6,6 +6,7 @@ from .node import Node
 from .coding import CodeReference
 from .memo import Memo, Annotation
 from .case import Case, Classification, Attribute
+from .transcript import TranscriptSegment
 
 __all__ = [
     "Project",
@@ -18,4 +19,5 @@ __all__ = [
     "Case",
     "Classification",
     "Attribute",
+    "TranscriptSegment",
 ]
@@ -7,6 +7,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
+from .timestamps import isoformat, lazy_datetimes
+
 
 class AttributeType(Enum):
     """Types d'attributs pour les classifications."""
@@ -19,7 +21,7 @@ class AttributeType(Enum):
     LIST = "list"
 
 
-@dataclass
+@dataclass(slots=True)
 class Attribute:
     """Représente un attribut de classification."""
 
@@ -44,9 +46,9 @@ class Attribute:
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Attribute":
-        """Crée une instance depuis une ligne de base de données."""
-        options = row.get("options", "[]")
+    def from_row(cls, row) -> "Attribute":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
+        options = row["options"]
         if isinstance(options, str):
             options = json.loads(options) if options else []
         return cls(
@@ -59,22 +61,21 @@ class Attribute:
 
     def save(self, db) -> "Attribute":
         """Sauvegarde l'attribut dans la base de données."""
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO attributes
-            (id, classification_id, name, data_type, options)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["classification_id"],
-                data["name"],
-                data["data_type"],
-                data["options"],
-            ),
-        )
-        db.commit()
+        with db:
+            db.execute(
+                """
+                INSERT OR REPLACE INTO attributes
+                (id, classification_id, name, data_type, options)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    self.id,
+                    self.classification_id,
+                    self.name,
+                    self.data_type.value,
+                    json.dumps(self.options),
+                ),
+            )
         return self
 
     @classmethod
@@ -84,16 +85,17 @@ class Attribute:
             "SELECT * FROM attributes WHERE classification_id = ? ORDER BY name",
             (classification_id,),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        return [cls.from_row(row) for row in cursor]
 
     def delete(self, db):
         """Supprime l'attribut de la base de données."""
-        db.execute("DELETE FROM case_attributes WHERE attribute_id = ?", (self.id,))
-        db.execute("DELETE FROM attributes WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            db.execute("DELETE FROM case_attributes WHERE attribute_id = ?", (self.id,))
+            db.execute("DELETE FROM attributes WHERE id = ?", (self.id,))
 
 
-@dataclass
+@lazy_datetimes("created_at")
+@dataclass(slots=True)
 class Classification:
     """Représente une classification (schéma de cas)."""
 
@@ -106,10 +108,6 @@ class Classification:
     # Champs non persistés
     attributes: list[Attribute] = field(default_factory=list, repr=False)
 
-    def __post_init__(self):
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-
     def to_dict(self) -> dict:
         """Convertit en dictionnaire."""
         return {
@@ -117,38 +115,37 @@ class Classification:
             "name": self.name,
             "description": self.description,
             "type": self.type,
-            "created_at": self.created_at.isoformat(),
+            "created_at": isoformat(self, "created_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Classification":
-        """Crée une instance depuis une ligne de base de données."""
+    def from_row(cls, row) -> "Classification":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
         return cls(
             id=row["id"],
             name=row["name"],
-            description=row.get("description", ""),
+            description=row["description"],
             type=row["type"],
             created_at=row["created_at"],
         )
 
     def save(self, db) -> "Classification":
         """Sauvegarde la classification dans la base de données."""
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO classifications
-            (id, name, description, type, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["name"],
-                data["description"],
-                data["type"],
-                data["created_at"],
-            ),
-        )
-        db.commit()
+        with db:
+            db.execute(
+                """
+                INSERT OR REPLACE INTO classifications
+                (id, name, description, type, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    self.id,
+                    self.name,
+                    self.description,
+                    self.type,
+                    isoformat(self, "created_at"),
+                ),
+            )
         return self
 
     @classmethod
@@ -159,7 +156,7 @@ class Classification:
         )
         row = cursor.fetchone()
         if row:
-            classification = cls.from_row(dict(row))
+            classification = cls.from_row(row)
             classification.attributes = Attribute.get_by_classification(
                 db, classification_id
             )
@@ -176,7 +173,7 @@ class Classification:
             )
         else:
             cursor = db.execute("SELECT * FROM classifications ORDER BY name")
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        return [cls.from_row(row) for row in cursor]
 
     def add_attribute(
         self,
@@ -198,19 +195,29 @@ class Classification:
 
     def delete(self, db):
         """Supprime la classification de la base de données."""
-        # Supprimer les attributs
-        for attr in Attribute.get_by_classification(db, self.id):
-            attr.delete(db)
-        # Mettre à jour les cas
-        db.execute(
-            "UPDATE cases SET classification_id = NULL WHERE classification_id = ?",
-            (self.id,),
-        )
-        db.execute("DELETE FROM classifications WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            # Supprimer les attributs et leurs valeurs, sans commit par attribut
+            db.execute(
+                """
+                DELETE FROM case_attributes WHERE attribute_id IN (
+                    SELECT id FROM attributes WHERE classification_id = ?
+                )
+                """,
+                (self.id,),
+            )
+            db.execute(
+                "DELETE FROM attributes WHERE classification_id = ?", (self.id,)
+            )
+            # Mettre à jour les cas
+            db.execute(
+                "UPDATE cases SET classification_id = NULL WHERE classification_id = ?",
+                (self.id,),
+            )
+            db.execute("DELETE FROM classifications WHERE id = ?", (self.id,))
 
 
-@dataclass
+@lazy_datetimes("created_at")
+@dataclass(slots=True)
 class Case:
     """Représente un cas (unité d'analyse)."""
 
@@ -223,10 +230,6 @@ class Case:
     # Champs non persistés
     attribute_values: dict[str, Any] = field(default_factory=dict, repr=False)
 
-    def __post_init__(self):
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-
     def to_dict(self) -> dict:
         """Convertit en dictionnaire."""
         return {
@@ -234,78 +237,124 @@ class Case:
             "name": self.name,
             "description": self.description,
             "classification_id": self.classification_id,
-            "created_at": self.created_at.isoformat(),
+            "created_at": isoformat(self, "created_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Case":
-        """Crée une instance depuis une ligne de base de données."""
+    def from_row(cls, row) -> "Case":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
         return cls(
             id=row["id"],
             name=row["name"],
-            description=row.get("description", ""),
-            classification_id=row.get("classification_id"),
+            description=row["description"],
+            classification_id=row["classification_id"],
             created_at=row["created_at"],
         )
 
     def save(self, db) -> "Case":
         """Sauvegarde le cas dans la base de données."""
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO cases
-            (id, name, description, classification_id, created_at)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["name"],
-                data["description"],
-                data["classification_id"],
-                data["created_at"],
-            ),
-        )
-        db.commit()
+        with db:
+            db.execute(
+                """
+                INSERT OR REPLACE INTO cases
+                (id, name, description, classification_id, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    self.id,
+                    self.name,
+                    self.description,
+                    self.classification_id,
+                    isoformat(self, "created_at"),
+                ),
+            )
         return self
 
     def set_attribute(self, db, attribute_id: str, value: Any):
         """Définit la valeur d'un attribut pour ce cas."""
-        str_value = json.dumps(value) if not isinstance(value, str) else value
-        db.execute(
-            """
-            INSERT OR REPLACE INTO case_attributes (case_id, attribute_id, value)
-            VALUES (?, ?, ?)
-            """,
-            (self.id, attribute_id, str_value),
-        )
-        db.commit()
-        self.attribute_values[attribute_id] = value
+        self.set_attributes(db, {attribute_id: value})
+
+    def set_attributes(self, db, values: dict[str, Any]):
+        """Définit plusieurs valeurs d'attributs en une seule transaction."""
+        rows = []
+        for attribute_id, value in values.items():
+            kind, text, num = self._encode_value(value)
+            rows.append((self.id, attribute_id, kind, text, num))
+        # L'ancienne colonne value n'est plus écrite : seules les lignes
+        # antérieures aux colonnes typées la renseignent encore
+        with db:
+            db.executemany(
+                """
+                INSERT OR REPLACE INTO case_attributes
+                (case_id, attribute_id, value_kind, value_text, value_num)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        self.attribute_values.update(values)
 
     def get_attribute(self, db, attribute_id: str) -> Any:
         """Récupère la valeur d'un attribut."""
         cursor = db.execute(
-            "SELECT value FROM case_attributes WHERE case_id = ? AND attribute_id = ?",
+            """
+            SELECT value, value_kind, value_text, value_num FROM case_attributes
+            WHERE case_id = ? AND attribute_id = ?
+            """,
             (self.id, attribute_id),
         )
         row = cursor.fetchone()
         if row:
-            try:
-                return json.loads(row["value"])
-            except (json.JSONDecodeError, TypeError):
-                return row["value"]
+            return self._decode_value(row)
         return None
 
     def load_attributes(self, db):
         """Charge toutes les valeurs d'attributs."""
         cursor = db.execute(
-            "SELECT attribute_id, value FROM case_attributes WHERE case_id = ?",
+            """
+            SELECT attribute_id, value, value_kind, value_text, value_num
+            FROM case_attributes WHERE case_id = ?
+            """,
             (self.id,),
         )
         for row in cursor.fetchall():
-            try:
-                self.attribute_values[row["attribute_id"]] = json.loads(row["value"])
-            except (json.JSONDecodeError, TypeError):
-                self.attribute_values[row["attribute_id"]] = row["value"]
+            self.attribute_values[row["attribute_id"]] = self._decode_value(row)
+
+    @staticmethod
+    def _encode_value(value: Any) -> tuple[str, Optional[str], Optional[float]]:
+        """Répartit une valeur d'attribut en (value_kind, value_text, value_num)."""
+        if isinstance(value, str):
+            return "text", value, None
+        if isinstance(value, bool):
+            return "bool", None, float(value)
+        # Au-delà de 2**53, un REAL ne représente plus exactement l'entier
+        if isinstance(value, int) and abs(value) <= 2**53:
+            return "int", None, float(value)
+        if isinstance(value, float):
+            return "float", None, value
+        return "json", json.dumps(value), None
+
+    @staticmethod
+    def _decode_value(row) -> Any:
+        """Décode une valeur d'attribut stockée selon sa colonne value_kind."""
+        kind = row["value_kind"]
+        if kind == "text":
+            return row["value_text"]
+        if kind == "int":
+            return int(row["value_num"])
+        if kind == "float":
+            # SQLite enregistre un REAL NaN comme NULL
+            num = row["value_num"]
+            return float("nan") if num is None else num
+        if kind == "bool":
+            return bool(row["value_num"])
+        if kind == "json":
+            return json.loads(row["value_text"])
+
+        # Valeur enregistrée avant l'ajout des colonnes typées
+        try:
+            return json.loads(row["value"])
+        except (json.JSONDecodeError, TypeError):
+            return row["value"]
 
     @classmethod
     def get(cls, db, case_id: str) -> Optional["Case"]:
@@ -313,7 +362,7 @@ class Case:
         cursor = db.execute("SELECT * FROM cases WHERE id = ?", (case_id,))
         row = cursor.fetchone()
         if row:
-            case = cls.from_row(dict(row))
+            case = cls.from_row(row)
             case.load_attributes(db)
             return case
         return None
@@ -330,23 +379,51 @@ class Case:
             )
         else:
             cursor = db.execute("SELECT * FROM cases ORDER BY name")
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        return [cls.from_row(row) for row in cursor]
+
+    @classmethod
+    def get_all_with_attributes(
+        cls, db, classification_id: Optional[str] = None
+    ) -> list["Case"]:
+        """Récupère tous les cas et leurs valeurs d'attributs en une requête."""
+        query = """
+            SELECT c.*, ca.attribute_id, ca.value, ca.value_kind, ca.value_text,
+                   ca.value_num
+            FROM cases c
+            LEFT JOIN case_attributes ca ON ca.case_id = c.id
+        """
+        params = ()
+        if classification_id:
+            query += " WHERE c.classification_id = ?"
+            params = (classification_id,)
+        query += " ORDER BY c.name, c.id"
+
+        cases = []
+        current = None
+        for row in db.execute(query, params):
+            if current is None or current.id != row["id"]:
+                current = cls.from_row(row)
+                cases.append(current)
+            if row["attribute_id"] is not None:
+                current.attribute_values[row["attribute_id"]] = cls._decode_value(row)
+        return cases
 
     def delete(self, db):
         """Supprime le cas de la base de données."""
-        db.execute("DELETE FROM case_attributes WHERE case_id = ?", (self.id,))
-        db.execute("DELETE FROM cases WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            db.execute("DELETE FROM case_attributes WHERE case_id = ?", (self.id,))
+            db.execute("DELETE FROM cases WHERE id = ?", (self.id,))
 
     def get_linked_source_ids(self, db) -> list[str]:
         """Récupère les IDs des sources liées à ce cas via la table links."""
+        # Une seule requête ; chaque branche du OR est servie par son index
         cursor = db.execute(
             """
-            SELECT target_id FROM links
-            WHERE source_type = 'case' AND source_id = ? AND target_type = 'source'
-            UNION
-            SELECT source_id FROM links
-            WHERE target_type = 'case' AND target_id = ? AND source_type = 'source'
+            SELECT DISTINCT
+                CASE WHEN source_type = 'case' THEN target_id ELSE source_id END
+            FROM links
+            WHERE (source_type = 'case' AND source_id = ? AND target_type = 'source')
+               OR (target_type = 'case' AND target_id = ? AND source_type = 'source')
             """,
             (self.id, self.id),
         )
@@ -356,11 +433,11 @@ class Case:
         """Lie une source à ce cas."""
         from datetime import datetime
         link_id = str(uuid.uuid4())
-        db.execute(
-            """
-            INSERT INTO links (id, source_type, source_id, target_type, target_id, link_type, created_at)
-            VALUES (?, 'case', ?, 'source', ?, ?, ?)
-            """,
-            (link_id, self.id, source_id, link_type, datetime.now().isoformat()),
-        )
-        db.commit()
+        with db:
+            db.execute(
+                """
+                INSERT INTO links (id, source_type, source_id, target_type, target_id, link_type, created_at)
+                VALUES (?, 'case', ?, 'source', ?, ?, ?)
+                """,
+                (link_id, self.id, source_id, link_type, datetime.now().isoformat()),
+            )
@@ -3,10 +3,58 @@
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, NamedTuple, Optional
 
+from .timestamps import isoformat, lazy_datetimes
 
-@dataclass
+
+# Longueur de l'extrait de passage renvoyé par les vues résumées
+SUMMARY_PREVIEW_LENGTH = 100
+
+# Colonnes des vues résumées : pas de cr.content complet, seulement un extrait
+_SUMMARY_SELECT = """
+    SELECT cr.id, cr.node_id, cr.source_id, n.name, s.name, n.color,
+           cr.start_pos, cr.end_pos, COALESCE(substr(cr.content, 1, ?), '')
+    FROM code_references cr
+    JOIN sources s ON cr.source_id = s.id
+    JOIN nodes n ON cr.node_id = n.id
+"""
+_SUMMARY_BY_NODE_SQL = (
+    _SUMMARY_SELECT + "WHERE cr.node_id = ? ORDER BY s.name, cr.start_pos"
+)
+_SUMMARY_BY_SOURCE_SQL = (
+    _SUMMARY_SELECT + "WHERE cr.source_id = ? ORDER BY cr.start_pos"
+)
+
+# Requête de nom par table, pour ne pas assembler le SQL à chaque appel
+_NAME_SQL = {
+    "nodes": "SELECT name FROM nodes WHERE id = ?",
+    "sources": "SELECT name FROM sources WHERE id = ?",
+}
+
+
+def _name_of(db, table: str, item_id: str) -> Optional[str]:
+    """Nom d'une source ou d'un nœud (None s'il n'existe pas)."""
+    row = db.execute(_NAME_SQL[table], (item_id,)).fetchone()
+    return row[0] if row else None
+
+
+class ReferenceSummary(NamedTuple):
+    """Vue légère d'une référence de codage pour l'affichage en liste."""
+
+    id: str
+    node_id: str
+    source_id: str
+    node_name: str
+    source_name: str
+    node_color: str
+    start_pos: Optional[int]
+    end_pos: Optional[int]
+    preview: str
+
+
+@lazy_datetimes("created_at")
+@dataclass(slots=True)
 class CodeReference:
     """Représente une référence de codage (lien entre nœud et source)."""
 
@@ -22,10 +70,6 @@ class CodeReference:
     source_name: str = field(default="", repr=False)
     node_name: str = field(default="", repr=False)
 
-    def __post_init__(self):
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-
     def to_dict(self) -> dict:
         """Convertit en dictionnaire."""
         return {
@@ -35,50 +79,73 @@ class CodeReference:
             "start_pos": self.start_pos,
             "end_pos": self.end_pos,
             "content": self.content,
-            "created_at": self.created_at.isoformat(),
+            "created_at": isoformat(self, "created_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "CodeReference":
-        """Crée une instance depuis une ligne de base de données."""
+    def from_row(cls, row) -> "CodeReference":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
         ref = cls(
             id=row["id"],
             node_id=row["node_id"],
             source_id=row["source_id"],
-            start_pos=row.get("start_pos"),
-            end_pos=row.get("end_pos"),
-            content=row.get("content"),
+            start_pos=row["start_pos"],
+            end_pos=row["end_pos"],
+            content=row["content"],
             created_at=row["created_at"],
         )
         # Champs joints si présents
-        if "source_name" in row:
+        keys = row.keys()
+        if "source_name" in keys:
             ref.source_name = row["source_name"]
-        if "node_name" in row:
+        if "node_name" in keys:
             ref.node_name = row["node_name"]
         return ref
 
     def save(self, db) -> "CodeReference":
         """Sauvegarde la référence dans la base de données."""
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO code_references
-            (id, node_id, source_id, start_pos, end_pos, content, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["node_id"],
-                data["source_id"],
-                data["start_pos"],
-                data["end_pos"],
-                data["content"],
-                data["created_at"],
-            ),
-        )
-        db.commit()
+        self.save_many(db, [self])
         return self
 
+    @classmethod
+    def save_many(
+        cls, db, references: Iterable["CodeReference"]
+    ) -> list["CodeReference"]:
+        """Sauvegarde plusieurs références en une seule transaction."""
+        references = list(references)
+        rows = []
+        for ref in references:
+            rows.append(
+                (
+                    ref.id,
+                    ref.node_id,
+                    ref.source_id,
+                    ref.start_pos,
+                    ref.end_pos,
+                    ref.content,
+                    isoformat(ref, "created_at"),
+                )
+            )
+        with db:
+            # UPSERT plutôt que INSERT OR REPLACE : une référence modifiée passe par
+            # le trigger de mise à jour, sans compter deux fois dans ref_count
+            db.executemany(
+                """
+                INSERT INTO code_references
+                (id, node_id, source_id, start_pos, end_pos, content, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    node_id = excluded.node_id,
+                    source_id = excluded.source_id,
+                    start_pos = excluded.start_pos,
+                    end_pos = excluded.end_pos,
+                    content = excluded.content,
+                    created_at = excluded.created_at
+                """,
+                rows,
+            )
+        return references
+
     @classmethod
     def get(cls, db, ref_id: str) -> Optional["CodeReference"]:
         """Récupère une référence par ID."""
@@ -93,75 +160,122 @@ class CodeReference:
             (ref_id,),
         )
         row = cursor.fetchone()
-        return cls.from_row(dict(row)) if row else None
+        return cls.from_row(row) if row else None
 
     @classmethod
     def get_by_node(cls, db, node_id: str) -> list["CodeReference"]:
         """Récupère toutes les références pour un nœud."""
+        return list(cls.iter_by_node(db, node_id))
+
+    @classmethod
+    def iter_by_node(cls, db, node_id: str) -> Iterator["CodeReference"]:
+        """Parcourt les références d'un nœud une à une.
+
+        Le nom du nœud, le même pour toutes les lignes, est lu une seule fois.
+        """
+        node_name = _name_of(db, "nodes", node_id)
+        if node_name is None:
+            return
         cursor = db.execute(
             """
-            SELECT cr.*, s.name as source_name, n.name as node_name
+            SELECT cr.*, s.name as source_name
             FROM code_references cr
             JOIN sources s ON cr.source_id = s.id
-            JOIN nodes n ON cr.node_id = n.id
             WHERE cr.node_id = ?
             ORDER BY s.name, cr.start_pos
             """,
             (node_id,),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        for row in cursor:
+            ref = cls.from_row(row)
+            ref.node_name = node_name
+            yield ref
 
     @classmethod
     def get_by_source(cls, db, source_id: str) -> list["CodeReference"]:
         """Récupère toutes les références pour une source."""
+        return list(cls.iter_by_source(db, source_id))
+
+    @classmethod
+    def iter_by_source(cls, db, source_id: str) -> Iterator["CodeReference"]:
+        """Parcourt les références d'une source une à une.
+
+        Le nom de la source, le même pour toutes les lignes, est lu une seule fois.
+        """
+        source_name = _name_of(db, "sources", source_id)
+        if source_name is None:
+            return
         cursor = db.execute(
             """
-            SELECT cr.*, s.name as source_name, n.name as node_name
+            SELECT cr.*, n.name as node_name
             FROM code_references cr
-            JOIN sources s ON cr.source_id = s.id
             JOIN nodes n ON cr.node_id = n.id
             WHERE cr.source_id = ?
             ORDER BY cr.start_pos
             """,
             (source_id,),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        for row in cursor:
+            ref = cls.from_row(row)
+            ref.source_name = source_name
+            yield ref
+
+    @staticmethod
+    def list_by_node_summary(db, node_id: str) -> list[ReferenceSummary]:
+        """Résumés des références d'un nœud, sans charger le texte codé."""
+        cursor = db.execute(
+            _SUMMARY_BY_NODE_SQL, (SUMMARY_PREVIEW_LENGTH, node_id)
+        )
+        return [ReferenceSummary._make(row) for row in cursor]
+
+    @staticmethod
+    def list_by_source_summary(db, source_id: str) -> list[ReferenceSummary]:
+        """Résumés des références d'une source, sans charger le texte codé."""
+        cursor = db.execute(
+            _SUMMARY_BY_SOURCE_SQL, (SUMMARY_PREVIEW_LENGTH, source_id)
+        )
+        return [ReferenceSummary._make(row) for row in cursor]
 
     @classmethod
     def get_by_source_and_node(
         cls, db, source_id: str, node_id: str
     ) -> list["CodeReference"]:
         """Récupère les références pour une source et un nœud spécifiques."""
+        source_name = _name_of(db, "sources", source_id)
+        node_name = _name_of(db, "nodes", node_id)
+        if source_name is None or node_name is None:
+            return []
         cursor = db.execute(
             """
-            SELECT cr.*, s.name as source_name, n.name as node_name
-            FROM code_references cr
-            JOIN sources s ON cr.source_id = s.id
-            JOIN nodes n ON cr.node_id = n.id
-            WHERE cr.source_id = ? AND cr.node_id = ?
-            ORDER BY cr.start_pos
+            SELECT * FROM code_references
+            WHERE source_id = ? AND node_id = ?
+            ORDER BY start_pos
             """,
             (source_id, node_id),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        refs = [cls.from_row(row) for row in cursor]
+        for ref in refs:
+            ref.source_name = source_name
+            ref.node_name = node_name
+        return refs
 
     def delete(self, db):
         """Supprime la référence de la base de données."""
-        db.execute("DELETE FROM code_references WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            db.execute("DELETE FROM code_references WHERE id = ?", (self.id,))
 
     @classmethod
     def count_by_node(cls, db, node_id: str) -> int:
         """Compte le nombre de références pour un nœud."""
-        cursor = db.execute(
-            "SELECT COUNT(*) FROM code_references WHERE node_id = ?", (node_id,)
-        )
-        return cursor.fetchone()[0]
+        cursor = db.execute("SELECT ref_count FROM nodes WHERE id = ?", (node_id,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
 
     @classmethod
     def count_by_source(cls, db, source_id: str) -> int:
         """Compte le nombre de références pour une source."""
         cursor = db.execute(
-            "SELECT COUNT(*) FROM code_references WHERE source_id = ?", (source_id,)
+            "SELECT ref_count FROM sources WHERE id = ?", (source_id,)
         )
-        return cursor.fetchone()[0]
+        row = cursor.fetchone()
+        return row[0] if row else 0
@@ -0,0 +1,40 @@
+"""Exécution des recherches plein texte (FTS5) sur une saisie utilisateur."""
+
+import sqlite3
+
+
+def quote_terms(query: str) -> str:
+    """Met chaque terme de la saisie entre guillemets (syntaxe FTS5 neutralisée).
+
+    « jean-pierre » ou « l'homme » deviennent des phrases au lieu d'erreurs
+    de syntaxe ; un * final reste une recherche par préfixe.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith("*") and len(term) > 1
+        if prefix:
+            term = term[:-1]
+        quoted = '"' + term.replace('"', '""') + '"'
+        terms.append(quoted + "*" if prefix else quoted)
+    return " ".join(terms)
+
+
+def fts_match(db, sql: str, query: str, *params) -> list:
+    """Exécute une requête « MATCH ? » et retourne ses lignes.
+
+    La saisie est d'abord transmise telle quelle, pour garder la syntaxe FTS5
+    (phrases entre guillemets, NEAR, parenthèses, OR/NOT, filtres de
+    colonne) ; si FTS5 la refuse, chaque terme est mis entre guillemets.
+
+    Args:
+        sql: Requête dont le premier paramètre est l'expression MATCH
+        query: Saisie de l'utilisateur
+        params: Paramètres suivants de la requête
+    """
+    try:
+        return db.execute(sql, (query, *params)).fetchall()
+    except sqlite3.OperationalError:
+        quoted = quote_terms(query)
+        if not quoted:
+            return []
+        return db.execute(sql, (quoted, *params)).fetchall()
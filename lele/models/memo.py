@@ -3,10 +3,13 @@
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+from .timestamps import isoformat, lazy_datetimes
 
-@dataclass
+
+@lazy_datetimes("created_at", "modified_at")
+@dataclass(slots=True)
 class Memo:
     """Représente un mémo (note de recherche)."""
 
@@ -18,12 +21,6 @@ class Memo:
     created_at: datetime = field(default_factory=datetime.now)
     modified_at: datetime = field(default_factory=datetime.now)
 
-    def __post_init__(self):
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-        if isinstance(self.modified_at, str):
-            self.modified_at = datetime.fromisoformat(self.modified_at)
-
     def to_dict(self) -> dict:
         """Convertit en dictionnaire."""
         return {
@@ -32,64 +29,86 @@ class Memo:
             "content": self.content,
             "linked_source_id": self.linked_source_id,
             "linked_node_id": self.linked_node_id,
-            "created_at": self.created_at.isoformat(),
-            "modified_at": self.modified_at.isoformat(),
+            "created_at": isoformat(self, "created_at"),
+            "modified_at": isoformat(self, "modified_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Memo":
-        """Crée une instance depuis une ligne de base de données."""
+    def from_row(cls, row) -> "Memo":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
         return cls(
             id=row["id"],
             title=row["title"],
-            content=row.get("content", ""),
-            linked_source_id=row.get("linked_source_id"),
-            linked_node_id=row.get("linked_node_id"),
+            content=row["content"],
+            linked_source_id=row["linked_source_id"],
+            linked_node_id=row["linked_node_id"],
             created_at=row["created_at"],
             modified_at=row["modified_at"],
         )
 
     def save(self, db) -> "Memo":
         """Sauvegarde le mémo dans la base de données."""
-        self.modified_at = datetime.now()
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO memos
-            (id, title, content, linked_source_id, linked_node_id, created_at, modified_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["title"],
-                data["content"],
-                data["linked_source_id"],
-                data["linked_node_id"],
-                data["created_at"],
-                data["modified_at"],
-            ),
-        )
-        # Mettre à jour l'index FTS
-        db.execute("DELETE FROM memos_fts WHERE id = ?", (self.id,))
-        db.execute(
-            "INSERT INTO memos_fts (id, title, content) VALUES (?, ?, ?)",
-            (self.id, self.title, self.content),
-        )
-        db.commit()
+        self.save_many(db, [self])
         return self
 
+    @classmethod
+    def save_many(cls, db, memos: Iterable["Memo"]) -> list["Memo"]:
+        """Sauvegarde plusieurs mémos (et leur index FTS) en une seule transaction."""
+        memos = list(memos)
+        now = datetime.now()
+        rows = []
+        for memo in memos:
+            memo.modified_at = now
+            rows.append(
+                (
+                    memo.id,
+                    memo.title,
+                    memo.content,
+                    memo.linked_source_id,
+                    memo.linked_node_id,
+                    isoformat(memo, "created_at"),
+                    isoformat(memo, "modified_at"),
+                )
+            )
+        # UPSERT plutôt que INSERT OR REPLACE : la ligne garde son docid et le
+        # trigger de mise à jour tient l'index FTS à jour
+        with db:
+            db.executemany(
+                """
+                INSERT INTO memos
+                (id, title, content, linked_source_id, linked_node_id,
+                 created_at, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    title = excluded.title,
+                    content = excluded.content,
+                    linked_source_id = excluded.linked_source_id,
+                    linked_node_id = excluded.linked_node_id,
+                    created_at = excluded.created_at,
+                    modified_at = excluded.modified_at
+                """,
+                rows,
+            )
+        return memos
+
     @classmethod
     def get(cls, db, memo_id: str) -> Optional["Memo"]:
         """Récupère un mémo par ID."""
         cursor = db.execute("SELECT * FROM memos WHERE id = ?", (memo_id,))
         row = cursor.fetchone()
-        return cls.from_row(dict(row)) if row else None
+        return cls.from_row(row) if row else None
 
     @classmethod
     def get_all(cls, db) -> list["Memo"]:
         """Récupère tous les mémos."""
+        return list(cls.iter_all(db))
+
+    @classmethod
+    def iter_all(cls, db) -> Iterator["Memo"]:
+        """Parcourt les mémos un à un, du plus récent au plus ancien."""
         cursor = db.execute("SELECT * FROM memos ORDER BY modified_at DESC")
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        for row in cursor:
+            yield cls.from_row(row)
 
     @classmethod
     def get_by_source(cls, db, source_id: str) -> list["Memo"]:
@@ -98,7 +117,7 @@ class Memo:
             "SELECT * FROM memos WHERE linked_source_id = ? ORDER BY modified_at DESC",
             (source_id,),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        return [cls.from_row(row) for row in cursor]
 
     @classmethod
     def get_by_node(cls, db, node_id: str) -> list["Memo"]:
@@ -107,16 +126,16 @@ class Memo:
             "SELECT * FROM memos WHERE linked_node_id = ? ORDER BY modified_at DESC",
             (node_id,),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        return [cls.from_row(row) for row in cursor]
 
     def delete(self, db):
         """Supprime le mémo de la base de données."""
-        db.execute("DELETE FROM memos_fts WHERE id = ?", (self.id,))
-        db.execute("DELETE FROM memos WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            db.execute("DELETE FROM memos WHERE id = ?", (self.id,))
 
 
-@dataclass
+@lazy_datetimes("created_at")
+@dataclass(slots=True)
 class Annotation:
     """Représente une annotation sur une source."""
 
@@ -127,10 +146,6 @@ class Annotation:
     end_pos: Optional[int] = None
     created_at: datetime = field(default_factory=datetime.now)
 
-    def __post_init__(self):
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-
     def to_dict(self) -> dict:
         """Convertit en dictionnaire."""
         return {
@@ -139,42 +154,53 @@ class Annotation:
             "start_pos": self.start_pos,
             "end_pos": self.end_pos,
             "content": self.content,
-            "created_at": self.created_at.isoformat(),
+            "created_at": isoformat(self, "created_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Annotation":
-        """Crée une instance depuis une ligne de base de données."""
+    def from_row(cls, row) -> "Annotation":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
         return cls(
             id=row["id"],
             source_id=row["source_id"],
-            start_pos=row.get("start_pos"),
-            end_pos=row.get("end_pos"),
+            start_pos=row["start_pos"],
+            end_pos=row["end_pos"],
             content=row["content"],
             created_at=row["created_at"],
         )
 
     def save(self, db) -> "Annotation":
         """Sauvegarde l'annotation dans la base de données."""
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO annotations
-            (id, source_id, start_pos, end_pos, content, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["source_id"],
-                data["start_pos"],
-                data["end_pos"],
-                data["content"],
-                data["created_at"],
-            ),
-        )
-        db.commit()
+        self.save_many(db, [self])
         return self
 
+    @classmethod
+    def save_many(cls, db, annotations: Iterable["Annotation"]) -> list["Annotation"]:
+        """Sauvegarde plusieurs annotations en une seule transaction."""
+        annotations = list(annotations)
+        rows = []
+        for annotation in annotations:
+            rows.append(
+                (
+                    annotation.id,
+                    annotation.source_id,
+                    annotation.start_pos,
+                    annotation.end_pos,
+                    annotation.content,
+                    isoformat(annotation, "created_at"),
+                )
+            )
+        with db:
+            db.executemany(
+                """
+                INSERT OR REPLACE INTO annotations
+                (id, source_id, start_pos, end_pos, content, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return annotations
+
     @classmethod
     def get_by_source(cls, db, source_id: str) -> list["Annotation"]:
         """Récupère les annotations d'une source."""
@@ -182,9 +208,9 @@ class Annotation:
             "SELECT * FROM annotations WHERE source_id = ? ORDER BY start_pos",
             (source_id,),
         )
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+        return [cls.from_row(row) for row in cursor]
 
     def delete(self, db):
         """Supprime l'annotation de la base de données."""
-        db.execute("DELETE FROM annotations WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            db.execute("DELETE FROM annotations WHERE id = ?", (self.id,))
@@ -3,10 +3,53 @@
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-
-
-@dataclass
+from typing import Iterable, Optional
+
+from .timestamps import isoformat, lazy_datetimes
+
+# Requêtes assemblées une fois pour toutes : le texte SQL transmis à SQLite est
+# toujours le même objet, retrouvé directement dans le cache de requêtes
+_GET_ALL_SQL = "SELECT * FROM nodes WHERE parent_id IS ? ORDER BY name, id"
+_GET_ALL_PAGE_SQL = _GET_ALL_SQL + " LIMIT ? OFFSET ?"
+
+_TREE_SQL = """
+    WITH RECURSIVE tree(id) AS (
+        {seed}
+        UNION
+        SELECT n.id FROM nodes n JOIN tree t ON n.parent_id = t.id
+    )
+    SELECT n.*
+    FROM tree t
+    JOIN nodes n ON n.id = t.id
+    ORDER BY n.name
+"""
+_TREE_FROM_ROOTS_SQL = _TREE_SQL.format(
+    seed="SELECT id FROM nodes WHERE parent_id IS NULL"
+)
+_TREE_FROM_NODE_SQL = _TREE_SQL.format(seed="SELECT id FROM nodes WHERE id = ?")
+
+_SUBTREE_CTE = """
+    WITH RECURSIVE subtree(id) AS (
+        SELECT ?
+        UNION
+        SELECT n.id FROM nodes n JOIN subtree t ON n.parent_id = t.id
+    )
+"""
+_SINGLE_NODE_CTE = "WITH subtree(id) AS (SELECT ?)"
+_DELETE_STATEMENTS = (
+    # Supprimer les références de codage
+    "DELETE FROM code_references WHERE node_id IN subtree",
+    # Détacher les mémos liés
+    "UPDATE memos SET linked_node_id = NULL WHERE linked_node_id IN subtree",
+    # Supprimer les nœuds
+    "DELETE FROM nodes WHERE id IN subtree",
+)
+_DELETE_SUBTREE_SQL = tuple(_SUBTREE_CTE + sql for sql in _DELETE_STATEMENTS)
+_DELETE_SINGLE_SQL = tuple(_SINGLE_NODE_CTE + " " + sql for sql in _DELETE_STATEMENTS)
+
+
+@lazy_datetimes("created_at", "modified_at")
+@dataclass(slots=True)
 class Node:
     """Représente un nœud (code) pour l'analyse qualitative."""
 
@@ -22,12 +65,6 @@ class Node:
     reference_count: int = field(default=0, repr=False)
     children: list["Node"] = field(default_factory=list, repr=False)
 
-    def __post_init__(self):
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-        if isinstance(self.modified_at, str):
-            self.modified_at = datetime.fromisoformat(self.modified_at)
-
     def to_dict(self) -> dict:
         """Convertit en dictionnaire."""
         return {
@@ -36,141 +73,168 @@ class Node:
             "description": self.description,
             "color": self.color,
             "parent_id": self.parent_id,
-            "created_at": self.created_at.isoformat(),
-            "modified_at": self.modified_at.isoformat(),
+            "created_at": isoformat(self, "created_at"),
+            "modified_at": isoformat(self, "modified_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Node":
-        """Crée une instance depuis une ligne de base de données."""
-        return cls(
+    def from_row(cls, row) -> "Node":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row).
+
+        La colonne ref_count, si présente, alimente reference_count.
+        """
+        node = cls(
             id=row["id"],
             name=row["name"],
-            description=row.get("description", ""),
-            color=row.get("color", "#3498db"),
-            parent_id=row.get("parent_id"),
+            description=row["description"],
+            color=row["color"],
+            parent_id=row["parent_id"],
             created_at=row["created_at"],
             modified_at=row["modified_at"],
         )
+        if "ref_count" in row.keys():
+            node.reference_count = row["ref_count"]
+        return node
 
     def save(self, db) -> "Node":
         """Sauvegarde le nœud dans la base de données."""
         self.modified_at = datetime.now()
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO nodes
-            (id, name, description, color, parent_id, created_at, modified_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["name"],
-                data["description"],
-                data["color"],
-                data["parent_id"],
-                data["created_at"],
-                data["modified_at"],
-            ),
-        )
-        db.commit()
+        self.save_many(db, [self])
         return self
 
+    @classmethod
+    def save_many(cls, db, nodes: Iterable["Node"]) -> list["Node"]:
+        """Sauvegarde plusieurs nœuds en une seule transaction."""
+        nodes = list(nodes)
+        rows = []
+        for node in nodes:
+            rows.append(
+                (
+                    node.id,
+                    node.name,
+                    node.description,
+                    node.color,
+                    node.parent_id,
+                    isoformat(node, "created_at"),
+                    isoformat(node, "modified_at"),
+                )
+            )
+        with db:
+            # UPSERT : le compteur ref_count, tenu par des triggers, est conservé
+            db.executemany(
+                """
+                INSERT INTO nodes
+                (id, name, description, color, parent_id, created_at, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name,
+                    description = excluded.description,
+                    color = excluded.color,
+                    parent_id = excluded.parent_id,
+                    created_at = excluded.created_at,
+                    modified_at = excluded.modified_at
+                """,
+                rows,
+            )
+        return nodes
+
     @classmethod
     def get(cls, db, node_id: str) -> Optional["Node"]:
         """Récupère un nœud par ID avec son compte de références."""
+        cursor = db.execute("SELECT * FROM nodes WHERE id = ?", (node_id,))
+        row = cursor.fetchone()
+        return cls.from_row(row) if row else None
+
+    @classmethod
+    def get_all(
+        cls,
+        db,
+        parent_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list["Node"]:
+        """Récupère les nœuds d'un parent (les nœuds racines si parent_id est None).
+
+        Le compte de références est lu dans la colonne ref_count, tenue à jour
+        par des triggers : aucune jointure avec code_references. L'index
+        (parent_id, name, id) fournit les nœuds déjà triés, sans tri complet.
+
+        Args:
+            parent_id: ID du parent, ou None pour les nœuds racines
+            limit: Nombre maximal de nœuds retournés (tous si None)
+            offset: Nombre de nœuds à sauter, dans l'ordre des noms
+        """
+        if limit is None:
+            cursor = db.execute(_GET_ALL_SQL, (parent_id,))
+        else:
+            cursor = db.execute(_GET_ALL_PAGE_SQL, (parent_id, limit, offset))
+        return [cls.from_row(row) for row in cursor]
+
+    @classmethod
+    def get_all_after(
+        cls,
+        db,
+        parent_id: Optional[str],
+        last_name: str,
+        limit: int,
+        last_id: str = "",
+    ) -> list["Node"]:
+        """Page suivante des nœuds d'un parent (pagination par clé).
+
+        Reprend après le dernier nœud affiché (last_name, last_id) : l'index
+        est parcouru à partir de cette clé, quel que soit le rang de la page.
+        """
         cursor = db.execute(
             """
-            SELECT n.*, COUNT(cr.id) as ref_count
-            FROM nodes n
-            LEFT JOIN code_references cr ON n.id = cr.node_id
-            WHERE n.id = ?
-            GROUP BY n.id
+            SELECT * FROM nodes
+            WHERE parent_id IS ? AND (name, id) > (?, ?)
+            ORDER BY name, id
+            LIMIT ?
             """,
-            (node_id,),
+            (parent_id, last_name, last_id, limit),
         )
-        row = cursor.fetchone()
-        if row:
-            row_dict = dict(row)
-            ref_count = row_dict.pop("ref_count", 0)
-            node = cls.from_row(row_dict)
-            node.reference_count = ref_count
-            return node
-        return None
+        return [cls.from_row(row) for row in cursor]
 
     @classmethod
-    def get_all(cls, db, parent_id: Optional[str] = None) -> list["Node"]:
-        """Récupère tous les nœuds, optionnellement filtrés par parent.
+    def get_tree(cls, db, root_id: Optional[str] = None) -> list["Node"]:
+        """Récupère l'arbre complet des nœuds, ou le sous-arbre d'un nœud.
 
-        Optimisé avec une seule requête JOIN pour éviter le problème N+1.
+        Une seule requête récursive (CTE) ramène tous les nœuds accessibles
+        depuis les racines avec leur compte de références ; l'arbre est
+        ensuite assemblé en mémoire.
+
+        Args:
+            root_id: Si fourni, retourne [ce nœud] avec ses descendants
         """
-        if parent_id is None:
-            cursor = db.execute(
-                """
-                SELECT n.*, COUNT(cr.id) as ref_count
-                FROM nodes n
-                LEFT JOIN code_references cr ON n.id = cr.node_id
-                WHERE n.parent_id IS NULL
-                GROUP BY n.id
-                ORDER BY n.name
-                """
-            )
+        if root_id is None:
+            cursor = db.execute(_TREE_FROM_ROOTS_SQL)
         else:
-            cursor = db.execute(
-                """
-                SELECT n.*, COUNT(cr.id) as ref_count
-                FROM nodes n
-                LEFT JOIN code_references cr ON n.id = cr.node_id
-                WHERE n.parent_id = ?
-                GROUP BY n.id
-                ORDER BY n.name
-                """,
-                (parent_id,),
-            )
-
-        nodes = []
-        for row in cursor.fetchall():
-            row_dict = dict(row)
-            ref_count = row_dict.pop("ref_count", 0)
-            node = cls.from_row(row_dict)
-            node.reference_count = ref_count
-            nodes.append(node)
-        return nodes
-
-    @classmethod
-    def get_tree(cls, db) -> list["Node"]:
-        """Récupère l'arbre complet des nœuds."""
-        root_nodes = cls.get_all(db, parent_id=None)
-        for node in root_nodes:
-            node.children = cls._get_children_recursive(db, node.id)
+            cursor = db.execute(_TREE_FROM_NODE_SQL, (root_id,))
+
+        nodes = [cls.from_row(row) for row in cursor]
+
+        # Rattacher chaque nœud à son parent (l'ordre par nom est conservé)
+        by_id = {node.id: node for node in nodes}
+        root_nodes = []
+        for node in nodes:
+            if node.parent_id is None or node.id == root_id:
+                root_nodes.append(node)
+            else:
+                by_id[node.parent_id].children.append(node)
         return root_nodes
 
-    @classmethod
-    def _get_children_recursive(cls, db, parent_id: str) -> list["Node"]:
-        """Récupère récursivement les enfants d'un nœud."""
-        children = cls.get_all(db, parent_id=parent_id)
-        for child in children:
-            child.children = cls._get_children_recursive(db, child.id)
-        return children
-
     def delete(self, db, recursive: bool = True):
-        """Supprime le nœud de la base de données."""
-        if recursive:
-            # Supprimer les enfants récursivement
-            children = Node.get_all(db, parent_id=self.id)
-            for child in children:
-                child.delete(db, recursive=True)
-
-        # Supprimer les références de codage
-        db.execute("DELETE FROM code_references WHERE node_id = ?", (self.id,))
-        # Supprimer les mémos liés
-        db.execute(
-            "UPDATE memos SET linked_node_id = NULL WHERE linked_node_id = ?",
-            (self.id,),
-        )
-        # Supprimer le nœud
-        db.execute("DELETE FROM nodes WHERE id = ?", (self.id,))
-        db.commit()
+        """Supprime le nœud (et par défaut ses descendants) de la base de données.
+
+        Le sous-arbre est parcouru par SQLite (CTE récursive) : trois requêtes
+        et un seul commit, quelle que soit la taille de l'arbre.
+        """
+        statements = _DELETE_SUBTREE_SQL if recursive else _DELETE_SINGLE_SQL
+        params = (self.id,)
+
+        with db:
+            for sql in statements:
+                db.execute(sql, params)
 
     def get_references(self, db) -> list:
         """Récupère toutes les références de codage pour ce nœud."""
@@ -1,6 +1,8 @@
 """Modèle de projet QDA."""
 
 import json
+import locale
+import os
 import sqlite3
 import uuid
 from dataclasses import dataclass, field
@@ -8,6 +10,197 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Sérialisation de project.json : orjson (C) si disponible, sinon json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Réglages SQLite appliqués à l'ouverture de la connexion ; chacun peut être
+# remplacé par projet via settings["sqlite_pragmas"]
+SQLITE_PRAGMAS = {
+    # Journal WAL : un commit n'attend plus qu'une écriture séquentielle,
+    # sans fsync du fichier principal à chaque transaction
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    # Lecture de la base par projection mémoire (256 Mio) et cache de 64 Mio
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+}
+
+# Requêtes compilées gardées par connexion (sqlite3 les retrouve par leur texte
+# SQL) ; le défaut de 128 est inférieur au nombre de requêtes de l'application
+SQLITE_STATEMENT_CACHE_SIZE = 512
+
+# Colonnes ajoutées au schéma après sa première version (table, colonne, type),
+# créées à l'ouverture des projets existants
+ADDED_COLUMNS = [
+    ("case_attributes", "value_kind", "TEXT"),
+    ("case_attributes", "value_text", "TEXT"),
+    ("case_attributes", "value_num", "REAL"),
+    ("nodes", "ref_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("sources", "ref_count", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+# Remplissage des colonnes ajoutées dont la valeur se déduit des données
+# existantes, exécuté juste après l'ajout de la colonne
+COLUMN_BACKFILLS = {
+    ("nodes", "ref_count"): """
+        UPDATE nodes SET ref_count = (
+            SELECT COUNT(*) FROM code_references WHERE node_id = nodes.id
+        )
+    """,
+    ("sources", "ref_count"): """
+        UPDATE sources SET ref_count = (
+            SELECT COUNT(*) FROM code_references WHERE source_id = sources.id
+        )
+    """,
+}
+
+# Compteurs de références des nœuds et des sources, tenus à jour par des
+# triggers sur code_references
+REF_COUNT_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS code_refs_ai AFTER INSERT ON code_references BEGIN
+    UPDATE nodes SET ref_count = ref_count + 1 WHERE id = new.node_id;
+    UPDATE sources SET ref_count = ref_count + 1 WHERE id = new.source_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS code_refs_ad AFTER DELETE ON code_references BEGIN
+    UPDATE nodes SET ref_count = ref_count - 1 WHERE id = old.node_id;
+    UPDATE sources SET ref_count = ref_count - 1 WHERE id = old.source_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS code_refs_au
+AFTER UPDATE OF node_id, source_id ON code_references BEGIN
+    UPDATE nodes SET ref_count = ref_count - 1 WHERE id = old.node_id;
+    UPDATE sources SET ref_count = ref_count - 1 WHERE id = old.source_id;
+    UPDATE nodes SET ref_count = ref_count + 1 WHERE id = new.node_id;
+    UPDATE sources SET ref_count = ref_count + 1 WHERE id = new.source_id;
+END;
+"""
+
+# Colonnes des tables indexées par un index FTS en contenu externe. La clé
+# entière docid (alias du rowid) sert de content_rowid : VACUUM peut
+# renuméroter un rowid implicite, jamais une colonne INTEGER PRIMARY KEY
+FTS_CONTENT_TABLES = {
+    "sources": """(
+        docid INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        file_path TEXT,
+        content TEXT,
+        metadata TEXT,
+        created_at TEXT NOT NULL,
+        modified_at TEXT NOT NULL,
+        ref_count INTEGER NOT NULL DEFAULT 0
+    )""",
+    "memos": """(
+        docid INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        title TEXT NOT NULL,
+        content TEXT,
+        linked_source_id TEXT,
+        linked_node_id TEXT,
+        created_at TEXT NOT NULL,
+        modified_at TEXT NOT NULL,
+        FOREIGN KEY (linked_source_id) REFERENCES sources(id),
+        FOREIGN KEY (linked_node_id) REFERENCES nodes(id)
+    )""",
+}
+
+# Index FTS des mémos en contenu externe : le texte n'est stocké que dans la
+# table memos, l'index est tenu à jour par des triggers
+MEMOS_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5(
+    id UNINDEXED, title, content,
+    content='memos', content_rowid='docid', tokenize='unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS memos_ai AFTER INSERT ON memos BEGIN
+    INSERT INTO memos_fts (rowid, id, title, content)
+    VALUES (new.docid, new.id, new.title, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS memos_ad AFTER DELETE ON memos BEGIN
+    INSERT INTO memos_fts (memos_fts, rowid, id, title, content)
+    VALUES ('delete', old.docid, old.id, old.title, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS memos_au AFTER UPDATE OF id, title, content ON memos
+BEGIN
+    INSERT INTO memos_fts (memos_fts, rowid, id, title, content)
+    VALUES ('delete', old.docid, old.id, old.title, old.content);
+    INSERT INTO memos_fts (rowid, id, title, content)
+    VALUES (new.docid, new.id, new.title, new.content);
+END;
+"""
+
+# Index FTS des sources, en contenu externe comme celui des mémos : le texte
+# des sources, parfois très long, n'est plus écrit deux fois
+SOURCES_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS sources_fts USING fts5(
+    id UNINDEXED, name, content,
+    content='sources', content_rowid='docid', tokenize='unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS sources_ai AFTER INSERT ON sources BEGIN
+    INSERT INTO sources_fts (rowid, id, name, content)
+    VALUES (new.docid, new.id, new.name, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sources_ad AFTER DELETE ON sources BEGIN
+    INSERT INTO sources_fts (sources_fts, rowid, id, name, content)
+    VALUES ('delete', old.docid, old.id, old.name, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS sources_au AFTER UPDATE OF id, name, content ON sources
+BEGIN
+    INSERT INTO sources_fts (sources_fts, rowid, id, name, content)
+    VALUES ('delete', old.docid, old.id, old.name, old.content);
+    INSERT INTO sources_fts (rowid, id, name, content)
+    VALUES (new.docid, new.id, new.name, new.content);
+END;
+"""
+
+# Index FTS en contenu externe, par table indexée
+EXTERNAL_FTS_SCHEMAS = {
+    "memos": MEMOS_FTS_SCHEMA,
+    "sources": SOURCES_FTS_SCHEMA,
+}
+
+
+def _dump_metadata(metadata: dict) -> bytes:
+    """Sérialise les métadonnées du projet en JSON indenté (UTF-8)."""
+    if orjson is not None:
+        return orjson.dumps(
+            metadata,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(metadata, indent=2, ensure_ascii=False, default=str).encode(
+        "utf-8"
+    )
+
+
+def _load_metadata(raw: bytes) -> dict:
+    """Lit les métadonnées du projet.
+
+    Les fichiers écrits avant le passage à l'UTF-8 explicite peuvent être dans
+    l'encodage local (write_text sans encodage) : ils sont relus comme avant.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        text = raw.decode(locale.getpreferredencoding(False))
+    return json.loads(text)
+
 
 @dataclass
 class Project:
@@ -43,12 +236,41 @@ class Project:
 
     @property
     def db(self) -> sqlite3.Connection:
-        """Connexion à la base de données."""
+        """Connexion à la base de données du thread de l'interface.
+
+        Une connexion SQLite ne se partage pas entre threads : les workers
+        ouvrent la leur avec connect().
+        """
         if self._db_connection is None:
-            self._db_connection = sqlite3.connect(str(self.db_path))
-            self._db_connection.row_factory = sqlite3.Row
+            self._db_connection = self.connect()
         return self._db_connection
 
+    def connect(self) -> sqlite3.Connection:
+        """Ouvre une nouvelle connexion à la base, avec les réglages du projet.
+
+        Le journal WAL permet à une connexion d'écrire pendant que les autres
+        lisent ; l'appelant ferme la connexion quand il n'en a plus besoin.
+        """
+        connection = sqlite3.connect(
+            str(self.db_path), cached_statements=SQLITE_STATEMENT_CACHE_SIZE
+        )
+        connection.row_factory = sqlite3.Row
+        self._apply_pragmas(connection)
+        return connection
+
+    def _apply_pragmas(self, connection: sqlite3.Connection):
+        """Applique les réglages SQLite (valeurs par défaut et du projet)."""
+        pragmas = dict(SQLITE_PRAGMAS)
+        overrides = self.settings.get("sqlite_pragmas") or {}
+        # Seuls les réglages connus sont modifiables, avec des valeurs simples
+        pragmas.update(
+            (name, value)
+            for name, value in overrides.items()
+            if name in SQLITE_PRAGMAS and str(value).lstrip("-").isalnum()
+        )
+        for name, value in pragmas.items():
+            connection.execute(f"PRAGMA {name}={value}")
+
     def create(self) -> "Project":
         """Crée un nouveau projet sur le disque."""
         self.path.mkdir(parents=True, exist_ok=True)
@@ -61,18 +283,6 @@ class Project:
     def _init_database(self):
         """Initialise le schéma de la base de données."""
         schema = """
-        -- Sources de données
-        CREATE TABLE IF NOT EXISTS sources (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            type TEXT NOT NULL,
-            file_path TEXT,
-            content TEXT,
-            metadata TEXT,
-            created_at TEXT NOT NULL,
-            modified_at TEXT NOT NULL
-        );
-
         -- Nœuds (codes)
         CREATE TABLE IF NOT EXISTS nodes (
             id TEXT PRIMARY KEY,
@@ -82,6 +292,7 @@ class Project:
             parent_id TEXT,
             created_at TEXT NOT NULL,
             modified_at TEXT NOT NULL,
+            ref_count INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY (parent_id) REFERENCES nodes(id)
         );
 
@@ -98,19 +309,6 @@ class Project:
             FOREIGN KEY (source_id) REFERENCES sources(id)
         );
 
-        -- Mémos
-        CREATE TABLE IF NOT EXISTS memos (
-            id TEXT PRIMARY KEY,
-            title TEXT NOT NULL,
-            content TEXT,
-            linked_source_id TEXT,
-            linked_node_id TEXT,
-            created_at TEXT NOT NULL,
-            modified_at TEXT NOT NULL,
-            FOREIGN KEY (linked_source_id) REFERENCES sources(id),
-            FOREIGN KEY (linked_node_id) REFERENCES nodes(id)
-        );
-
         -- Annotations
         CREATE TABLE IF NOT EXISTS annotations (
             id TEXT PRIMARY KEY,
@@ -156,11 +354,23 @@ class Project:
             case_id TEXT NOT NULL,
             attribute_id TEXT NOT NULL,
             value TEXT,
+            value_kind TEXT,
+            value_text TEXT,
+            value_num REAL,
             PRIMARY KEY (case_id, attribute_id),
             FOREIGN KEY (case_id) REFERENCES cases(id),
             FOREIGN KEY (attribute_id) REFERENCES attributes(id)
         );
 
+        -- Segments horodatés des transcriptions audio/vidéo
+        CREATE TABLE IF NOT EXISTS transcript_segments (
+            source_id TEXT NOT NULL,
+            start_time REAL NOT NULL,
+            end_time REAL NOT NULL,
+            text TEXT,
+            FOREIGN KEY (source_id) REFERENCES sources(id)
+        );
+
         -- Liens entre éléments
         CREATE TABLE IF NOT EXISTS links (
             id TEXT PRIMARY KEY,
@@ -175,24 +385,114 @@ class Project:
 
         -- Index pour les recherches
         CREATE INDEX IF NOT EXISTS idx_sources_type ON sources(type);
-        CREATE INDEX IF NOT EXISTS idx_nodes_parent ON nodes(parent_id);
-        CREATE INDEX IF NOT EXISTS idx_code_refs_node ON code_references(node_id);
-        CREATE INDEX IF NOT EXISTS idx_code_refs_source ON code_references(source_id);
-        CREATE INDEX IF NOT EXISTS idx_memos_source ON memos(linked_source_id);
-        CREATE INDEX IF NOT EXISTS idx_memos_node ON memos(linked_node_id);
-
-        -- Table FTS pour la recherche full-text
-        CREATE VIRTUAL TABLE IF NOT EXISTS sources_fts USING fts5(
-            id, name, content, tokenize='unicode61'
-        );
-
-        CREATE VIRTUAL TABLE IF NOT EXISTS memos_fts USING fts5(
-            id, title, content, tokenize='unicode61'
-        );
+        -- Enfants d'un nœud déjà triés par nom (remplace l'index sur parent_id)
+        DROP INDEX IF EXISTS idx_nodes_parent;
+        CREATE INDEX IF NOT EXISTS idx_nodes_parent_name ON nodes(parent_id, name, id);
+        -- Index composites : filtre source + nœud et tri par position en un
+        -- seul parcours ; ils remplacent les index à une colonne node_id et
+        -- source_id, qui en sont des préfixes
+        DROP INDEX IF EXISTS idx_code_refs_node;
+        DROP INDEX IF EXISTS idx_code_refs_source;
+        CREATE INDEX IF NOT EXISTS idx_code_refs_src_node_pos
+            ON code_references(source_id, node_id, start_pos);
+        CREATE INDEX IF NOT EXISTS idx_code_refs_node_src_pos
+            ON code_references(node_id, source_id, start_pos);
+        -- Mémos déjà triés par date de modification (les dates ISO se trient
+        -- comme des chaînes) ; les index composites remplacent les index sur
+        -- linked_source_id et linked_node_id, qui en sont des préfixes
+        DROP INDEX IF EXISTS idx_memos_source;
+        DROP INDEX IF EXISTS idx_memos_node;
+        CREATE INDEX IF NOT EXISTS idx_memos_modified ON memos(modified_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_memos_source_modified
+            ON memos(linked_source_id, modified_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_memos_node_modified
+            ON memos(linked_node_id, modified_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_transcript_segments_source
+            ON transcript_segments(source_id, start_time);
+        CREATE INDEX IF NOT EXISTS idx_links_source
+            ON links(source_type, source_id, target_type, target_id);
+        CREATE INDEX IF NOT EXISTS idx_links_target
+            ON links(target_type, target_id, source_type, source_id);
         """
+        for table, columns in FTS_CONTENT_TABLES.items():
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} {columns}")
         self.db.executescript(schema)
+        self._migrate_database()
+        for fts_schema in EXTERNAL_FTS_SCHEMAS.values():
+            self.db.executescript(fts_schema)
+        self.db.executescript(REF_COUNT_TRIGGERS)
         self.db.commit()
 
+    def _migrate_database(self):
+        """Ajoute aux tables existantes les colonnes apparues depuis leur création."""
+        for table, column, column_type in ADDED_COLUMNS:
+            existing = {
+                row["name"] for row in self.db.execute(f"PRAGMA table_info({table})")
+            }
+            if column not in existing:
+                self.db.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} {column_type}"
+                )
+                backfill = COLUMN_BACKFILLS.get((table, column))
+                if backfill:
+                    self.db.execute(backfill)
+
+        # Tables indexées créées sans colonne docid : leur rowid implicite
+        # n'est pas une clé stable pour l'index FTS
+        for table in FTS_CONTENT_TABLES:
+            existing = [
+                row["name"] for row in self.db.execute(f"PRAGMA table_info({table})")
+            ]
+            if "docid" not in existing:
+                self._add_docid_column(table, existing)
+
+        # Anciens index FTS, qui recopiaient le contenu indexé ou suivaient le
+        # rowid implicite : ils sont remplacés par les index en contenu externe
+        # sur docid, reconstruits depuis la table
+        for table, fts_schema in EXTERNAL_FTS_SCHEMAS.items():
+            row = self.db.execute(
+                "SELECT sql FROM sqlite_master WHERE name = ?", (f"{table}_fts",)
+            ).fetchone()
+            if row and "content_rowid='docid'" not in row["sql"]:
+                self.db.execute(f"DROP TABLE {table}_fts")
+                self.db.executescript(fts_schema)
+                self.db.execute(
+                    f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')"
+                )
+
+    def _add_docid_column(self, table: str, columns: list[str]):
+        """Recrée une table avec sa colonne docid INTEGER PRIMARY KEY.
+
+        SQLite ne sait pas ajouter une clé primaire à une table existante : la
+        table est copiée dans une nouvelle, qui garde les rowid actuels comme
+        docid, puis ses index sont recréés. Les triggers de la table sont
+        supprimés avec elle et recréés avec les index FTS.
+        """
+        indexes = [
+            row["sql"]
+            for row in self.db.execute(
+                "SELECT sql FROM sqlite_master"
+                " WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            )
+        ]
+        column_list = ", ".join(columns)
+        self.db.execute(f"CREATE TABLE {table}_new {FTS_CONTENT_TABLES[table]}")
+        self.db.execute(
+            f"INSERT INTO {table}_new (docid, {column_list})"
+            f" SELECT rowid, {column_list} FROM {table}"
+        )
+        self.db.execute(f"DROP TABLE {table}")
+        # Renommage sans réécriture du schéma : les triggers des autres tables
+        # qui nomment déjà la table restent valides
+        self.db.execute("PRAGMA legacy_alter_table = ON")
+        try:
+            self.db.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        finally:
+            self.db.execute("PRAGMA legacy_alter_table = OFF")
+        for index_sql in indexes:
+            self.db.execute(index_sql)
+
     def _save_metadata(self):
         """Sauvegarde les métadonnées du projet."""
         metadata = {
@@ -205,7 +505,11 @@ class Project:
             "version": "1.0",
         }
         meta_path = self.path / "project.json"
-        meta_path.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
+        # Écriture dans un fichier temporaire puis remplacement atomique : un
+        # arrêt en cours d'écriture ne laisse pas de project.json tronqué
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(_dump_metadata(metadata))
+        os.replace(tmp_path, meta_path)
 
     def save(self):
         """Sauvegarde le projet."""
@@ -224,7 +528,7 @@ class Project:
             raise FileNotFoundError(f"Projet non trouvé: {path}")
 
         try:
-            metadata = json.loads(meta_path.read_text())
+            metadata = _load_metadata(meta_path.read_bytes())
         except json.JSONDecodeError as e:
             raise ValueError(f"Fichier project.json corrompu: {e}")
 
@@ -244,7 +548,7 @@ class Project:
         if metadata.get("settings") is not None and not isinstance(metadata.get("settings"), dict):
             raise ValueError("Le champ 'settings' doit être un dictionnaire")
 
-        return cls(
+        project = cls(
             id=metadata["id"],
             name=metadata["name"],
             path=path,
@@ -253,6 +557,9 @@ class Project:
             modified_at=metadata["modified_at"],
             settings=metadata.get("settings", {}),
         )
+        # Ajoute aux anciens projets les tables et index apparus depuis
+        project._init_database()
+        return project
 
     def close(self):
         """Ferme le projet et libère les ressources."""
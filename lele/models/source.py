@@ -5,7 +5,17 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+from .fts import fts_match
+from .timestamps import isoformat, lazy_datetimes
+from .transcript import TranscriptSegment
+
+# Sérialisation des métadonnées : orjson (C) si disponible, sinon json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class SourceType(Enum):
@@ -27,53 +37,195 @@ class SourceType(Enum):
     @classmethod
     def from_extension(cls, ext: str) -> "SourceType":
         """Détermine le type depuis l'extension."""
-        ext = ext.lower().lstrip(".")
-        mapping = {
-            # Texte
-            "txt": cls.TEXT,
-            "md": cls.TEXT,
-            "rtf": cls.TEXT,
-            # PDF
-            "pdf": cls.PDF,
-            # Word
-            "doc": cls.WORD,
-            "docx": cls.WORD,
-            "odt": cls.WORD,
-            # Audio
-            "mp3": cls.AUDIO,
-            "wav": cls.AUDIO,
-            "m4a": cls.AUDIO,
-            "flac": cls.AUDIO,
-            "ogg": cls.AUDIO,
-            "webm": cls.AUDIO,
-            # Vidéo
-            "mp4": cls.VIDEO,
-            "avi": cls.VIDEO,
-            "mov": cls.VIDEO,
-            "mkv": cls.VIDEO,
-            "wmv": cls.VIDEO,
-            # Image
-            "jpg": cls.IMAGE,
-            "jpeg": cls.IMAGE,
-            "png": cls.IMAGE,
-            "gif": cls.IMAGE,
-            "bmp": cls.IMAGE,
-            "tiff": cls.IMAGE,
-            "webp": cls.IMAGE,
-            # Tableur
-            "xlsx": cls.SPREADSHEET,
-            "xls": cls.SPREADSHEET,
-            "csv": cls.SPREADSHEET,
-            "ods": cls.SPREADSHEET,
-            # Bibliographie
-            "ris": cls.BIBLIOGRAPHY,
-            "bib": cls.BIBLIOGRAPHY,
-            "enw": cls.BIBLIOGRAPHY,
-            "xml": cls.BIBLIOGRAPHY,
-        }
-        return mapping.get(ext, cls.OTHER)
+        return _EXT_MAP.get(ext.lower().lstrip("."), cls.OTHER)
+
+
+# Type de source par extension de fichier, construit une seule fois
+_EXT_MAP = {
+    # Texte
+    "txt": SourceType.TEXT,
+    "md": SourceType.TEXT,
+    "rtf": SourceType.TEXT,
+    # PDF
+    "pdf": SourceType.PDF,
+    # Word
+    "doc": SourceType.WORD,
+    "docx": SourceType.WORD,
+    "odt": SourceType.WORD,
+    # Audio
+    "mp3": SourceType.AUDIO,
+    "wav": SourceType.AUDIO,
+    "m4a": SourceType.AUDIO,
+    "flac": SourceType.AUDIO,
+    "ogg": SourceType.AUDIO,
+    "webm": SourceType.AUDIO,
+    # Vidéo
+    "mp4": SourceType.VIDEO,
+    "avi": SourceType.VIDEO,
+    "mov": SourceType.VIDEO,
+    "mkv": SourceType.VIDEO,
+    "wmv": SourceType.VIDEO,
+    # Image
+    "jpg": SourceType.IMAGE,
+    "jpeg": SourceType.IMAGE,
+    "png": SourceType.IMAGE,
+    "gif": SourceType.IMAGE,
+    "bmp": SourceType.IMAGE,
+    "tiff": SourceType.IMAGE,
+    "webp": SourceType.IMAGE,
+    # Tableur
+    "xlsx": SourceType.SPREADSHEET,
+    "xls": SourceType.SPREADSHEET,
+    "csv": SourceType.SPREADSHEET,
+    "ods": SourceType.SPREADSHEET,
+    # Bibliographie
+    "ris": SourceType.BIBLIOGRAPHY,
+    "bib": SourceType.BIBLIOGRAPHY,
+    "enw": SourceType.BIBLIOGRAPHY,
+    "xml": SourceType.BIBLIOGRAPHY,
+}
+
+
+def _dump_metadata(metadata: dict) -> str:
+    """Sérialise les métadonnées d'une source pour la colonne TEXT metadata."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata)
+
+
+def _load_metadata(text: Optional[str]) -> dict:
+    """Relit les métadonnées d'une source (vide si la colonne est vide)."""
+    if not text:
+        return {}
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _source_row(source: "Source") -> tuple:
+    """Valeurs d'une source dans l'ordre des colonnes de l'UPSERT."""
+    return (
+        source.id,
+        source.name,
+        source.type.value,
+        source.file_path,
+        source.content,
+        _dump_metadata(source.metadata),
+        isoformat(source, "created_at"),
+        isoformat(source, "modified_at"),
+    )
+
 
+def _json_batches(rows: list[tuple]) -> Iterator[list[tuple]]:
+    """Découpe les lignes en lots dont le texte reste sous BULK_JSON_MAX_CHARS."""
+    batch, size = [], 0
+    for row in rows:
+        row_size = sum(len(value) for value in row if isinstance(value, str))
+        if batch and size + row_size > BULK_JSON_MAX_CHARS:
+            yield batch
+            batch, size = [], 0
+        batch.append(row)
+        size += row_size
+    if batch:
+        yield batch
+
+
+def _dump_rows(rows: list[tuple]) -> str:
+    """Sérialise un lot de lignes en un tableau JSON pour json_each."""
+    if orjson is not None:
+        return orjson.dumps(rows).decode()
+    return json.dumps(rows, ensure_ascii=False)
+
+
+# Requêtes de la table sources, assemblées une fois pour toutes : le même texte
+# SQL est retrouvé à chaque appel dans le cache de requêtes de la connexion
+# UPSERT : le compteur ref_count et l'index FTS sont tenus par des triggers
+# (l'index ne recopie pas le contenu des sources)
+_UPSERT_CONFLICT = """
+    ON CONFLICT (id) DO UPDATE SET
+        name = excluded.name,
+        type = excluded.type,
+        file_path = excluded.file_path,
+        content = excluded.content,
+        metadata = excluded.metadata,
+        created_at = excluded.created_at,
+        modified_at = excluded.modified_at
+"""
+_UPSERT_SQL = (
+    """
+    INSERT INTO sources
+    (id, name, type, file_path, content, metadata, created_at, modified_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    + _UPSERT_CONFLICT
+)
+# Même UPSERT pour tout un lot passé en un seul tableau JSON de lignes : une
+# seule requête au lieu d'une exécution par source (« WHERE true » lève
+# l'ambiguïté entre ON CONFLICT et une jointure)
+_BULK_UPSERT_SQL = (
+    """
+    INSERT INTO sources
+    (id, name, type, file_path, content, metadata, created_at, modified_at)
+    SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'),
+           json_extract(value, '$[2]'), json_extract(value, '$[3]'),
+           json_extract(value, '$[4]'), json_extract(value, '$[5]'),
+           json_extract(value, '$[6]'), json_extract(value, '$[7]')
+    FROM json_each(?) WHERE true
+    """
+    + _UPSERT_CONFLICT
+)
+_GET_SQL = "SELECT * FROM sources WHERE id = ?"
+_ALL_SQL = "SELECT * FROM sources ORDER BY name"
+_ALL_BY_TYPE_SQL = "SELECT * FROM sources WHERE type = ? ORDER BY name"
+_COUNT_SQL = "SELECT COUNT(*) FROM sources"
+_COUNT_BY_TYPE_SQL = "SELECT COUNT(*) FROM sources WHERE type = ?"
+# Suppression d'une source et des données qui la référencent
+_DELETE_SQL = (
+    "DELETE FROM code_references WHERE source_id = ?",
+    "DELETE FROM annotations WHERE source_id = ?",
+    "DELETE FROM transcript_segments WHERE source_id = ?",
+    "DELETE FROM sources WHERE id = ?",
+)
+
+# Volume de texte maximal d'un tableau JSON passé à bulk_save_json : bien en
+# deçà de SQLITE_MAX_LENGTH (1 Go par défaut, souvent moins dans les builds
+# embarqués), même après échappement JSON
+BULK_JSON_MAX_CHARS = 8_000_000
+
+# Colonnes des vues résumées : ni content ni metadata, souvent volumineux.
+# LIMIT -1 signifie « sans limite » pour SQLite
+_SUMMARY_SELECT = """
+    SELECT id, name, type, ref_count, created_at, modified_at FROM sources
+"""
+_SUMMARIES_SQL = _SUMMARY_SELECT + "ORDER BY name, id LIMIT ? OFFSET ?"
+_SUMMARIES_BY_TYPE_SQL = (
+    _SUMMARY_SELECT + "WHERE type = ? ORDER BY name, id LIMIT ? OFFSET ?"
+)
+
+# Recherche plein texte : le rowid de l'index en contenu externe est le docid
+# de sources
+_SEARCH_SQL = """
+    SELECT s.*
+    FROM sources_fts f
+    JOIN sources s ON s.docid = f.rowid
+    WHERE sources_fts MATCH ?
+    ORDER BY f.rank
+    LIMIT ?
+"""
+
+
+class SourceSummary(NamedTuple):
+    """Vue légère d'une source pour l'affichage en liste (sans contenu)."""
+
+    id: str
+    name: str
+    type: SourceType
+    ref_count: int
+    created_at: str
+    modified_at: str
 
+
+@lazy_datetimes("created_at", "modified_at")
 @dataclass
 class Source:
     """Représente une source de données importée."""
@@ -87,13 +239,13 @@ class Source:
     created_at: datetime = field(default_factory=datetime.now)
     modified_at: datetime = field(default_factory=datetime.now)
 
+    # Champs non persistés dans la table sources : segments de transcription à
+    # enregistrer dans transcript_segments lors de la sauvegarde
+    transcript_segments: list[dict] = field(default_factory=list, repr=False)
+
     def __post_init__(self):
         if isinstance(self.type, str):
             self.type = SourceType(self.type)
-        if isinstance(self.created_at, str):
-            self.created_at = datetime.fromisoformat(self.created_at)
-        if isinstance(self.modified_at, str):
-            self.modified_at = datetime.fromisoformat(self.modified_at)
 
     def to_dict(self) -> dict:
         """Convertit en dictionnaire pour la sérialisation."""
@@ -103,17 +255,17 @@ class Source:
             "type": self.type.value,
             "file_path": self.file_path,
             "content": self.content,
-            "metadata": json.dumps(self.metadata),
-            "created_at": self.created_at.isoformat(),
-            "modified_at": self.modified_at.isoformat(),
+            "metadata": _dump_metadata(self.metadata),
+            "created_at": isoformat(self, "created_at"),
+            "modified_at": isoformat(self, "modified_at"),
         }
 
     @classmethod
-    def from_row(cls, row: dict) -> "Source":
-        """Crée une instance depuis une ligne de base de données."""
+    def from_row(cls, row) -> "Source":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
         metadata = row["metadata"]
         if isinstance(metadata, str):
-            metadata = json.loads(metadata) if metadata else {}
+            metadata = _load_metadata(metadata)
         return cls(
             id=row["id"],
             name=row["name"],
@@ -127,56 +279,117 @@ class Source:
 
     def save(self, db) -> "Source":
         """Sauvegarde la source dans la base de données."""
-        data = self.to_dict()
-        db.execute(
-            """
-            INSERT OR REPLACE INTO sources
-            (id, name, type, file_path, content, metadata, created_at, modified_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                data["id"],
-                data["name"],
-                data["type"],
-                data["file_path"],
-                data["content"],
-                data["metadata"],
-                data["created_at"],
-                data["modified_at"],
-            ),
-        )
-        # Mettre à jour l'index FTS
-        db.execute("DELETE FROM sources_fts WHERE id = ?", (self.id,))
-        db.execute(
-            "INSERT INTO sources_fts (id, name, content) VALUES (?, ?, ?)",
-            (self.id, self.name, self.content or ""),
-        )
-        db.commit()
+        self.save_many(db, [self])
         return self
 
+    @classmethod
+    def save_many(cls, db, sources: Iterable["Source"]) -> list["Source"]:
+        """Sauvegarde plusieurs sources et leurs segments en une seule transaction."""
+        sources = list(sources)
+        with db:
+            db.executemany(_UPSERT_SQL, [_source_row(source) for source in sources])
+            cls._write_transcripts(db, sources)
+        return sources
+
+    @classmethod
+    def bulk_save_json(cls, db, sources: Iterable["Source"]) -> list["Source"]:
+        """Sauvegarde un grand lot de sources par tableaux JSON.
+
+        Les lignes sont passées à SQLite sous forme de tableaux JSON lus par
+        json_each, découpés pour ne pas dépasser BULK_JSON_MAX_CHARS. À
+        appeler explicitement : save_many reste sur executemany, json_extract
+        relisant chaque élément pour chaque colonne.
+        """
+        sources = list(sources)
+        rows = [_source_row(source) for source in sources]
+        with db:
+            for batch in _json_batches(rows):
+                db.execute(_BULK_UPSERT_SQL, (_dump_rows(batch),))
+            cls._write_transcripts(db, sources)
+        return sources
+
+    @staticmethod
+    def _write_transcripts(db, sources: list["Source"]):
+        """Enregistre les segments joints aux sources, dans la transaction en cours."""
+        for source in sources:
+            if source.transcript_segments:
+                TranscriptSegment.write_many(db, source.id, source.transcript_segments)
+
     @classmethod
     def get(cls, db, source_id: str) -> Optional["Source"]:
         """Récupère une source par ID."""
-        cursor = db.execute("SELECT * FROM sources WHERE id = ?", (source_id,))
+        cursor = db.execute(_GET_SQL, (source_id,))
         row = cursor.fetchone()
-        return cls.from_row(dict(row)) if row else None
+        return cls.from_row(row) if row else None
 
     @classmethod
     def get_all(cls, db, source_type: Optional[SourceType] = None) -> list["Source"]:
         """Récupère toutes les sources, optionnellement filtrées par type."""
+        return list(cls.iter_all(db, source_type))
+
+    @classmethod
+    def iter_all(
+        cls, db, source_type: Optional[SourceType] = None
+    ) -> Iterator["Source"]:
+        """Parcourt les sources une à une, sans charger tous les contenus."""
+        if source_type:
+            cursor = db.execute(_ALL_BY_TYPE_SQL, (source_type.value,))
+        else:
+            cursor = db.execute(_ALL_SQL)
+        for row in cursor:
+            yield cls.from_row(row)
+
+    @classmethod
+    def search(cls, db, query: str, limit: int = 100) -> list["Source"]:
+        """Recherche plein texte dans les sources, les plus pertinentes d'abord.
+
+        Le classement suit le score bm25 de FTS5. La recherche passe par
+        l'index sources_fts, joint à sources par docid : aucun parcours du
+        contenu des sources.
+        """
+        if not query.strip():
+            return []
+        return [cls.from_row(row) for row in fts_match(db, _SEARCH_SQL, query, limit)]
+
+    @staticmethod
+    def list_summaries(
+        db,
+        source_type: Optional[SourceType] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[SourceSummary]:
+        """Résumés des sources triés par nom, sans charger contenus ni métadonnées.
+
+        Args:
+            source_type: Type de sources à inclure (toutes si None)
+            limit: Nombre maximal de sources retournées (toutes si None)
+            offset: Nombre de sources à sauter, dans l'ordre des noms
+        """
+        limit = -1 if limit is None else limit
         if source_type:
             cursor = db.execute(
-                "SELECT * FROM sources WHERE type = ? ORDER BY name",
-                (source_type.value,),
+                _SUMMARIES_BY_TYPE_SQL, (source_type.value, limit, offset)
+            )
+        else:
+            cursor = db.execute(_SUMMARIES_SQL, (limit, offset))
+        return [
+            SourceSummary(
+                row[0], row[1], SourceType(row[2]), row[3], row[4], row[5]
             )
+            for row in cursor
+        ]
+
+    @staticmethod
+    def count(db, source_type: Optional[SourceType] = None) -> int:
+        """Nombre de sources, optionnellement d'un type donné."""
+        if source_type:
+            cursor = db.execute(_COUNT_BY_TYPE_SQL, (source_type.value,))
         else:
-            cursor = db.execute("SELECT * FROM sources ORDER BY name")
-        return [cls.from_row(dict(row)) for row in cursor.fetchall()]
+            cursor = db.execute(_COUNT_SQL)
+        return cursor.fetchone()[0]
 
     def delete(self, db):
         """Supprime la source de la base de données."""
-        db.execute("DELETE FROM sources_fts WHERE id = ?", (self.id,))
-        db.execute("DELETE FROM code_references WHERE source_id = ?", (self.id,))
-        db.execute("DELETE FROM annotations WHERE source_id = ?", (self.id,))
-        db.execute("DELETE FROM sources WHERE id = ?", (self.id,))
-        db.commit()
+        with db:
+            for sql in _DELETE_SQL:
+                db.execute(sql, (self.id,))
@@ -0,0 +1,86 @@
+"""Horodatages des modèles, analysés seulement à la première lecture.
+
+Les lignes chargées depuis la base portent leurs dates sous forme de chaînes
+ISO. Plutôt que d'appeler datetime.fromisoformat() pour chaque ligne, la
+chaîne est conservée telle quelle et convertie lors du premier accès à
+l'attribut ; to_dict() la renvoie alors sans la reformater.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from types import MemberDescriptorType
+
+# Nombre de chaînes ISO distinctes gardées en cache (les imports par lot
+# produisent souvent des horodatages identiques)
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_dt(value: str) -> datetime:
+    """Analyse une date ISO (les datetime étant immuables, le partage est sûr)."""
+    return datetime.fromisoformat(value)
+
+
+class LazyDatetime:
+    """Descripteur datetime qui accepte une chaîne ISO et l'analyse à la lecture.
+
+    La valeur est rangée dans le slot du dataclass (ou dans le __dict__ de
+    l'instance) ; une fois analysée, elle y remplace la chaîne.
+    """
+
+    def __init__(self, name: str, slot=None):
+        self.name = name
+        self.slot = slot
+
+    def raw(self, obj):
+        """Valeur stockée, chaîne ISO ou datetime."""
+        if self.slot is not None:
+            return self.slot.__get__(obj, type(obj))
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.raw(obj)
+        if isinstance(value, str):
+            value = _parse_dt(value)
+            self.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        if self.slot is not None:
+            self.slot.__set__(obj, value)
+        else:
+            obj.__dict__[self.name] = value
+
+
+def lazy_datetimes(*names: str):
+    """Décorateur de classe rendant paresseux les champs datetime donnés.
+
+    À placer au-dessus de @dataclass : il enveloppe les slots (ou les entrées
+    du __dict__) créés par le dataclass.
+    """
+
+    def decorate(cls):
+        for name in names:
+            slot = cls.__dict__.get(name)
+            if not isinstance(slot, MemberDescriptorType):
+                slot = None
+            setattr(cls, name, LazyDatetime(name, slot))
+        return cls
+
+    return decorate
+
+
+def raw_timestamp(obj, name: str):
+    """Valeur stockée d'un champ paresseux, sans l'analyser."""
+    return getattr(type(obj), name).raw(obj)
+
+
+def isoformat(obj, name: str) -> str:
+    """Date au format ISO, sans aller-retour pour une chaîne jamais analysée."""
+    value = raw_timestamp(obj, name)
+    return value if isinstance(value, str) else value.isoformat()
@@ -0,0 +1,127 @@
+"""Modèle pour les segments de transcription des sources audio et vidéo."""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# Requêtes de la table transcript_segments, assemblées une fois pour toutes
+_DELETE_BY_SOURCE_SQL = "DELETE FROM transcript_segments WHERE source_id = ?"
+_INSERT_SQL = """
+    INSERT INTO transcript_segments (source_id, start_time, end_time, text)
+    VALUES (?, ?, ?, ?)
+"""
+_EXISTS_FOR_SOURCE_SQL = (
+    "SELECT 1 FROM transcript_segments WHERE source_id = ? LIMIT 1"
+)
+_SELECT_BY_SOURCE_SQL = (
+    "SELECT * FROM transcript_segments WHERE source_id = ? ORDER BY start_time"
+)
+# Segments qui chevauchent l'intervalle [début, fin] (bornes facultatives) :
+# clé (début fourni, fin fournie)
+_SELECT_RANGE_SQL = {
+    (False, False): _SELECT_BY_SOURCE_SQL,
+    (False, True): """
+        SELECT * FROM transcript_segments
+        WHERE source_id = ? AND start_time <= ?
+        ORDER BY start_time
+    """,
+    (True, False): """
+        SELECT * FROM transcript_segments
+        WHERE source_id = ? AND end_time >= ?
+        ORDER BY start_time
+    """,
+    (True, True): """
+        SELECT * FROM transcript_segments
+        WHERE source_id = ? AND start_time <= ? AND end_time >= ?
+        ORDER BY start_time
+    """,
+}
+
+
+@dataclass(slots=True)
+class TranscriptSegment:
+    """Représente un segment horodaté d'une transcription Whisper."""
+
+    source_id: str
+    start: float
+    end: float
+    text: str
+
+    def to_dict(self) -> dict:
+        """Convertit au format des segments Whisper (start, end, text)."""
+        return {"start": self.start, "end": self.end, "text": self.text}
+
+    @classmethod
+    def from_row(cls, row) -> "TranscriptSegment":
+        """Crée une instance depuis une ligne de base de données (sqlite3.Row)."""
+        return cls(
+            source_id=row["source_id"],
+            start=row["start_time"],
+            end=row["end_time"],
+            text=row["text"],
+        )
+
+    @classmethod
+    def save_many(cls, db, source_id: str, segments: Iterable[dict]) -> int:
+        """
+        Remplace les segments d'une source, en une seule transaction.
+
+        Args:
+            source_id: ID de la source transcrite
+            segments: Segments au format Whisper (start, end, text)
+
+        Returns:
+            Nombre de segments enregistrés
+        """
+        with db:
+            return cls.write_many(db, source_id, segments)
+
+    @classmethod
+    def write_many(cls, db, source_id: str, segments: Iterable[dict]) -> int:
+        """
+        Remplace les segments d'une source dans la transaction en cours.
+
+        Ni commit ni rollback : l'appelant ouvre la transaction, par exemple
+        pour enregistrer la source et ses segments ensemble (Source.save_many).
+
+        Returns:
+            Nombre de segments enregistrés
+        """
+        rows = [
+            (source_id, seg["start"], seg["end"], seg.get("text", ""))
+            for seg in segments
+        ]
+        db.execute(_DELETE_BY_SOURCE_SQL, (source_id,))
+        db.executemany(_INSERT_SQL, rows)
+        return len(rows)
+
+    @classmethod
+    def get_by_source(
+        cls,
+        db,
+        source_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> list["TranscriptSegment"]:
+        """
+        Récupère les segments d'une source, dans l'ordre chronologique.
+
+        Args:
+            source_id: ID de la source
+            start: Si fourni, ignore les segments terminés avant cet instant
+            end: Si fourni, ignore les segments commençant après cet instant
+        """
+        params = [source_id]
+        if end is not None:
+            params.append(end)
+        if start is not None:
+            params.append(start)
+
+        sql = _SELECT_RANGE_SQL[start is not None, end is not None]
+        cursor = db.execute(sql, params)
+        return [cls.from_row(row) for row in cursor]
+
+    @classmethod
+    def exists_for_source(cls, db, source_id: str) -> bool:
+        """Indique si la source possède des segments de transcription."""
+        cursor = db.execute(_EXISTS_FOR_SOURCE_SQL, (source_id,))
+        return cursor.fetchone() is not None
@@ -18,8 +18,10 @@ from ..models.project import Project
 from ..models.source import Source, SourceType
 from ..models.node import Node
 from ..models.coding import CodeReference
-from ..importers import get_importer
+from ..models.transcript import TranscriptSegment
+from ..importers import ImageImporter, get_importer, prefetch_files
 from ..utils.settings import get_settings_manager
+from ..utils.whisper_models import unload_whisper_models
 from .dialogs import (
     TranscriptionSettingsDialog,
     ImportProgressDialog,
@@ -614,7 +616,7 @@ class MainWindow:
             return
 
         try:
-            self.project = Project.open(project_path)
+            self._set_project(Project.open(project_path))
             self.refresh_all()
             self.update_status(f"Projet ouvert: {self.project.name}")
             self.project_label.configure(text=self.project.name)
@@ -674,8 +676,7 @@ class MainWindow:
 
             project_path = Path(path) / name
             try:
-                self.project = Project(name=name, path=project_path)
-                self.project.create()
+                self._set_project(Project(name=name, path=project_path).create())
                 self.refresh_all()
                 self.update_status(f"Projet créé: {name}")
                 self.project_label.configure(text=name)
@@ -695,7 +696,7 @@ class MainWindow:
         path = filedialog.askdirectory(title="Sélectionner le dossier du projet")
         if path:
             try:
-                self.project = Project.open(Path(path))
+                self._set_project(Project.open(Path(path)))
                 self.refresh_all()
                 self.update_status(f"Projet ouvert: {self.project.name}")
                 self.project_label.configure(text=self.project.name)
@@ -812,127 +813,188 @@ class MainWindow:
                     )
 
         def do_import():
-            sources_to_save = []
+            saved_sources = []
             errors = []
             total = len(files)
 
-            for i, file_path in enumerate(files, 1):
-                # Vérifier si annulé
-                if progress_dialog.cancelled:
-                    logger.info("Import annulé par l'utilisateur")
-                    break
+            # Lecture anticipée du lot par le système pendant les imports
+            prefetch_files(files)
 
-                try:
-                    filename = Path(file_path).name
-                    progress_dialog.after(
-                        0, lambda f=filename, n=i: progress_dialog.set_file(f, n)
-                    )
-                    progress_dialog.after(
-                        0, lambda f=filename: progress_dialog.log(f"Import: {f}")
-                    )
-
-                    logger.info(f"Import du fichier: {file_path}")
-                    importer = get_importer(file_path)
-
-                    # Configurer le callback de progression
-                    importer.set_progress_callback(update_progress)
-
-                    # Déterminer si c'est un fichier audio/vidéo
-                    is_audio_video = Path(file_path).suffix.lower() in {
-                        ".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm",
-                        ".mp4", ".avi", ".mov", ".mkv", ".wmv",
+            # Connexion propre au thread d'import : ses transactions restent
+            # invisibles pour l'interface jusqu'au commit (journal WAL)
+            db = self.project.connect()
+            try:
+                # Images importées en un lot : leur OCR tourne dans le pool
+                # partagé pendant que les fichiers sont copiés
+                image_paths = [
+                    Path(f) for f in files
+                    if Path(f).suffix.lower() in {
+                        ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff", ".webp",
                     }
-
-                    # Préparer les options d'import
-                    import_options = {}
-                    if is_audio_video:
-                        import_options["transcribe"] = transcribe
-                        import_options["whisper_model"] = whisper_model
-                        import_options["language"] = whisper_language
-                        import_options["show_timestamps"] = show_timestamps
-                        logger.info(
-                            f"Options transcription: model={whisper_model}, "
-                            f"lang={whisper_language}, transcribe={transcribe}, "
-                            f"timestamps={show_timestamps}"
-                        )
-                        progress_dialog.after(
-                            0,
-                            lambda: progress_dialog.log(
-                                f"  Transcription: modèle={whisper_model}, "
-                                f"timestamps={'oui' if show_timestamps else 'non'}"
+                ]
+                image_results = {}
+                if image_paths and not progress_dialog.cancelled:
+                    image_importer = ImageImporter()
+                    image_importer.set_progress_callback(update_progress)
+                    settings = self.settings_manager.settings
+                    image_results = dict(
+                        zip(
+                            image_paths,
+                            image_importer.import_files(
+                                image_paths,
+                                self.project.files_path,
+                                ocr=settings.image_ocr,
+                                ocr_language=settings.ocr_language,
                             ),
                         )
-
-                    result = importer.import_file(
-                        Path(file_path),
-                        self.project.files_path,
-                        **import_options,
                     )
 
-                    if result.success and result.source:
-                        # Collecter la source pour la sauvegarder dans le thread principal
-                        sources_to_save.append(result.source)
-                        content_len = len(result.source.content or "")
-                        logger.info(f"Import réussi: {result.source.name} ({content_len} chars)")
+                for i, file_path in enumerate(files, 1):
+                    # Vérifier si annulé
+                    if progress_dialog.cancelled:
+                        logger.info("Import annulé par l'utilisateur")
+                        break
+
+                    try:
+                        filename = Path(file_path).name
                         progress_dialog.after(
-                            0,
-                            lambda cl=content_len: progress_dialog.log(
-                                f"  ✓ Succès ({cl} caractères)"
-                            ),
+                            0, lambda f=filename, n=i: progress_dialog.set_file(f, n)
+                        )
+                        progress_dialog.after(
+                            0, lambda f=filename: progress_dialog.log(f"Import: {f}")
                         )
 
-                        # Afficher les avertissements
-                        if result.warnings:
-                            for warning in result.warnings:
-                                logger.warning(f"Avertissement: {warning}")
-                                progress_dialog.after(
-                                    0,
-                                    lambda w=warning: progress_dialog.log(f"  ⚠ {w}"),
-                                )
-                    else:
-                        error_msg = f"{filename}: {result.error}"
+                        logger.info(f"Import du fichier: {file_path}")
+                        importer = get_importer(file_path)
+
+                        # Configurer le callback de progression
+                        importer.set_progress_callback(update_progress)
+
+                        # Déterminer si c'est un fichier audio/vidéo
+                        is_audio_video = Path(file_path).suffix.lower() in {
+                            ".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm",
+                            ".mp4", ".avi", ".mov", ".mkv", ".wmv",
+                        }
+
+                        # Préparer les options d'import
+                        import_options = {}
+                        if is_audio_video:
+                            import_options["transcribe"] = transcribe
+                            import_options["whisper_model"] = whisper_model
+                            import_options["language"] = whisper_language
+                            import_options["show_timestamps"] = show_timestamps
+                            logger.info(
+                                f"Options transcription: model={whisper_model}, "
+                                f"lang={whisper_language}, transcribe={transcribe}, "
+                                f"timestamps={show_timestamps}"
+                            )
+                            progress_dialog.after(
+                                0,
+                                lambda: progress_dialog.log(
+                                    f"  Transcription: modèle={whisper_model}, "
+                                    f"timestamps={'oui' if show_timestamps else 'non'}"
+                                ),
+                            )
+
+                        if Path(file_path) in image_results:
+                            result = image_results[Path(file_path)]
+                        else:
+                            result = importer.import_file(
+                                Path(file_path),
+                                self.project.files_path,
+                                **import_options,
+                            )
+
+                        if result.success and result.source:
+                            content_len = len(result.source.content or "")
+                            logger.info(f"Import réussi: {result.source.name} ({content_len} chars)")
+                            progress_dialog.after(
+                                0,
+                                lambda cl=content_len: progress_dialog.log(
+                                    f"  ✓ Succès ({cl} caractères)"
+                                ),
+                            )
+                            # Sauvegarde sur la connexion du thread d'import, sans
+                            # bloquer l'interface
+                            self._save_imported_source(
+                                db,
+                                result.source,
+                                saved_sources,
+                                errors,
+                                progress_dialog,
+                            )
+
+                            # Afficher les avertissements
+                            if result.warnings:
+                                for warning in result.warnings:
+                                    logger.warning(f"Avertissement: {warning}")
+                                    progress_dialog.after(
+                                        0,
+                                        lambda w=warning: progress_dialog.log(f"  ⚠ {w}"),
+                                    )
+                        else:
+                            error_msg = f"{filename}: {result.error}"
+                            errors.append(error_msg)
+                            logger.error(f"Échec de l'import: {error_msg}")
+                            progress_dialog.after(
+                                0,
+                                lambda e=result.error: progress_dialog.log(f"  ✗ Erreur: {e}"),
+                            )
+
+                    except Exception as e:
+                        error_msg = f"{Path(file_path).name}: {e}"
                         errors.append(error_msg)
-                        logger.error(f"Échec de l'import: {error_msg}")
+                        logger.error(f"Exception lors de l'import: {error_msg}")
+                        logger.error(traceback.format_exc())
                         progress_dialog.after(
-                            0,
-                            lambda e=result.error: progress_dialog.log(f"  ✗ Erreur: {e}"),
+                            0, lambda err=str(e): progress_dialog.log(f"  ✗ Exception: {err}")
                         )
-
-                except Exception as e:
-                    error_msg = f"{Path(file_path).name}: {e}"
-                    errors.append(error_msg)
-                    logger.error(f"Exception lors de l'import: {error_msg}")
-                    logger.error(traceback.format_exc())
-                    progress_dialog.after(
-                        0, lambda err=str(e): progress_dialog.log(f"  ✗ Exception: {err}")
-                    )
+            finally:
+                db.close()
 
             # Mise à jour de l'interface dans le thread principal
-            # Les sources seront sauvegardées dans le thread principal pour éviter
-            # les erreurs SQLite "objects created in a thread..."
             self.root.after(
-                0, lambda: self._on_import_complete(sources_to_save, errors, progress_dialog)
+                0,
+                lambda: self._on_import_complete(
+                    saved_sources, errors, progress_dialog
+                ),
             )
 
         thread = threading.Thread(target=do_import, daemon=True)
         thread.start()
 
+    def _save_imported_source(
+        self,
+        db,
+        source: Source,
+        saved_sources: list,
+        errors: list,
+        progress_dialog: ImportProgressDialog,
+    ):
+        """Sauvegarde une source importée (appelé depuis le thread d'import).
+
+        Args:
+            db: Connexion ouverte par le thread d'import (Project.connect)
+        """
+        try:
+            source.save(db)
+            saved_sources.append(source)
+            logger.info(f"Source sauvegardée: {source.name}")
+            progress_dialog.after(
+                0, lambda: progress_dialog.log(f"💾 Sauvegardé: {source.name}")
+            )
+        except Exception as e:
+            error_msg = f"{source.name}: {e}"
+            errors.append(error_msg)
+            logger.error(f"Erreur de sauvegarde: {error_msg}")
+            logger.error(traceback.format_exc())
+            progress_dialog.after(
+                0, lambda: progress_dialog.log(f"✗ Erreur sauvegarde: {source.name}")
+            )
+
     def _on_import_complete(self, sources: list, errors: list, progress_dialog: ImportProgressDialog):
-        """Callback appelé quand l'import est terminé."""
-        # Sauvegarder les sources dans le thread principal (évite les erreurs SQLite)
-        saved_count = 0
-        for source in sources:
-            try:
-                source.save(self.project.db)
-                saved_count += 1
-                logger.info(f"Source sauvegardée: {source.name}")
-                progress_dialog.log(f"💾 Sauvegardé: {source.name}")
-            except Exception as e:
-                error_msg = f"{source.name}: {e}"
-                errors.append(error_msg)
-                logger.error(f"Erreur de sauvegarde: {error_msg}")
-                logger.error(traceback.format_exc())
-                progress_dialog.log(f"✗ Erreur sauvegarde: {source.name}")
+        """Callback appelé quand l'import est terminé (sources enregistrées)."""
+        saved_count = len(sources)
 
         self.refresh_sources()
         self.update_status(f"{saved_count} fichier(s) importé(s)")
@@ -995,10 +1057,21 @@ class MainWindow:
                 f"Une erreur est survenue lors de l'export:\n{str(e)}"
             )
 
+    def _set_project(self, project: Optional[Project]):
+        """Remplace le projet courant et ferme le précédent.
+
+        Les modèles Whisper gardés en cache pour les transcriptions du projet
+        fermé sont libérés avec lui (mémoire vive et GPU).
+        """
+        previous = self.project
+        self.project = project
+        if previous is not None and previous is not project:
+            previous.close()
+            unload_whisper_models()
+
     def quit_app(self):
         """Quitte l'application."""
-        if self.project:
-            self.project.close()
+        self._set_project(None)
         self.root.quit()
 
     # --- Édition (undo/redo) ---
@@ -1395,11 +1468,23 @@ class MainWindow:
 
     def _has_transcription_segments(self) -> bool:
         """Vérifie si la source actuelle a des segments de transcription."""
-        if not self.current_source:
+        if not self.current_source or not self.project:
             return False
+        if TranscriptSegment.exists_for_source(self.project.db, self.current_source.id):
+            return True
+        # Projets antérieurs : segments conservés dans les métadonnées
         transcription = self.current_source.metadata.get("transcription", {})
-        segments = transcription.get("segments", [])
-        return len(segments) > 0
+        return len(transcription.get("segments", [])) > 0
+
+    def _get_transcription_segments(self) -> list[dict]:
+        """Retourne les segments de transcription de la source actuelle."""
+        segments = TranscriptSegment.get_by_source(
+            self.project.db, self.current_source.id
+        )
+        if segments:
+            return [seg.to_dict() for seg in segments]
+        transcription = self.current_source.metadata.get("transcription", {})
+        return transcription.get("segments", [])
 
     def _reformat_transcription(self, show_timestamps: bool):
         """
@@ -1412,7 +1497,7 @@ class MainWindow:
             return
 
         transcription = self.current_source.metadata.get("transcription", {})
-        segments = transcription.get("segments", [])
+        segments = self._get_transcription_segments()
 
         if not segments:
             messagebox.showwarning(
@@ -1713,8 +1798,8 @@ class MainWindow:
             return None
         char_pos = char_count[0]
 
-        # Chercher parmi les références de ce document
-        refs = CodeReference.get_by_source(self.project.db, self.current_source.id)
+        # Chercher parmi les références de ce document (arrêt à la première)
+        refs = CodeReference.iter_by_source(self.project.db, self.current_source.id)
         for ref in refs:
             if ref.start_pos <= char_pos < ref.end_pos:
                 return ref
@@ -2867,16 +2952,15 @@ class MainWindow:
         }
 
         source_filter = type_map.get(filter_type)
-        sources = Source.get_all(self.project.db, source_type=source_filter)
+        sources = Source.list_summaries(self.project.db, source_type=source_filter)
 
         for source in sources:
-            ref_count = CodeReference.count_by_source(self.project.db, source.id)
             self.sources_tree.insert(
                 "",
                 tk.END,
                 iid=source.id,
                 text=source.name,
-                values=(source.type.value, ref_count),
+                values=(source.type.value, source.ref_count),
             )
 
     def refresh_nodes(self):
@@ -2916,7 +3000,9 @@ class MainWindow:
         if not self.project or not self.current_source:
             return
 
-        refs = CodeReference.get_by_source(self.project.db, self.current_source.id)
+        refs = CodeReference.list_by_source_summary(
+            self.project.db, self.current_source.id
+        )
         for ref in refs:
             pos = f"{ref.start_pos}-{ref.end_pos}" if ref.start_pos else ""
             self.doc_codes_tree.insert(
@@ -2965,14 +3051,14 @@ class MainWindow:
             self.content_text.insert("1.0", self.current_source.content)
 
             # Surligner les codes existants
-            refs = CodeReference.get_by_source(self.project.db, self.current_source.id)
+            refs = CodeReference.list_by_source_summary(
+                self.project.db, self.current_source.id
+            )
             for ref in refs:
                 if ref.start_pos is not None and ref.end_pos is not None:
-                    node = Node.get(self.project.db, ref.node_id)
-                    if node:
-                        start = f"1.0+{ref.start_pos}c"
-                        end = f"1.0+{ref.end_pos}c"
-                        self.highlight_coding(start, end, node.color)
+                    start = f"1.0+{ref.start_pos}c"
+                    end = f"1.0+{ref.end_pos}c"
+                    self.highlight_coding(start, end, ref.node_color)
 
         # Mettre en mode lecture seule par défaut
         self.content_text.configure(
@@ -2990,13 +3076,15 @@ class MainWindow:
         if not self.selected_node or not self.project:
             return
 
-        refs = CodeReference.get_by_node(self.project.db, self.selected_node.id)
+        refs = CodeReference.list_by_node_summary(
+            self.project.db, self.selected_node.id
+        )
 
         # Cache pour éviter de recharger le contenu de la même source plusieurs fois
         source_contents: dict[str, str] = {}
 
         for ref in refs:
-            content = (ref.content or "")[:100]
+            content = ref.preview
 
             # Calculer le numéro de ligne
             line_num = ""
@@ -1,6 +1,6 @@
 """Modules utilitaires pour Lele."""
 
-from .ffmpeg import setup_ffmpeg, check_ffmpeg, get_ffmpeg_path
+from .ffmpeg import setup_ffmpeg, check_ffmpeg, get_ffmpeg_path, get_ffprobe_path
 from .system import (
     get_system_info,
     get_whisper_device,
@@ -12,6 +12,7 @@ from .system import (
     SystemInfo,
     GPUInfo,
 )
+from .whisper_models import load_whisper_model, unload_whisper_models
 from .settings import (
     get_settings_manager,
     get_settings,
@@ -24,6 +25,7 @@ __all__ = [
     "setup_ffmpeg",
     "check_ffmpeg",
     "get_ffmpeg_path",
+    "get_ffprobe_path",
     # System
     "get_system_info",
     "get_whisper_device",
@@ -34,6 +36,9 @@ __all__ = [
     "get_pytorch_install_command",
     "SystemInfo",
     "GPUInfo",
+    # Whisper
+    "load_whisper_model",
+    "unload_whisper_models",
     # Settings
     "get_settings_manager",
     "get_settings",
@@ -5,6 +5,7 @@ Il utilise imageio-ffmpeg pour fournir des binaires FFmpeg intégrés,
 évitant ainsi aux utilisateurs d'installer FFmpeg manuellement.
 """
 
+import functools
 import os
 import shutil
 import subprocess
@@ -64,6 +65,31 @@ def get_ffmpeg_path() -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def get_ffprobe_path() -> Optional[str]:
+    """
+    Retourne le chemin vers l'exécutable ffprobe (recherché une seule fois).
+
+    Cherche dans le PATH, puis à côté de l'exécutable FFmpeg.
+
+    Returns:
+        Chemin vers ffprobe ou None si non trouvé
+    """
+    system_ffprobe = shutil.which("ffprobe")
+    if system_ffprobe:
+        return system_ffprobe
+
+    ffmpeg_path = get_ffmpeg_path()
+    if ffmpeg_path:
+        name = "ffprobe.exe" if sys.platform == "win32" else "ffprobe"
+        sibling = Path(ffmpeg_path).with_name(name)
+        if sibling.exists():
+            return str(sibling)
+
+    logger.info("ffprobe non trouvé, métadonnées vidéo lues avec OpenCV")
+    return None
+
+
 def _create_ffmpeg_wrapper() -> Optional[str]:
     """
     Crée un lien/copie de FFmpeg avec le nom standard.
@@ -31,6 +31,10 @@ class AppSettings:
     whisper_language: Optional[str] = None
     transcription_show_timestamps: bool = False
 
+    # Paramètres d'import des images
+    image_ocr: bool = False
+    ocr_language: str = "fra+eng"
+
     # Paramètres LLM local (pour auto-codage)
     llm_provider: str = "ollama"  # "ollama", "none"
     llm_model: str = "mistral"
@@ -0,0 +1,176 @@
+"""Chargement des modèles Whisper, partagé entre les importers.
+
+Les modèles chargés restent en mémoire : importer plusieurs fichiers audio
+ou vidéo avec le même modèle ne relit pas les poids à chaque fichier.
+faster-whisper (CTranslate2, poids quantifiés int8) est utilisé s'il est
+installé, openai-whisper sinon.
+"""
+
+import functools
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .. import get_logger
+
+logger = get_logger("utils.whisper_models")
+
+# Nombre de modèles gardés en mémoire (un modèle "large" occupe ~3 Go)
+MAX_CACHED_MODELS = 2
+
+# Options de décodage faster-whisper : filtre VAD (les silences ne sont pas
+# décodés) et recherche en faisceau de largeur 5 (défaut de la CLI whisper)
+FASTER_WHISPER_OPTIONS = {"vad_filter": True, "beam_size": 5}
+
+# Quantification dynamique int8 des couches linéaires d'openai-whisper sur CPU
+WHISPER_CPU_INT8 = True
+
+# Évite que deux imports simultanés chargent le même modèle en double
+_load_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_MODELS)
+def _load_whisper_model(model_name: str, device: str):
+    """Charge un modèle Whisper (résultat mémorisé par modèle et device)."""
+    import whisper
+
+    logger.info(f"Chargement du modèle Whisper '{model_name}' sur {device}...")
+    model = whisper.load_model(model_name, device=device)
+    if device == "cpu" and WHISPER_CPU_INT8:
+        model = _quantize_for_cpu(model)
+    return model
+
+
+def _quantize_for_cpu(model):
+    """
+    Quantifie dynamiquement en int8 les couches linéaires du modèle.
+
+    Les poids sont lus deux fois moins vite en mémoire et les produits
+    matriciels passent par les instructions int8 du processeur. En cas
+    d'échec, le modèle float32 est conservé.
+    """
+    try:
+        import torch
+        import whisper.model
+        from torch import nn
+        from torch.ao.nn.quantized.dynamic import Linear as DynamicLinear
+        from torch.ao.quantization import quantize_dynamic
+        from torch.ao.quantization.quantization_mappings import (
+            get_default_dynamic_quant_module_mappings,
+        )
+
+        # convert() ne remplace que les modules dont le type exact figure dans
+        # la table : les couches de whisper (sous-classe de nn.Linear) y sont
+        # ajoutées. Le modèle d'origine n'est pas modifié (copie)
+        mapping = {
+            **get_default_dynamic_quant_module_mappings(),
+            whisper.model.Linear: DynamicLinear,
+        }
+        quantized = quantize_dynamic(
+            model,
+            {whisper.model.Linear, nn.Linear},
+            dtype=torch.qint8,
+            mapping=mapping,
+        )
+
+        swapped = sum(
+            isinstance(module, DynamicLinear) for module in quantized.modules()
+        )
+        if not swapped:
+            logger.warning(
+                "Aucune couche quantifiée en int8, modèle float32 conservé"
+            )
+            return model
+        logger.info(
+            f"Modèle Whisper quantifié en int8 pour le CPU ({swapped} couches)"
+        )
+        return quantized
+    except Exception as e:
+        logger.warning(
+            f"Quantification int8 impossible, modèle float32 conservé: {e}"
+        )
+        return model
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_MODELS)
+def _load_faster_whisper_model(model_name: str, device: str):
+    """Charge un modèle faster-whisper quantifié (mémorisé par modèle et device)."""
+    from faster_whisper import WhisperModel
+
+    # int8 pour les poids, float16 pour les activations sur GPU
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    logger.info(
+        f"Chargement du modèle faster-whisper '{model_name}' "
+        f"sur {device} ({compute_type})..."
+    )
+    # Sur CPU, CTranslate2 se limite sinon à 4 threads
+    cpu_threads = (os.cpu_count() or 0) if device == "cpu" else 0
+    return WhisperModel(
+        model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads
+    )
+
+
+def transcribe_faster_whisper(
+    audio, model_name: str, device: str, language: Optional[str] = None
+) -> dict:
+    """
+    Transcrit avec faster-whisper.
+
+    Args:
+        audio: Chemin du fichier audio, ou tableau float32 à 16 kHz
+        model_name: Nom du modèle Whisper
+        device: "cuda" ou "cpu"
+        language: Code de langue (None pour auto-détection)
+
+    Returns:
+        Dictionnaire au format de openai-whisper : text, language, segments
+
+    Raises:
+        ImportError: si faster-whisper n'est pas installé
+    """
+    with _load_lock:
+        model = _load_faster_whisper_model(model_name, device)
+
+    if isinstance(audio, Path):
+        audio = str(audio)
+    segments, info = model.transcribe(
+        audio, language=language, **FASTER_WHISPER_OPTIONS
+    )
+
+    # Les segments sont produits au fil du décodage
+    simplified_segments = [
+        {"start": seg.start, "end": seg.end, "text": seg.text} for seg in segments
+    ]
+    return {
+        "text": "".join(seg["text"] for seg in simplified_segments).strip(),
+        "language": info.language,
+        "segments": simplified_segments,
+    }
+
+
+def load_whisper_model(model_name: str, device: str):
+    """
+    Retourne le modèle Whisper demandé, chargé une seule fois par session.
+
+    Args:
+        model_name: Nom du modèle (tiny, base, small, medium, large...)
+        device: "cuda" ou "cpu"
+    """
+    with _load_lock:
+        return _load_whisper_model(model_name, device)
+
+
+def unload_whisper_models() -> None:
+    """Libère les modèles Whisper gardés en mémoire (et la mémoire GPU)."""
+    with _load_lock:
+        _load_whisper_model.cache_clear()
+        _load_faster_whisper_model.cache_clear()
+
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
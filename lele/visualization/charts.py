@@ -109,7 +109,7 @@ class ChartGenerator:
             return None
 
         # Compter par type
-        sources = Source.get_all(self.db)
+        sources = Source.list_summaries(self.db)
         type_counts = {}
 
         for source in sources:
@@ -46,16 +46,7 @@ class MindMapGenerator:
         if not MATPLOTLIB_AVAILABLE:
             return None
 
-        if root_node_id:
-            root = Node.get(self.db, root_node_id)
-            if root:
-                root.children = Node._get_children_recursive(self.db, root.id)
-                nodes = [root]
-            else:
-                return None
-        else:
-            nodes = Node.get_tree(self.db)
-
+        nodes = Node.get_tree(self.db, root_id=root_node_id)
         if not nodes:
             return None
 
@@ -256,15 +247,9 @@ class MindMapGenerator:
         Returns:
             JSON string
         """
-        if root_node_id:
-            root = Node.get(self.db, root_node_id)
-            if root:
-                root.children = Node._get_children_recursive(self.db, root.id)
-                nodes = [root]
-            else:
-                return "{}"
-        else:
-            nodes = Node.get_tree(self.db)
+        nodes = Node.get_tree(self.db, root_id=root_node_id)
+        if root_node_id and not nodes:
+            return "{}"
 
         def node_to_dict(node):
             return {
@@ -134,6 +134,16 @@ class SociogramGenerator:
         )
         return cursor.fetchone()[0]
 
+    def _source_node_sets(self, sources: list) -> dict[str, set[str]]:
+        """Ensemble des nœuds codés dans chaque source (une requête par source)."""
+        return {
+            source.id: {
+                r.node_id
+                for r in CodeReference.list_by_source_summary(self.db, source.id)
+            }
+            for source in sources
+        }
+
     def generate_source_similarity(
         self,
         source_ids: Optional[list[str]] = None,
@@ -183,15 +193,12 @@ class SociogramGenerator:
             )
 
         # Calculer les similarités (Jaccard sur les nœuds)
+        node_sets = self._source_node_sets(sources)
         for i, source1 in enumerate(sources):
-            nodes1 = set(
-                r.node_id for r in CodeReference.get_by_source(self.db, source1.id)
-            )
+            nodes1 = node_sets[source1.id]
 
             for source2 in sources[i + 1 :]:
-                nodes2 = set(
-                    r.node_id for r in CodeReference.get_by_source(self.db, source2.id)
-                )
+                nodes2 = node_sets[source2.id]
 
                 if nodes1 and nodes2:
                     intersection = len(nodes1 & nodes2)
@@ -303,15 +310,11 @@ class SociogramGenerator:
                     size=ref_count or 1,
                 )
 
+            node_sets = self._source_node_sets(sources)
             for i, source1 in enumerate(sources):
-                nodes1 = set(
-                    r.node_id for r in CodeReference.get_by_source(self.db, source1.id)
-                )
+                nodes1 = node_sets[source1.id]
                 for source2 in sources[i + 1 :]:
-                    nodes2 = set(
-                        r.node_id
-                        for r in CodeReference.get_by_source(self.db, source2.id)
-                    )
+                    nodes2 = node_sets[source2.id]
                     if nodes1 and nodes2:
                         intersection = len(nodes1 & nodes2)
                         union = len(nodes1 | nodes2)
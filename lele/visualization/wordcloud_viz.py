@@ -103,8 +103,7 @@ class WordCloudGenerator:
         from ..models.coding import CodeReference
 
         for node_id in node_ids:
-            refs = CodeReference.get_by_node(self.db, node_id)
-            for ref in refs:
+            for ref in CodeReference.iter_by_node(self.db, node_id):
                 if ref.content:
                     words = word_pattern.findall(ref.content.lower())
                     for word in words:
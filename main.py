@@ -5,6 +5,7 @@ Lele - Application d'analyse qualitative de données (QDA)
 Point d'entrée principal de l'application.
 """
 
+import multiprocessing
 import sys
 
 
@@ -25,4 +26,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Nécessaire aux processus d'extraction dans l'exécutable PyInstaller
+    multiprocessing.freeze_support()
     main()
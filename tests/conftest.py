@@ -0,0 +1,19 @@
+"""Fixtures communes aux tests."""
+
+import pytest
+
+from lele.models.project import Project
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Projet vide créé dans un dossier temporaire."""
+    project = Project(name="test", path=tmp_path / "projet").create()
+    yield project
+    project.close()
+
+
+@pytest.fixture
+def db(project):
+    """Connexion à la base du projet de test."""
+    return project.db
@@ -0,0 +1,59 @@
+"""Tests du stockage typé des valeurs d'attributs de cas."""
+
+import math
+
+from lele.models.case import Attribute, AttributeType, Case, Classification
+
+
+def test_attribute_values_round_trip_through_typed_columns(db):
+    case = Case(name="cas").save(db)
+    values = {
+        "texte": "[1]",
+        "entier": 42,
+        "grand": 2**60,
+        "decimal": 1.5,
+        "booleen": True,
+        "liste": ["a", "é"],
+    }
+    case.set_attributes(db, values)
+
+    loaded = Case.get(db, case.id)
+    assert loaded.attribute_values == values
+    assert type(loaded.attribute_values["booleen"]) is bool
+    # L'ancienne colonne JSON n'est plus écrite
+    assert db.execute(
+        "SELECT COUNT(*) FROM case_attributes WHERE value IS NOT NULL"
+    ).fetchone()[0] == 0
+
+
+def test_nan_attribute_survives_sqlite_null(db):
+    case = Case(name="cas").save(db)
+    case.set_attribute(db, "mesure", float("nan"))
+
+    assert math.isnan(case.get_attribute(db, "mesure"))
+    [loaded] = Case.get_all_with_attributes(db)
+    assert math.isnan(loaded.attribute_values["mesure"])
+
+
+def test_legacy_json_value_still_decoded(db):
+    case = Case(name="cas").save(db)
+    db.execute(
+        "INSERT INTO case_attributes (case_id, attribute_id, value)"
+        " VALUES (?, ?, ?)",
+        (case.id, "ancien", "[1, 2]"),
+    )
+    assert case.get_attribute(db, "ancien") == [1, 2]
+
+
+def test_classification_delete_removes_attributes_and_values(db):
+    classification = Classification(name="Participants", type="case").save(db)
+    age = classification.add_attribute(db, "âge", AttributeType.INTEGER)
+    ville = classification.add_attribute(db, "ville", AttributeType.TEXT)
+    case = Case(name="cas", classification_id=classification.id).save(db)
+    case.set_attributes(db, {age.id: 30, ville.id: "Lyon"})
+
+    classification.delete(db)
+
+    assert Attribute.get_by_classification(db, classification.id) == []
+    assert Case.get(db, case.id).attribute_values == {}
+    assert Case.get(db, case.id).classification_id is None
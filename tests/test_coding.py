@@ -0,0 +1,60 @@
+"""Tests des compteurs ref_count tenus par les triggers de code_references."""
+
+from lele.models.coding import CodeReference
+from lele.models.node import Node
+from lele.models.source import Source, SourceType
+
+
+def _ref_counts(db, node, source):
+    return (
+        CodeReference.count_by_node(db, node.id),
+        CodeReference.count_by_source(db, source.id),
+    )
+
+
+def test_ref_count_after_delete_and_reinsert(db):
+    node = Node(name="code").save(db)
+    source = Source(name="s", type=SourceType.TEXT, content="texte").save(db)
+    ref = CodeReference(
+        node_id=node.id, source_id=source.id, start_pos=0, end_pos=5
+    ).save(db)
+    assert _ref_counts(db, node, source) == (1, 1)
+
+    # Sauvegarder à nouveau la même référence ne la compte pas deux fois
+    ref.end_pos = 4
+    ref.save(db)
+    assert _ref_counts(db, node, source) == (1, 1)
+
+    ref.delete(db)
+    assert _ref_counts(db, node, source) == (0, 0)
+
+    ref.save(db)
+    assert _ref_counts(db, node, source) == (1, 1)
+
+
+def test_ref_count_follows_moved_reference(db):
+    first = Node(name="premier").save(db)
+    second = Node(name="second").save(db)
+    source = Source(name="s", type=SourceType.TEXT).save(db)
+    ref = CodeReference(node_id=first.id, source_id=source.id).save(db)
+
+    ref.node_id = second.id
+    ref.save(db)
+
+    assert CodeReference.count_by_node(db, first.id) == 0
+    assert CodeReference.count_by_node(db, second.id) == 1
+    assert CodeReference.count_by_source(db, source.id) == 1
+
+
+def test_upsert_of_node_and_source_keeps_ref_count(db):
+    node = Node(name="code").save(db)
+    source = Source(name="s", type=SourceType.TEXT).save(db)
+    CodeReference(node_id=node.id, source_id=source.id).save(db)
+
+    node.name = "code renommé"
+    node.save(db)
+    source.content = "nouveau contenu"
+    source.save(db)
+
+    assert _ref_counts(db, node, source) == (1, 1)
+    assert Node.get(db, node.id).reference_count == 1
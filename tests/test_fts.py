@@ -0,0 +1,44 @@
+"""Tests de la recherche plein texte sur une saisie utilisateur."""
+
+from lele.models.fts import fts_match, quote_terms
+from lele.models.source import Source, SourceType
+
+
+def _search_ids(db, query):
+    return [source.id for source in Source.search(db, query)]
+
+
+def test_search_keeps_fts_syntax(db):
+    first = Source(
+        name="a", type=SourceType.TEXT, content="le chat noir dort"
+    ).save(db)
+    second = Source(
+        name="b", type=SourceType.TEXT, content="le noir chat court"
+    ).save(db)
+
+    assert _search_ids(db, '"chat noir"') == [first.id]
+    assert set(_search_ids(db, "dort OR court")) == {first.id, second.id}
+    assert _search_ids(db, "noir NOT court") == [first.id]
+    assert set(_search_ids(db, "cha*")) == {first.id, second.id}
+
+
+def test_search_falls_back_to_quoted_terms(db):
+    source = Source(
+        name="a", type=SourceType.TEXT, content="l'homme et jean-pierre"
+    ).save(db)
+
+    assert _search_ids(db, "l'homme") == [source.id]
+    assert _search_ids(db, "jean-pierre") == [source.id]
+    assert Source.search(db, "   ") == []
+
+
+def test_quote_terms():
+    assert quote_terms("l'homme jean*") == '"l\'homme" "jean"*'
+    assert quote_terms('dit "oui"') == '"dit" """oui"""'
+    assert quote_terms("*") == '"*"'
+    assert quote_terms("") == ""
+
+
+def test_fts_match_returns_nothing_for_unquotable_query(db):
+    sql = "SELECT rowid FROM sources_fts WHERE sources_fts MATCH ?"
+    assert fts_match(db, sql, "(") == []
@@ -0,0 +1,28 @@
+"""Tests des matrices d'analyse croisant cas, attributs et nœuds."""
+
+from lele.analysis.matrix import MatrixAnalysis
+from lele.models.case import AttributeType, Case, Classification
+from lele.models.coding import CodeReference
+from lele.models.node import Node
+from lele.models.source import Source, SourceType
+
+
+def test_attribute_node_matrix_groups_cases_by_value(db):
+    classification = Classification(name="Participants", type="case").save(db)
+    age = classification.add_attribute(db, "âge", AttributeType.INTEGER)
+    node = Node(name="code").save(db)
+
+    for name, value, refs in (("a", 30, 1), ("b", 30, 2), ("c", 45, 3)):
+        case = Case(name=name, classification_id=classification.id).save(db)
+        case.set_attribute(db, age.id, value)
+        source = Source(name=name, type=SourceType.TEXT).save(db)
+        case.link_source(db, source.id)
+        for _ in range(refs):
+            CodeReference(node_id=node.id, source_id=source.id).save(db)
+    Case(name="sans valeur", classification_id=classification.id).save(db)
+
+    result = MatrixAnalysis(db).attribute_node_matrix(classification.id, age.id)
+
+    assert result["row_labels"] == ["30", "45"]
+    assert result["col_labels"] == ["code"]
+    assert result["matrix"] == [[3], [3]]
@@ -0,0 +1,94 @@
+"""Tests de l'arbre des nœuds (requêtes récursives) et de sa pagination."""
+
+from lele.models.coding import CodeReference
+from lele.models.node import Node
+from lele.models.source import Source, SourceType
+
+
+def _build_tree(db):
+    root = Node(name="racine").save(db)
+    child_b = Node(name="b", parent_id=root.id).save(db)
+    child_a = Node(name="a", parent_id=root.id).save(db)
+    leaf = Node(name="feuille", parent_id=child_a.id).save(db)
+    other = Node(name="autre").save(db)
+    return root, child_a, child_b, leaf, other
+
+
+def test_get_tree_assembles_nodes_with_ref_counts(db):
+    root, child_a, child_b, leaf, other = _build_tree(db)
+    source = Source(name="s", type=SourceType.TEXT).save(db)
+    CodeReference(node_id=leaf.id, source_id=source.id).save(db)
+
+    roots = Node.get_tree(db)
+
+    assert [node.id for node in roots] == [other.id, root.id]
+    tree_root = roots[1]
+    assert [node.name for node in tree_root.children] == ["a", "b"]
+    tree_leaf = tree_root.children[0].children[0]
+    assert tree_leaf.id == leaf.id
+    assert tree_leaf.reference_count == 1
+
+
+def test_get_tree_from_node_returns_subtree(db):
+    root, child_a, child_b, leaf, other = _build_tree(db)
+
+    subtree = Node.get_tree(db, child_a.id)
+
+    assert [node.id for node in subtree] == [child_a.id]
+    assert [node.id for node in subtree[0].children] == [leaf.id]
+
+
+def test_delete_subtree_removes_descendants_and_references(db):
+    root, child_a, child_b, leaf, other = _build_tree(db)
+    source = Source(name="s", type=SourceType.TEXT).save(db)
+    CodeReference(node_id=leaf.id, source_id=source.id).save(db)
+
+    child_a.delete(db)
+
+    assert Node.get(db, child_a.id) is None
+    assert Node.get(db, leaf.id) is None
+    assert Node.get(db, child_b.id) is not None
+    assert CodeReference.count_by_source(db, source.id) == 0
+
+
+def test_delete_single_node_keeps_children(db):
+    root, child_a, child_b, leaf, other = _build_tree(db)
+
+    child_a.delete(db, recursive=False)
+
+    assert Node.get(db, child_a.id) is None
+    assert Node.get(db, leaf.id) is not None
+
+
+def test_get_all_pages_follow_name_order(db):
+    root = Node(name="racine").save(db)
+    children = [
+        Node(name=name, parent_id=root.id).save(db)
+        for name in ("d", "b", "a", "c", "b")
+    ]
+    expected = [
+        node.id for node in sorted(children, key=lambda node: (node.name, node.id))
+    ]
+
+    assert [node.id for node in Node.get_all(db, root.id)] == expected
+    page = Node.get_all(db, root.id, limit=2, offset=2)
+    assert [node.id for node in page] == expected[2:4]
+    assert [node.id for node in Node.get_all(db)] == [root.id]
+
+
+def test_get_all_after_resumes_after_last_key(db):
+    root = Node(name="racine").save(db)
+    children = [
+        Node(name=name, parent_id=root.id).save(db)
+        for name in ("d", "b", "a", "c", "b")
+    ]
+    ordered = sorted(children, key=lambda node: (node.name, node.id))
+
+    seen = []
+    page = Node.get_all_after(db, root.id, "", limit=2)
+    while page:
+        seen.extend(page)
+        last = page[-1]
+        page = Node.get_all_after(db, root.id, last.name, limit=2, last_id=last.id)
+
+    assert [node.id for node in seen] == [node.id for node in ordered]
@@ -0,0 +1,38 @@
+"""Tests de l'import REFI-QDA (.qdpx)."""
+
+import zipfile
+from pathlib import Path
+
+from lele.importers.refi_qda import RefiQdaImporter
+from lele.models.source import Source
+
+QDE = """<?xml version="1.0" encoding="utf-8"?>
+<Project xmlns="urn:QDA-XML:project:1.0" name="p">
+  <Sources>
+    <Source type="TextSource" guid="s1" name="un" path="a/notes.txt"/>
+    <Source type="TextSource" guid="s2" name="deux" path="b/notes.txt"/>
+    <Source type="TextSource" guid="s3" name="trois" path="a/notes.txt"/>
+  </Sources>
+</Project>
+"""
+
+
+def test_same_basename_members_get_distinct_files(project, tmp_path):
+    archive = tmp_path / "projet.qdpx"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("project.qde", QDE)
+        zf.writestr("a/notes.txt", "contenu A")
+        zf.writestr("b/notes.txt", "contenu B")
+
+    stats = RefiQdaImporter().import_project(archive, project)
+
+    assert stats["errors"] == []
+    paths = {
+        guid: Path(Source.get(project.db, guid).file_path)
+        for guid in ("s1", "s2", "s3")
+    }
+    assert paths["s1"] != paths["s2"]
+    # Un membre référencé deux fois n'est extrait qu'une fois
+    assert paths["s3"] == paths["s1"]
+    assert paths["s1"].read_text() == "contenu A"
+    assert paths["s2"].read_text() == "contenu B"
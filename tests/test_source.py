@@ -0,0 +1,207 @@
+"""Tests de la persistance des sources : index FTS, pagination, sauvegarde en lot."""
+
+from lele.models import source as source_module
+from lele.models.coding import CodeReference
+from lele.models.node import Node
+from lele.models.project import Project
+from lele.models.source import Source, SourceSummary, SourceType
+from lele.models.transcript import TranscriptSegment
+
+
+def _search_ids(db, query):
+    return [source.id for source in Source.search(db, query)]
+
+
+def test_fts_follows_insert_update_and_delete(db):
+    source = Source(
+        name="Entretien", type=SourceType.TEXT, content="la pomme est rouge"
+    ).save(db)
+    assert _search_ids(db, "pomme") == [source.id]
+    assert _search_ids(db, "entretien") == [source.id]
+
+    source.content = "la poire est verte"
+    source.save(db)
+    assert _search_ids(db, "pomme") == []
+    assert _search_ids(db, "poire") == [source.id]
+
+    source.delete(db)
+    assert _search_ids(db, "poire") == []
+    # L'index reste cohérent avec la table après ces modifications
+    db.execute("INSERT INTO sources_fts (sources_fts) VALUES ('integrity-check')")
+
+
+def test_migration_rebuilds_copy_table_fts(tmp_path):
+    project = Project(name="ancien", path=tmp_path / "ancien").create()
+    source = Source(
+        name="Ancien", type=SourceType.TEXT, content="texte historique"
+    ).save(project.db)
+
+    # Reproduire l'ancien schéma : index FTS qui recopiait le contenu, sans
+    # triggers, et resté vide
+    db = project.db
+    for trigger in ("sources_ai", "sources_ad", "sources_au"):
+        db.execute(f"DROP TRIGGER {trigger}")
+    db.execute("DROP TABLE sources_fts")
+    db.execute(
+        "CREATE VIRTUAL TABLE sources_fts USING fts5("
+        "id, name, content, tokenize='unicode61')"
+    )
+    db.commit()
+    project.close()
+
+    project = Project.open(tmp_path / "ancien")
+    try:
+        db = project.db
+        sql = db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'sources_fts'"
+        ).fetchone()[0]
+        assert "content='sources'" in sql
+        assert _search_ids(db, "historique") == [source.id]
+
+        # Les triggers sont recréés : l'index suit les modifications suivantes
+        source.content = "texte modifié"
+        source.save(db)
+        assert _search_ids(db, "historique") == []
+        assert _search_ids(db, "modifié") == [source.id]
+    finally:
+        project.close()
+
+
+def test_migration_adds_docid_to_sources(tmp_path):
+    project = Project(name="ancien", path=tmp_path / "ancien").create()
+
+    # Reproduire l'ancien schéma : table clé sur un rowid implicite, index FTS
+    # sur ce rowid
+    db = project.db
+    for trigger in ("sources_ai", "sources_ad", "sources_au"):
+        db.execute(f"DROP TRIGGER {trigger}")
+    db.execute("DROP TABLE sources_fts")
+    db.execute("DROP TABLE sources")
+    db.execute(
+        "CREATE TABLE sources (id TEXT PRIMARY KEY, name TEXT NOT NULL,"
+        " type TEXT NOT NULL, file_path TEXT, content TEXT, metadata TEXT,"
+        " created_at TEXT NOT NULL, modified_at TEXT NOT NULL,"
+        " ref_count INTEGER NOT NULL DEFAULT 0)"
+    )
+    db.execute(
+        "CREATE VIRTUAL TABLE sources_fts USING fts5(id UNINDEXED, name, content,"
+        " content='sources', content_rowid='rowid', tokenize='unicode61')"
+    )
+    sources = [
+        Source(name=f"s{i}", type=SourceType.TEXT, content=f"ancien{i}").save(db)
+        for i in range(2)
+    ]
+    db.commit()
+    project.close()
+
+    project = Project.open(tmp_path / "ancien")
+    try:
+        db = project.db
+        columns = [row["name"] for row in db.execute("PRAGMA table_info(sources)")]
+        assert columns[0] == "docid"
+        assert db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_sources_type'"
+        ).fetchone()
+        assert _search_ids(db, "ancien1") == [sources[1].id]
+
+        sources[0].delete(db)
+        db.commit()
+        db.execute("VACUUM")
+        assert _search_ids(db, "ancien1") == [sources[1].id]
+    finally:
+        project.close()
+
+
+def test_list_summaries_pages_and_filters(db):
+    names = ["d", "b", "a", "c"]
+    sources = {
+        name: Source(
+            name=name,
+            type=SourceType.PDF if name in "ac" else SourceType.TEXT,
+            content="contenu " * 100,
+        ).save(db)
+        for name in names
+    }
+
+    summaries = Source.list_summaries(db)
+    assert [summary.name for summary in summaries] == ["a", "b", "c", "d"]
+    assert isinstance(summaries[0], SourceSummary)
+    assert summaries[0].id == sources["a"].id
+    assert summaries[0].type is SourceType.PDF
+
+    page = Source.list_summaries(db, limit=2, offset=1)
+    assert [summary.name for summary in page] == ["b", "c"]
+
+    pdfs = Source.list_summaries(db, SourceType.PDF)
+    assert [summary.name for summary in pdfs] == ["a", "c"]
+
+    assert Source.count(db) == 4
+    assert Source.count(db, SourceType.TEXT) == 2
+
+
+def test_bulk_save_json_splits_payload_by_size(db, monkeypatch):
+    monkeypatch.setattr(source_module, "BULK_JSON_MAX_CHARS", 200)
+    payloads = []
+    dump_rows = source_module._dump_rows
+
+    def spy(rows):
+        payloads.append(len(rows))
+        return dump_rows(rows)
+
+    monkeypatch.setattr(source_module, "_dump_rows", spy)
+
+    sources = [
+        Source(
+            name=f"source {i:04d}",
+            type=SourceType.TEXT,
+            content=f"contenu numéro {i}",
+            metadata={"index": i, "tags": ["a", "é"]},
+        )
+        for i in range(50)
+    ]
+    Source.bulk_save_json(db, sources)
+
+    assert len(payloads) > 1
+    assert sum(payloads) == 50
+    assert Source.count(db) == 50
+    loaded = Source.get(db, sources[42].id)
+    assert loaded.name == "source 0042"
+    assert loaded.type is SourceType.TEXT
+    assert loaded.content == "contenu numéro 42"
+    assert loaded.metadata == {"index": 42, "tags": ["a", "é"]}
+
+
+def test_save_many_never_uses_json_each(db, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("bulk_save_json ne doit pas être appelé")
+
+    monkeypatch.setattr(Source, "bulk_save_json", fail)
+    sources = [Source(name=f"s{i}", type=SourceType.TEXT) for i in range(1500)]
+    Source.save_many(db, sources)
+    assert Source.count(db) == 1500
+
+
+def test_bulk_upsert_updates_rows_and_keeps_ref_count(db):
+    sources = [
+        Source(name=f"s{i}", type=SourceType.TEXT, content=f"ancien{i}")
+        for i in range(3)
+    ]
+    Source.bulk_save_json(db, sources)
+
+    node = Node(name="code").save(db)
+    CodeReference(node_id=node.id, source_id=sources[0].id).save(db)
+
+    segments = [{"start": 0.0, "end": 1.0, "text": "bonjour"}]
+    for i, source in enumerate(sources):
+        source.content = f"nouveau{i}"
+        source.transcript_segments = segments
+    Source.bulk_save_json(db, sources)
+
+    assert Source.count(db) == 3
+    assert Source.get(db, sources[1].id).content == "nouveau1"
+    # L'UPSERT ne supprime pas la ligne : le compteur n'est pas remis à zéro
+    assert CodeReference.count_by_source(db, sources[0].id) == 1
+    assert TranscriptSegment.exists_for_source(db, sources[2].id)
+    # L'index FTS suit les mises à jour faites par json_each
+    assert _search_ids(db, "ancien1") == []
+    assert _search_ids(db, "nouveau1") == [sources[1].id]
@@ -0,0 +1,72 @@
+"""Tests des segments de transcription (table transcript_segments)."""
+
+import pytest
+
+from lele.models.source import Source, SourceType
+from lele.models.transcript import TranscriptSegment
+
+SEGMENTS = [
+    {"start": 2.0, "end": 3.0, "text": "trois"},
+    {"start": 0.0, "end": 1.0, "text": "un"},
+    {"start": 1.0, "end": 2.0, "text": "deux"},
+]
+
+
+@pytest.fixture
+def transcribed_source(db):
+    source = Source(name="audio", type=SourceType.AUDIO).save(db)
+    TranscriptSegment.save_many(db, source.id, SEGMENTS)
+    return source
+
+
+def _texts(db, source, **bounds):
+    return [
+        segment.text
+        for segment in TranscriptSegment.get_by_source(db, source.id, **bounds)
+    ]
+
+
+def test_segments_ranges(db, transcribed_source):
+    source = transcribed_source
+    assert _texts(db, source) == ["un", "deux", "trois"]
+    assert _texts(db, source, start=1.5) == ["deux", "trois"]
+    assert _texts(db, source, end=1.5) == ["un", "deux"]
+    assert _texts(db, source, start=1.2, end=1.8) == ["deux"]
+
+
+def test_segments_replaced_and_deleted_with_source(db, transcribed_source):
+    source = transcribed_source
+    TranscriptSegment.save_many(db, source.id, [{"start": 0.0, "end": 5.0}])
+    assert _texts(db, source) == [""]
+
+    source.delete(db)
+    assert not TranscriptSegment.exists_for_source(db, source.id)
+
+
+def test_source_save_writes_segments(db):
+    source = Source(name="audio", type=SourceType.AUDIO)
+    source.transcript_segments = SEGMENTS
+    source.save(db)
+
+    assert _texts(db, source) == ["un", "deux", "trois"]
+
+
+def test_source_and_segments_saved_in_one_transaction(db):
+    source = Source(name="audio", type=SourceType.AUDIO, content="avant")
+    source.transcript_segments = SEGMENTS
+    source.save(db)
+
+    # Segment invalide : la source modifiée n'est pas enregistrée non plus
+    source.content = "après"
+    source.transcript_segments = [{"start": 0.0, "text": "sans fin"}]
+    with pytest.raises(KeyError):
+        source.save(db)
+
+    assert Source.get(db, source.id).content == "avant"
+    assert _texts(db, source) == ["un", "deux", "trois"]
+
+    new_source = Source(name="nouvelle", type=SourceType.AUDIO)
+    new_source.transcript_segments = [{"end": 1.0}]
+    with pytest.raises(KeyError):
+        new_source.save(db)
+    assert Source.get(db, new_source.id) is None